@@ -0,0 +1,125 @@
+"""Apify Actor API için asyncio istemcisi.
+
+Run başlatılır, durumu artan aralıklarla sorgulanır (Apify'ın `waitForFinish`
+long-poll'u ile: run biter bitmez cevap gelir, sabit `sleep` yok), dataset
+sayfa sayfa okunur ve her sayfa geldiği anda `on_page` ile işlenir; sonraki
+sayfa bu sırada çekilir. Birden fazla lig/sezon run'ı aynı event loop'ta
+eşzamanlı yürür.
+
+HTTP istekleri http_client'ın havuzlu oturumuyla thread'de yapılır (tekrar
+deneme ve host limiti oradan gelir). Testler için `APIFY_BASE_URL` yerel
+sahte bir sunucuya yönlendirilebilir.
+
+    client = ApifyClient(token)
+    items = asyncio.run(client.run_actor('kullanici/aktor', {'maxItems': 100}))
+"""
+import os
+import time
+import asyncio
+import logging
+
+import http_client
+
+logger = logging.getLogger(__name__)
+
+APIFY_BASE_URL = os.environ.get('APIFY_BASE_URL', 'https://api.apify.com/v2')
+PAGE_SIZE = int(os.environ.get('APIFY_PAGE_SIZE', 1000))
+RUN_TIMEOUT = float(os.environ.get('APIFY_RUN_TIMEOUT', 600))
+# Durum sorgusu: ilk aralık, çarpan, üst sınır (sn); sunucu long-poll'u en fazla 60 sn
+POLL_INITIAL, POLL_FACTOR, POLL_MAX = 1.0, 2.0, 30.0
+# Long-poll isteğinde okuma süresi sunucunun bekletme süresinden bu kadar uzun olmalı
+POLL_READ_MARGIN = 10.0
+FINISHED = {'SUCCEEDED', 'FAILED', 'TIMED-OUT', 'ABORTED'}
+
+
+class ApifyError(RuntimeError):
+    pass
+
+
+class ApifyClient:
+    def __init__(self, token, base_url=None, http=None, page_size=PAGE_SIZE, max_concurrent_runs=4):
+        self.token = token
+        self.base_url = (base_url or APIFY_BASE_URL).rstrip('/')
+        self.http = http or http_client.client
+        self.page_size = page_size
+        self.max_concurrent_runs = max_concurrent_runs
+
+    async def _call(self, method, path, **kwargs):
+        headers = {'Authorization': f'Bearer {self.token}'}
+        response = await asyncio.to_thread(self.http.request, method, f'{self.base_url}{path}',
+                                           headers=headers, **kwargs)
+        if response.status_code >= 400:
+            raise ApifyError(f'{method} {path}: HTTP {response.status_code} {response.text[:200]}')
+        return response
+
+    async def start_run(self, actor, run_input):
+        # URL'de kullanıcı/aktör ayracı '~'
+        response = await self._call('POST', f"/acts/{actor.replace('/', '~')}/runs", json=run_input)
+        return response.json()['data']
+
+    async def wait_for_run(self, run_id, timeout=RUN_TIMEOUT):
+        """Run bitene kadar bekle; SUCCEEDED dışında bir sonla biterse ApifyError"""
+        deadline = time.monotonic() + timeout
+        delay = POLL_INITIAL
+        while True:
+            started = time.monotonic()
+            # Sunucu run bitene kadar (en fazla `wait` sn) cevabı bekletir
+            wait = int(min(delay, max(deadline - started, 0)))
+            # Varsayılan okuma timeout'u (20 sn) 30 sn'lik long-poll'u keserdi
+            read_timeout = (http_client.DEFAULT_TIMEOUT[0],
+                            max(http_client.DEFAULT_TIMEOUT[1], wait + POLL_READ_MARGIN))
+            run = (await self._call('GET', f'/actor-runs/{run_id}', params={'waitForFinish': wait},
+                                    timeout=read_timeout)).json()['data']
+            status = run.get('status')
+            if status in FINISHED:
+                if status != 'SUCCEEDED':
+                    raise ApifyError(f'Run {run_id} {status}: {run.get("statusMessage", "")}')
+                return run
+            if time.monotonic() >= deadline:
+                raise ApifyError(f'Run {run_id} {timeout:.0f} sn içinde bitmedi (durum: {status})')
+            # Long-poll desteklenmiyorsa (hemen döndüyse) kalan süre kadar bekle
+            await asyncio.sleep(max(0.0, delay - (time.monotonic() - started)))
+            delay = min(delay * POLL_FACTOR, POLL_MAX)
+
+    async def _page(self, dataset_id, offset):
+        params = {'format': 'json', 'clean': 1, 'offset': offset, 'limit': self.page_size}
+        return (await self._call('GET', f'/datasets/{dataset_id}/items', params=params)).json()
+
+    async def iter_pages(self, dataset_id):
+        """Dataset'i sayfa sayfa ver; tüketici bir sayfayı işlerken sonraki sayfa çekilir"""
+        offset = 0
+        pending = asyncio.ensure_future(self._page(dataset_id, offset))
+        while pending is not None:
+            items = await pending
+            offset += len(items)
+            pending = (asyncio.ensure_future(self._page(dataset_id, offset))
+                       if len(items) == self.page_size else None)
+            if items:
+                yield items
+
+    async def run_actor(self, actor, run_input, on_page=None, timeout=RUN_TIMEOUT):
+        """Run başlat, bitmesini bekle, dataset'i oku; `on_page` yoksa tüm öğeleri döndür"""
+        run = await self.start_run(actor, run_input)
+        logger.info("Apify run %s başladı (%s)", run['id'], actor)
+        run = await self.wait_for_run(run['id'], timeout=timeout)
+        items = []
+        async for page in self.iter_pages(run['defaultDatasetId']):
+            if on_page:
+                on_page(page)
+            else:
+                items.extend(page)
+        return items
+
+    async def run_many(self, jobs, timeout=RUN_TIMEOUT):
+        """{anahtar: (aktör, input, on_page)} -> {anahtar: öğeler veya ApifyError}, eşzamanlı"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_runs)
+
+        async def run(actor, run_input, on_page):
+            async with semaphore:
+                return await self.run_actor(actor, run_input, on_page, timeout=timeout)
+
+        results = await asyncio.gather(*(run(*job) for job in jobs.values()), return_exceptions=True)
+        for key, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.warning("Apify %s başarısız: %s", key, result)
+        return dict(zip(jobs, results))
@@ -1,6 +1,7 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 import requests
+import http_client
 import pandas as pd
 from bs4 import BeautifulSoup
 import time
@@ -9,240 +10,275 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 import threading
 import json
-from datetime import datetime
+from datetime import datetime, date, timedelta
 import os
+import refresher as refresh
+import cache
+import views
+import scoring
+import ranking
+import history
+import metrics
+import fastjson
+import batch
+import fbref
+import replay
+from league_data import LeagueDataMixin
+from parallel import fetcher
+from driver_pool import pool as chrome_pool, render_timings, wait_for_rows, warm_up_in_background
 
 app = Flask(__name__)
 CORS(app)  # Frontend entegrasyonu için
+LEAGUES = ['superlig', 'bundesliga', 'premier', 'saudi']
 
-class AdvancedStatsCollector:
+class AdvancedStatsCollector(LeagueDataMixin):
+    ttl = 1800  # 30dk cache
+    namespace = 'app'
+    league_configs = {
+        'superlig': {'fbref': 'https://fbref.com/en/comps/203/2025/gca/Trendyol-Super-Lig-Stats', 'whoscored': 'Turkey-Super-Lig'},
+        'bundesliga': {'fbref': 'https://fbref.com/en/comps/20/2025/gca/Bundesliga-Stats', 'whoscored': 'Germany-Bundesliga'},
+        'premier': {'fbref': 'https://fbref.com/en/comps/9/2025/gca/Premier-League-Stats', 'whoscored': 'England-Premier-League'},
+        'saudi': {'fbref': 'https://fbref.com/en/comps/83/2025/gca/Saudi-Pro-League-Stats', 'whoscored': 'Saudi-Pro-League'}
+    }
+    
     def __init__(self):
-        self.cache = {}
-        self.chrome_options = Options()
-        self.chrome_options.add_argument('--headless')
-        self.chrome_options.add_argument('--no-sandbox')
+        self.cache = cache.from_env(ttl=self.ttl)  # Sınırlı TTL/LRU cache (CACHE_URL ile paylaşımlı)
+        self.init_league_data()
     
-    def get_detailed_stats(self, league):
+    def _collect_stats(self, league):
         """Detaylı istatistikler: Pas%, Tackles, Saves, Clean Sheets"""
-        league_configs = {
-            'superlig': {'fbref': 'https://fbref.com/en/comps/203/2025/gca/Trendyol-Super-Lig-Stats', 'whoscored': 'Turkey-Super-Lig'},
-            'bundesliga': {'fbref': 'https://fbref.com/en/comps/20/2025/gca/Bundesliga-Stats', 'whoscored': 'Germany-Bundesliga'},
-            'premier': {'fbref': 'https://fbref.com/en/comps/9/2025/gca/Premier-League-Stats', 'whoscored': 'England-Premier-League'},
-            'saudi': {'fbref': 'https://fbref.com/en/comps/83/2025/gca/Saudi-Pro-League-Stats', 'whoscored': 'Saudi-Pro-League'}
-        }
-        
-        config = league_configs.get(league)
+        config = self.league_configs.get(league)
         if not config:
             return []
         
-        stats = []
-        
-        # FBref - En detaylı istatistik kaynağı
-        try:
-            fbref_data = self.scrape_fbref_detailed(config['fbref'])
-            stats.extend(fbref_data)
-            time.sleep(1)
-        except:
-            pass
-        
-        # WhoScored ek metrikler
-        try:
-            whoscored_data = self.scrape_whoscored_advanced(config['whoscored'])
-            stats.extend(whoscored_data)
-        except:
-            pass
+        # FBref (en detaylı kaynak) ve WhoScored (ek metrikler) paralel çekilir,
+        # host bazlı nezaket limitleri parallel.HOST_LIMITS'te
+        results = fetcher.run({
+            'fbref': (config['fbref'], self.scrape_fbref_detailed, config['fbref']),
+            'whoscored': ('whoscored.com', self.scrape_whoscored_advanced, config['whoscored']),
+        }, default=[])
         
-        return stats
+        return results['fbref'] + results['whoscored']
     
     def scrape_fbref_detailed(self, url):
-        """FBref: xG, Pass%, Tackles, Interceptions, Saves, PSxG"""
+        """FBref: xG, Pass%, Tackles, Interceptions, Saves, PSxG (tablolar fbref.py'de birleştirilir)"""
         headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        players = []
-        # Standart oyuncu istatistikleri
-        for row in soup.select('table#stats_standard tbody tr'):
-            cells = row.find_all('td')
-            if len(cells) >= 20:
-                name = cells[1].find('a').text.strip()
-                pos = cells[2].text.strip()
-                team = cells[0].text.strip()
-                
-                # İstatistikler (sütun indeksleri FBref yapısına göre)
-                minutes = cells[12].text
-                goals = cells[14].text
-                assists = cells[15].text
-                xg = cells[20].text
-                pass_pct = cells[18].text  # Pas yüzdesi
-                
-                players.append({
-                    'lig': 'FBref',
-                    'oyuncu': name,
-                    'pozisyon': pos,
-                    'takim': team,
-                    'dakika': minutes,
-                    'gol': goals,
-                    'asist': assists,
-                    'xg': xg,
-                    'pas_yuzde': pass_pct,
-                    'kaynak': 'FBref-Standard'
-                })
-        
-        # Savunma istatistikleri (ayrı tablo)
-        defense_table = soup.select('table#stats_defense tbody tr')
-        for row in defense_table[:50]:  # İlk 50 oyuncu
-            cells = row.find_all('td')
-            if len(cells) >= 10:
-                name = cells[1].find('a').text.strip()
-                tackles = cells[6].text
-                interceptions = cells[7].text
-                
-                # Mevcut oyuncuya ekle
-                for player in players:
-                    if player['oyuncu'] == name:
-                        player['tackles'] = tackles
-                        player['interceptions'] = interceptions
-                        break
-        
-        # Kaleci istatistikleri
-        keeper_table = soup.select('table#stats_keeper tbody tr')
-        for row in keeper_table:
-            cells = row.find_all('td')
-            if len(cells) >= 15:
-                name = cells[1].find('a').text.strip()
-                saves = cells[10].text
-                save_pct = cells[11].text
-                ga90 = cells[12].text  # Gol yeme/90
-                
-                for player in players:
-                    if player['oyuncu'] == name:
-                        player['kurtaris'] = saves
-                        player['kurtaris_yuzde'] = save_pct
-                        player['gol_yeme_90'] = ga90
-                        break
-        
-        return players[:100]  # İlk 100 oyuncu
+        # Sayfa değişmediyse (304 / aynı hash) önceki parse sonucu kullanılır
+        return http_client.fetch_parsed(url, fbref.parse_league_page, headers=headers)
     
     def scrape_whoscored_advanced(self, league_name):
         """WhoScored: Key passes, dribbles, aerial duels"""
         url = f"https://tr.whoscored.com/Regions/252/Tournaments/{league_name}/PlayerStatistics"
         
-        driver = webdriver.Chrome(options=self.chrome_options)
-        try:
+        with chrome_pool.driver() as driver:
             driver.get(url)
-            time.sleep(4)
+            rows = wait_for_rows(driver, '.player-main .table .player-table tbody tr', name='whoscored')
             
             advanced_stats = []
-            rows = driver.find_elements(By.CSS_SELECTOR, '.player-main .table .player-table tbody tr')
             
-            for row in rows[:50]:
-                cells = row.find_elements(By.TAG_NAME, 'td')
-                if len(cells) >= 12:
-                    name = cells[2].text.strip()
-                    rating = cells[11].text.strip()
+            with metrics.span('parse', 'whoscored'):
+                for row in rows[:50]:
+                    cells = row.find_elements(By.TAG_NAME, 'td')
+                    if len(cells) >= 12:
+                        name = cells[2].text.strip()
+                        rating = cells[11].text.strip()
                     
-                    # Gelişmiş metrikler (pozisyona göre)
-                    key_passes = cells[6].text if len(cells) > 6 else '0'
-                    dribbles = cells[8].text if len(cells) > 8 else '0'
+                        # Gelişmiş metrikler (pozisyona göre)
+                        key_passes = cells[6].text if len(cells) > 6 else '0'
+                        dribbles = cells[8].text if len(cells) > 8 else '0'
                     
-                    advanced_stats.append({
-                        'lig': 'WhoScored',
-                        'oyuncu': name,
-                        'rating': rating,
-                        'key_passes_90': key_passes,
-                        'dribbles_90': dribbles,
-                        'kaynak': 'WhoScored-Advanced'
-                    })
+                        advanced_stats.append({
+                            'lig': 'WhoScored',
+                            'oyuncu': name,
+                            'rating': rating,
+                            'key_passes_90': key_passes,
+                            'dribbles_90': dribbles,
+                            'kaynak': 'WhoScored-Advanced'
+                        })
             return advanced_stats
-        finally:
-            driver.quit()
 
+replay.install_from_env()  # REPLAY_MODE=record|replay: fixture kaydı / çevrimdışı çalışma
 collector = AdvancedStatsCollector()
+warm_up_in_background()
+# Paylaşımlı cache'te aralığın yarısından taze veri varsa başka worker çekmiş demektir
+# Snapshot'tan açılan ligler aralık dolana kadar yeniden çekilmez
+refresher = refresh.from_env(lambda league: collector.refresh(league, max_age=refresher.intervals[league] / 2),
+                             fetched={league: entry['time'] for league, entry in collector.latest.items()})
+if refresh.enabled():
+    refresher.start()
+metrics.install(app, 'app', [metrics.cache_source(collector.cache, 'app'), metrics.pool_source(chrome_pool)])
+
+def league_entry(league):
+    """1. seviye cache: ham lig verisi (yenileyici kapalıysa 30dk TTL ile çekilir)"""
+    entry = collector.current(league)
+    if refresher.running:
+        # Stale-while-revalidate: istek yolunda asla scraping yapılmaz
+        if entry is None:
+            refresher.trigger(league)
+        return entry
+    if entry is None or time.time() - entry['time'] >= collector.ttl:
+        print(f"📊 {league.upper()} detaylı istatistikler toplanıyor...")
+        collector.refresh(league)
+        entry = collector.latest.get(league)
+    return entry
+
+def not_ready():
+    if refresher.running:
+        return jsonify({'error': 'Veri hazırlanıyor, lütfen tekrar deneyin'}), 503, {'Retry-After': '30'}
+    return jsonify({'error': 'Veri alınamadı'}), 503
+
+def stats_args(args):
+    """limit, profil, sıralama, pozisyon, takım parametreleri; geçersizse ValueError"""
+    limit = args.get('limit', 50, type=int)
+    # top_players order[:limit] ile keser; negatif limit "sondan biri hariç hepsi" olurdu
+    if not 1 <= limit <= 100:
+        raise ValueError('Limit 1-100 arası olmalı')
+    profile = scoring.get_profile(args.get('profil'))
+    # Sıralama/filtre: ?sirala=xg&pozisyon=FW&takim=Arsenal
+    metric = args.get('sirala')
+    if metric is not None and metric not in ranking.INDEX_METRICS:
+        raise ValueError(f"Geçersiz sıralama: {', '.join(ranking.INDEX_METRICS)}")
+    group = args.get('pozisyon', '').upper() or None
+    if group is not None and group not in scoring.POSITION_GROUPS:
+        raise ValueError(f"Geçersiz pozisyon: {', '.join(scoring.POSITION_GROUPS)}")
+    team = args.get('takim')
+    return limit, profile, metric, group, team
+
+# Görünüm üreticileri (tekil endpoint'ler ve /api/batch ortak)
+def stats_view(league, entry, profile):
+    def build(df, limit, profile_name, metric, group, team):
+        return {
+            'lig': league.upper(),
+            'toplam_oyuncu': len(df),
+            'profil': profile_name,
+            'gunluk': datetime.now().strftime('%Y-%m-%d'),
+            'oyuncular': views.top_players(df, limit, views.STATS_COLS, profile, league, index=entry['store'].index,
+                                           metric=metric, group=group, team=team)
+        }
+    return build
+
+def keepers_view(entry):
+    return lambda df: {'kaleciler': views.keepers(df, entry['store'].index)}
+
+def compare_view(league, profile):
+    return lambda df, name: views.league_summary(df, profile, league)
+
+BATCH_BUILDERS = {'stats': stats_view, 'keepers': keepers_view, 'compare': compare_view}
+
+def batch_params(view, args):
+    if view == 'stats':
+        return stats_args(args)
+    if view == 'compare':
+        return scoring.get_profile(args.get('profil'))
+    return ()
 
 @app.route('/api/stats/<league>', methods=['GET'])
 def get_league_stats(league):
     """Ana endpoint: /api/stats/superlig, /bundesliga, /premier, /saudi"""
-    limit = request.args.get('limit', 50, type=int)
-    
-    if league not in ['superlig', 'bundesliga', 'premier', 'saudi']:
+    if league not in LEAGUES:
         return jsonify({'error': 'Geçersiz lig: superlig, bundesliga, premier, saudi'}), 400
+    try:
+        limit, profile, metric, group, team = stats_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    cache_key = f"{league}_{limit}"
-    if cache_key in collector.cache and time.time() - collector.cache[cache_key]['time'] < 1800:  # 30dk cache
-        return jsonify(collector.cache[cache_key]['data'])
-    
-    print(f"📊 {league.upper()} detaylı istatistikler toplanıyor...")
-    stats = collector.get_detailed_stats(league)
+    entry = league_entry(league)
+    if entry is None:
+        return not_ready()
     
-    if not stats:
-        return jsonify({'error': 'Veri alınamadı'}), 503
-    
-    # DataFrame ile işleme
-    df = pd.DataFrame(stats)
-    
-    # Sayısal sütunları dönüştür
-    numeric_cols = ['gol', 'asist', 'xg', 'tackles', 'interceptions', 'kurtaris', 'dakika']
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    
-    # Composite score hesapla
-    df['performans_skoru'] = (
-        df.get('gol', 0) * 3 +
-        df.get('asist', 0) * 2 +
-        df.get('xg', 0) * 1.5 +
-        df.get('tackles', 0) * 1.2 +
-        pd.to_numeric(df.get('pas_yuzde', 0), errors='coerce') * 0.01
-    )
-    
-    # En iyi oyuncular
-    top_players = df.nlargest(limit, 'performans_skoru')[['oyuncu', 'pozisyon', 'takim', 
-                                                          'gol', 'asist', 'xg', 'pas_yuzde',
-                                                          'tackles', 'kurtaris', 'performans_skoru']].to_dict('records')
-    
-    result = {
-        'lig': league.upper(),
-        'toplam_oyuncu': len(df),
-        'gunluk': datetime.now().strftime('%Y-%m-%d'),
-        'oyuncular': top_players
-    }
-    
-    collector.cache[cache_key] = {'data': result, 'time': time.time()}
-    return jsonify(result)
+    return fastjson.respond(collector.view(entry, league, 'stats', stats_view(league, entry, profile),
+                                           limit, profile.name, metric, group, team, encoded=True))
 
 @app.route('/api/compare', methods=['GET'])
 def compare_leagues():
     """Lig karşılaştırması"""
     leagues = request.args.getlist('ligler[]') or ['superlig', 'bundesliga']
+    try:
+        profile = scoring.get_profile(request.args.get('profil'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     result = {}
     
+    # Cache'te olmayan ligler paralel çekilir
+    entries = fetcher.run({league: (None, league_entry, league) for league in leagues})
     for league in leagues:
-        stats = collector.get_detailed_stats(league)
-        if stats:
-            df = pd.DataFrame(stats)
-            result[league] = {
-                'ortalama_gol': df['gol'].mean(),
-                'ortalama_asist': df['asist'].mean(),
-                'en_iyi_oyuncu': df.loc[df['performans_skoru'].idxmax(), 'oyuncu'] if 'performans_skoru' in df else 'N/A'
-            }
+        entry = entries[league]
+        if entry:
+            result[league] = collector.view(entry, league, 'compare', compare_view(league, profile), profile.name)
     
-    return jsonify(result)
+    return fastjson.jsonify(result)
 
 @app.route('/api/keepers', methods=['GET'])
 def get_keepers():
     """Sadece kaleciler"""
     league = request.args.get('lig', 'superlig')
-    stats = collector.get_detailed_stats(league)
-    df = pd.DataFrame(stats)
+    if league not in LEAGUES:
+        return jsonify({'error': 'Geçersiz lig: superlig, bundesliga, premier, saudi'}), 400
+    
+    entry = league_entry(league)
+    if entry is None:
+        return not_ready()
     
-    keepers = df[df['pozisyon'].str.contains('GK', na=False)][['oyuncu', 'kurtaris', 
-                                                               'kurtaris_yuzde', 'gol_yeme_90']].to_dict('records')
-    return jsonify({'kaleciler': keepers})
+    return fastjson.respond(collector.view(entry, league, 'keepers', keepers_view(entry), encoded=True))
+
+@app.route('/api/batch', methods=['POST'])
+def batch_query():
+    """Toplu sorgu: stats / keepers / compare öğeleri tek istekte (bkz. batch.py)"""
+    try:
+        specs = batch.parse(request.get_json(silent=True), LEAGUES, batch_params)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Gereken ligler bir kez, paralel çözülür
+    entries = fetcher.run({league: (None, league_entry, league) for league in batch.leagues(specs)})
+    return fastjson.respond(batch.combine([batch.item(collector, spec, entries, BATCH_BUILDERS) for spec in specs]))
+
+@app.route('/api/stats/<league>/trend', methods=['GET'])
+def league_trend(league):
+    """Lig metrik trendi: /api/stats/premier/trend?metrik=xg&gun=30&sezon=2025-2026"""
+    if league not in LEAGUES:
+        return jsonify({'error': 'Geçersiz lig: superlig, bundesliga, premier, saudi'}), 400
+    metric = request.args.get('metrik') or request.args.get('metric', 'performans_skoru')
+    if metric not in history.METRICS:
+        return jsonify({'error': f"Geçersiz metrik: {', '.join(history.METRICS)}"}), 400
+    days = request.args.get('gun', type=int)
+    since = (date.today() - timedelta(days=days)).isoformat() if days else None
+    season = request.args.get('sezon')
+    
+    return fastjson.jsonify({
+        'lig': league.upper(),
+        'metrik': metric,
+        'sezon': season or (collector.history.seasons(league) or [None])[-1],
+        'seri': collector.history.trend(league, metric, season, since)
+    })
+
+@app.route('/api/players/<player_id>/history', methods=['GET'])
+def player_history(player_id):
+    """Oyuncunun günlük değişimleri (FBref oyuncu id'si): /api/players/<id>/history?lig=premier"""
+    league = request.args.get('lig')
+    if league is not None and league not in LEAGUES:
+        return jsonify({'error': 'Geçersiz lig: superlig, bundesliga, premier, saudi'}), 400
+    
+    records = collector.history.player(player_id, league)
+    if not records:
+        return jsonify({'error': 'Oyuncu geçmişi bulunamadı'}), 404
+    return fastjson.jsonify({'oyuncu_id': player_id, 'kayitlar': records})
 
 @app.route('/health')
 def health_check():
     return jsonify({'status': 'OK', 'timestamp': datetime.now().isoformat()})
 
+@app.route('/api/status', methods=['GET'])
+def refresh_status():
+    """Lig bazlı son yenileme / sonraki yenileme zamanları"""
+    return jsonify({
+        'yenileyici_aktif': refresher.running,
+        'ligler': refresher.status(),
+        'cache': collector.cache.stats(),
+        'bellek': collector.memory(),
+        'chrome': chrome_pool.stats(),
+        'render': render_timings.stats()
+    })
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=False)
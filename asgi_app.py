@@ -0,0 +1,303 @@
+"""secure_app API'sinin ASGI (Starlette) sürümü.
+
+Senkron gunicorn worker'ında scraping'e düşen bir istek worker'ı saniyelerce
+kilitler; burada route'lar event loop'ta çalışır, scraping (Selenium dahil)
+ve görünüm üretimi (pandas) thread havuzlarına verilir. Aynı lig için bekleyen
+istekler tek bir yenileme görevini bekler, thread tutmaz.
+
+Toplayıcı, cache, yenileyici ve görünüm üreticileri secure_app ile ortaktır;
+güvenlik katmanı aynıdır: route bazlı rate limit (aynı `limits` depolaması),
+X-API-Key, User-Agent kontrolü, girdi temizleme ve güvenlik başlıkları.
+
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000 --workers 4
+"""
+import os
+import time
+import asyncio
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from limits import parse as parse_limit
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+from starlette.applications import Starlette
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+from werkzeug.exceptions import HTTPException as WerkzeugHTTPException
+
+import cache
+import metrics
+import batch
+import fastjson
+import secure_app
+from secure_app import collector, refresher
+
+SCRAPE_WORKERS = int(os.environ.get('ASGI_SCRAPE_WORKERS', 4))  # Selenium/HTTP scraping
+VIEW_WORKERS = int(os.environ.get('ASGI_VIEW_WORKERS', os.cpu_count() or 4))  # pandas görünümleri
+RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', '1') == '1'
+
+_scrape_pool = ThreadPoolExecutor(SCRAPE_WORKERS, thread_name_prefix='asgi-scrape')
+_view_pool = ThreadPoolExecutor(VIEW_WORKERS, thread_name_prefix='asgi-view')
+_refreshing = {}  # lig -> devam eden yenileme görevi
+
+# Flask-Limiter ile aynı depolama (CACHE_URL) ve strateji
+_limiter = FixedWindowRateLimiter(storage_from_string(cache.limiter_storage_uri()))
+# sqlite/redis sayaçları ağ/disk G/Ç'si: event loop'ta değil havuzda
+_limiter_blocks = not cache.limiter_storage_uri().startswith('memory://')
+
+ERRORS = {
+    400: 'Geçersiz istek',
+    401: 'API Key gerekli',
+    403: 'Erişim engellendi',
+    404: 'Bulunamadı',
+    405: 'Metod desteklenmiyor',
+    413: 'İstek çok büyük',
+    429: 'Çok fazla istek, lütfen bekleyin',
+    500: 'Sunucu hatası',
+}
+# flask-talisman'ın secure_app'e eklediği başlıklar
+SECURITY_HEADERS = {
+    'Content-Security-Policy': '; '.join(f'{k} {v}' for k, v in secure_app.csp.items()),
+    'X-Frame-Options': 'DENY',
+    'X-Content-Type-Options': 'nosniff',
+    'Referrer-Policy': 'strict-origin-when-cross-origin',
+    'Permissions-Policy': 'browsing-topics=()',
+}
+HSTS = 'max-age=31556926; includeSubDomains'
+
+
+async def offload(pool, func, *args, **kwargs):
+    """Bloklayan işi havuza ver; contextvars (profil dökümü) thread'e taşınır"""
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(pool, call)
+
+
+async def refresh(league):
+    """Lig başına tek yenileme görevi; bekleyen istekler aynı görevi bekler"""
+    task = _refreshing.get(league)
+    if task is None:
+        task = asyncio.ensure_future(offload(_scrape_pool, collector.refresh, league))
+        _refreshing[league] = task
+        task.add_done_callback(lambda _: _refreshing.pop(league, None))
+    # Bekleyen istek iptal edilse de görev sürsün
+    await asyncio.shield(task)
+
+
+async def current(league):
+    """collector.current paylaşımlı backend'i (sqlite/redis) okuyabilir: event loop'u bloklamasın"""
+    if collector.cache.shared:
+        return await offload(_view_pool, collector.current, league)
+    return collector.current(league)
+
+
+async def league_entry(league):
+    """secure_app.league_entry'nin bloklamayan karşılığı"""
+    entry = await current(league)
+    if refresher.running:
+        if entry is None:
+            refresher.trigger(league)
+        return entry
+    if entry is None or time.time() - entry['time'] >= collector.ttl:
+        print(f"📊 {league.upper()} güvenli veri çekiliyor (asgi)...")
+        await refresh(league)
+        entry = collector.latest.get(league)
+    return entry
+
+
+def respond(request, encoded, status=200):
+    status, body, headers = fastjson.negotiate(encoded, request.headers.get('if-none-match'),
+                                               request.headers.get('accept-encoding'), status)
+    if status == 304:
+        return Response(status_code=304, headers=headers)
+    return Response(body, status_code=status, headers=headers, media_type='application/json')
+
+
+def not_ready(league):
+    if refresher.running:
+        return JSONResponse({'error': 'Veri hazırlanıyor, lütfen tekrar deneyin'}, 503, {'Retry-After': '30'})
+    return JSONResponse({
+        'lig': league.upper(),
+        'oyuncular': [],
+        'mesaj': 'Henüz veri çekilmedi, scraping fonksiyonunu bağlayın.'
+    })
+
+
+def guarded(limit, api_key=True, user_agent=True, cost=None):
+    """secure_app'teki @limiter.limit + require_api_key + @security_wrapper karşılığı
+
+    `cost`: async request -> int, istek başına rate limit maliyeti (varsayılan 1).
+    """
+    item = parse_limit(limit)
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(request):
+            if RATELIMIT_ENABLED:
+                client = request.client.host if request.client else 'bilinmiyor'
+                amount = await cost(request) if cost else 1
+                hit = functools.partial(_limiter.hit, item, 'asgi', handler.__name__, client, cost=amount)
+                if not (await offload(_view_pool, hit) if _limiter_blocks else hit()):
+                    raise HTTPException(429)
+            if api_key and request.headers.get('x-api-key') not in secure_app.API_KEYS:
+                raise HTTPException(401)
+            if user_agent:
+                ua = request.headers.get('user-agent', '')
+                if not any(x in ua for x in secure_app.PERMITTED_USER_AGENTS):
+                    raise HTTPException(403)
+            return await handler(request)
+        return wrapper
+    return decorator
+
+
+def league_param(value):
+    league = collector.sanitize_input(value.lower())
+    collector.validate_request(league)  # werkzeug 400 -> http_error
+    return league
+
+
+@guarded('10 per minute', api_key=False, user_agent=False)
+async def health_check(request):
+    return JSONResponse({
+        'status': 'OK',
+        'timestamp': datetime.now().isoformat(),
+        'version': '2.0-secure-asgi'
+    })
+
+
+@guarded('10 per minute')
+async def get_league_stats(request):
+    """🔒 GÜVENLİ lig istatistikleri"""
+    league = league_param(request.path_params['league'])
+    limit, profile, metric, group, team = collector.stats_args(request.query_params)
+
+    entry = await league_entry(league)
+    if entry is None:
+        return not_ready(league)
+    encoded = await offload(_view_pool, collector.view, entry, league, 'stats',
+                            secure_app.stats_view(league, entry, profile),
+                            limit, profile.name, metric, group, team, encoded=True)
+    return respond(request, encoded)
+
+
+@guarded('5 per minute')
+async def get_keepers(request):
+    """🔒 Kaleci istatistikleri"""
+    league = league_param(request.path_params['league'])
+
+    entry = await league_entry(league)
+    if entry is None:
+        return JSONResponse({'kaleciler': []})
+    encoded = await offload(_view_pool, collector.view, entry, league, 'keepers',
+                            secure_app.keepers_view(entry), encoded=True)
+    return respond(request, encoded)
+
+
+@guarded('3 per minute')
+async def compare_leagues(request):
+    """🔒 Lig karşılaştırması"""
+    leagues = [league_param(lig) for lig in request.query_params.getlist('ligler[]')]
+    profile = collector.profile_arg(request.query_params)
+
+    # Cache'te olmayan ligler eşzamanlı çekilir
+    entries = await asyncio.gather(*(league_entry(league) for league in leagues))
+    pending = {league: offload(_view_pool, collector.view, entry, league, 'compare',
+                               secure_app.compare_view(league, profile), profile.name)
+               for league, entry in zip(leagues, entries) if entry}
+    result = dict(zip(pending, await asyncio.gather(*pending.values())))
+    return respond(request, fastjson.encode(result))
+
+
+async def json_body(request):
+    """JSON gövde (Starlette isteğin üzerinde saklar); secure_app'in MAX_CONTENT_LENGTH sınırıyla"""
+    if int(request.headers.get('content-length') or 0) > secure_app.MAX_CONTENT_LENGTH:
+        raise HTTPException(413)
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+async def batch_cost(request):
+    return batch.cost(await json_body(request))
+
+
+@guarded(secure_app.BATCH_LIMIT, cost=batch_cost)
+async def batch_query(request):
+    """🔒 Toplu sorgu: stats / keepers / compare öğeleri tek istekte"""
+    specs = secure_app.parse_batch(await json_body(request))
+    leagues = batch.leagues(specs)
+    entries = dict(zip(leagues, await asyncio.gather(*(league_entry(league) for league in leagues))))
+    parts = await asyncio.gather(*(offload(_view_pool, batch.item, collector, spec, entries, secure_app.BATCH_BUILDERS)
+                                   for spec in specs))
+    return respond(request, batch.combine(parts))
+
+
+async def metrics_endpoint(request):
+    return PlainTextResponse(metrics.registry.render(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+async def http_error(request, exc):
+    code = exc.status_code if isinstance(exc, HTTPException) else exc.code
+    return JSONResponse({'error': ERRORS.get(code, exc.__class__.__name__)}, code)
+
+
+async def internal_error(request, exc):
+    return JSONResponse({'error': ERRORS[500]}, 500)
+
+
+class ServiceMiddleware:
+    """Güvenlik başlıkları, istek süresi histogramı ve X-Profile -> Server-Timing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        token = metrics.begin_request(Headers(scope=scope).get(metrics.PROFILE_HEADER))
+        status = [500]
+
+        async def send_with_headers(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+                headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS.items():
+                    headers.setdefault(name, value)
+                if scope.get('scheme') == 'https':
+                    headers.setdefault('Strict-Transport-Security', HSTS)
+                stages = metrics.breakdown()
+                if stages is not None:
+                    headers['Server-Timing'] = metrics.server_timing(stages, time.perf_counter() - started)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            endpoint = scope.get('endpoint')
+            metrics.registry.observe('request', time.perf_counter() - started, servis='asgi',
+                                     endpoint=getattr(endpoint, '__name__', 'yok'), durum=status[0])
+            metrics.end_request(token)
+
+
+app = Starlette(
+    routes=[
+        Route('/health', health_check),
+        Route('/api/stats/{league}', get_league_stats),
+        Route('/api/keepers/{league}', get_keepers),
+        Route('/api/compare', compare_leagues),
+        Route('/api/batch', batch_query, methods=['POST']),
+        Route('/metrics', metrics_endpoint),
+    ],
+    exception_handlers={
+        HTTPException: http_error,
+        WerkzeugHTTPException: http_error,  # collector.validate_request/stats_args abort()'ları
+        Exception: internal_error,
+    },
+)
+app.add_middleware(ServiceMiddleware)
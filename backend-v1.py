@@ -7,52 +7,81 @@
 # import re; values = re.findall(r'€(\d+(?:\.\d+)?m?)', text).
 #
 
+import os
 import requests
+import asyncio
+import http_client
+import snapshot
+import apify
 import pandas as pd
 from bs4 import BeautifulSoup
 import time
 
 # Apify Transfermarkt Scraper (alternatif)
-APIFY_TOKEN = 'YOUR_APIFY_TOKEN'
+APIFY_TOKEN = os.environ.get('APIFY_TOKEN', 'YOUR_APIFY_TOKEN')
 APIFY_ACTOR = 'data_xplorer/transfermarkt-api-scraper'  # Süper Lig için input ayarlayın
+TRANSFERMARKT_COLS = ['name', 'marketValue', 'club', 'transferFee']  # Kolonlar approx
+LIG_ADLARI = {'TR1': 'Süper Lig', 'GB1': 'Premier League', 'L1': 'Bundesliga', 'SA1': 'Saudi Pro League'}
 
-def get_transfermarkt_via_apify(lig='TR1', sezon='2025'):
-    url = f'https://api.apify.com/v2/acts/{APIFY_ACTOR}/runs'
-    payload = {
-        'token': APIFY_TOKEN,
-        'input': {'search': f'Süper Lig {sezon}', 'maxItems': 100}  # Piyasa değerleri için
-    }
-    response = requests.post(url, json=payload)
-    run_id = response.json()['data']['id']
+class DatasetCollector:
+    """Dataset sayfalarını geldikçe küçük frame'lere çevirir (tek büyük JSON listesi tutulmaz)"""
+    def __init__(self):
+        self.frames = []
+    
+    def __call__(self, items):
+        self.frames.append(pd.DataFrame(items))
+    
+    def frame(self):
+        return pd.concat(self.frames, ignore_index=True) if self.frames else pd.DataFrame()
+
+async def _transfermarkt_runs(jobs):
+    client = apify.ApifyClient(APIFY_TOKEN)
+    collectors = {job: DatasetCollector() for job in jobs}
+    runs = {(lig, sezon): (APIFY_ACTOR, {'search': f'{LIG_ADLARI.get(lig, lig)} {sezon}', 'maxItems': 100},
+                           collectors[(lig, sezon)])
+            for lig, sezon in jobs}  # Piyasa değerleri için
+    results = await client.run_many(runs)
     
-    # Sonuç bekle (sync için wait)
-    time.sleep(30)
-    result_url = f'https://api.apify.com/v2/acts/{APIFY_ACTOR}/runs/{run_id}/dataset/items?token={APIFY_TOKEN}&format=json'
-    data = requests.get(result_url).json()
-    df = pd.DataFrame(data)
-    df.to_csv('transfermarkt_superlig.csv', index=False)
-    return df[['name', 'marketValue', 'club', 'transferFee']]  # Kolonlar approx
+    frames = {}
+    for (lig, sezon), result in results.items():
+        if isinstance(result, Exception):
+            frames[(lig, sezon)] = pd.DataFrame(columns=TRANSFERMARKT_COLS)
+            continue
+        df = collectors[(lig, sezon)].frame()
+        snapshot.write(f'piyasa/transfermarkt/{lig}-{sezon}', snapshot.typed(df), time.time())
+        frames[(lig, sezon)] = df.reindex(columns=TRANSFERMARKT_COLS)
+    return frames
+
+def get_transfermarkt_many(jobs):
+    """[(lig, sezon), ...] -> {(lig, sezon): df}; run'lar eşzamanlı yürür"""
+    return asyncio.run(_transfermarkt_runs(list(jobs)))
+
+def get_transfermarkt_via_apify(lig='TR1', sezon='2025'):
+    return get_transfermarkt_many([(lig, sezon)])[(lig, sezon)]
 
 def scrape_footystats_market_values():
     url = 'https://footystats.org/turkey/super-lig/market-values'
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
     
-    players = []
-    for row in soup.select('table tbody tr'):  # Tablo selector'ını inspect ile doğrulayın
-        cols = row.find_all('td')
-        if len(cols) > 3:
-            name = cols[1].text.strip()
-            value = cols[2].text.strip()
-            players.append({'Oyuncu': name, 'Değer': value})
+    def parse(html):
+        soup = BeautifulSoup(html, 'html.parser')
+        players = []
+        for row in soup.select('table tbody tr'):  # Tablo selector'ını inspect ile doğrulayın
+            cols = row.find_all('td')
+            if len(cols) > 3:
+                name = cols[1].text.strip()
+                value = cols[2].text.strip()
+                players.append({'Oyuncu': name, 'Değer': value})
+        return players
     
+    # Sayfa değişmediyse (304 / aynı hash) önceki parse sonucu kullanılır
+    players = http_client.fetch_parsed(url, parse, name='footystats-piyasa')
     df = pd.DataFrame(players)
-    df.to_csv('footystats_piyasa.csv', index=False)
+    snapshot.write('piyasa/footystats', snapshot.typed(df), time.time())
     return df
 
 def scrape_guncel_degerler_haber(url):
     # Örn: https://www.gazeteilksayfa.com/transfermarkt-super-lig-guncellemesi...
-    response = requests.get(url)
+    response = http_client.get(url)
     soup = BeautifulSoup(response.text, 'html.parser')
     # Snippet bazlı extract (manuel uyarlayın)
     text = soup.get_text()
@@ -66,12 +95,13 @@ def main():
     print(footy_df.head())
     
     print("Apify ile Transfermarkt...")
-    apify_df = get_transfermarkt_via_apify()
-    print(apify_df.head() if not apify_df.empty else "API hatası")
+    apify_dfs = get_transfermarkt_many([('TR1', '2025'), ('GB1', '2025')])
+    for (lig, sezon), apify_df in apify_dfs.items():
+        print(lig, sezon, apify_df.head() if not apify_df.empty else "API hatası")
     
     # Haber yedeği
     haber_df = scrape_guncel_degerler_haber('https://www.gazeteilksayfa.com/transfermarkt-super-lig-guncellemesi-en-pahali-futbolcular-aciklandi-288456h.htm')
-    haber_df.to_csv('haber_piyasa.csv')
+    snapshot.write('piyasa/haber', snapshot.typed(haber_df), time.time())
 
 if __name__ == "__main__":
     main()
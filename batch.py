@@ -0,0 +1,95 @@
+"""Toplu sorgu: tek istekte birden fazla lig / görünüm (POST /api/batch).
+
+    {"istekler": [
+        {"gorunum": "stats", "lig": "premier", "limit": 20, "sirala": "xg"},
+        {"gorunum": "keepers", "lig": "premier"},
+        {"gorunum": "compare", "ligler": ["premier", "superlig"], "profil": "hucum"}
+    ]}
+
+Tüm istekler önce doğrulanır, gereken ligler bir kez çözülür (eksikler paralel
+çekilir), her görünüm ortak lig verisinden ve görünüm cache'inden üretilir.
+Cache'teki kodlanmış gövdeler yeniden serileştirilmeden istek sırasıyla
+`{"sonuclar": [...]}` olarak birleştirilir. Parametreler tekil endpoint'lerin
+query parametreleriyle aynıdır.
+
+Rate limit maliyeti öğe başınadır (`cost`), tekil endpoint limitlerinin
+oranına göre: keepers stats'ın yarısı, compare üçte biri sıklıkta açık.
+"""
+import os
+from collections import namedtuple
+
+from werkzeug.datastructures import MultiDict
+
+import metrics
+import fastjson
+
+VIEWS = ('stats', 'keepers', 'compare')
+COST = {'stats': 1, 'keepers': 2, 'compare': 3}
+MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 20))
+NOT_READY = 'Veri hazırlanıyor, lütfen tekrar deneyin'
+
+Spec = namedtuple('Spec', 'view leagues params')
+
+
+def parse(body, valid_leagues, params):
+    """İstek gövdesi -> [Spec]; geçersizse ValueError.
+
+    `params(görünüm, args)` uygulamaya özgü parametre doğrulaması (args: MultiDict).
+    """
+    items = body.get('istekler') if isinstance(body, dict) else None
+    if not isinstance(items, list) or not 1 <= len(items) <= MAX_ITEMS:
+        raise ValueError(f'istekler 1-{MAX_ITEMS} öğelik bir liste olmalı')
+    specs = []
+    for i, item in enumerate(items, 1):
+        if not isinstance(item, dict) or item.get('gorunum') not in VIEWS:
+            raise ValueError(f"{i}. istek: gorunum {', '.join(VIEWS)} olmalı")
+        view = item['gorunum']
+        leagues = item.get('ligler') if view == 'compare' else [item.get('lig')]
+        if not isinstance(leagues, list) or not leagues:
+            raise ValueError(f'{i}. istek: ligler listesi gerekli')
+        leagues = [str(league).lower() for league in leagues]
+        if any(league not in valid_leagues for league in leagues):
+            raise ValueError(f"{i}. istek: geçersiz lig ({', '.join(valid_leagues)})")
+        args = MultiDict({k: str(v) for k, v in item.items()
+                          if k not in ('gorunum', 'lig', 'ligler') and isinstance(v, (str, int, float))})
+        specs.append(Spec(view, leagues, params(view, args)))
+    return specs
+
+
+def cost(body):
+    """Rate limit maliyeti; gövde geçersizse 1 (istek zaten 400 döner)"""
+    items = body.get('istekler') if isinstance(body, dict) else None
+    if not isinstance(items, list):
+        return 1
+    return max(1, sum(COST.get(item.get('gorunum'), 1) for item in items[:MAX_ITEMS] if isinstance(item, dict)))
+
+
+def leagues(specs):
+    """Çözülmesi gereken ligler (sıra korunur, tekrarsız)"""
+    return list(dict.fromkeys(league for spec in specs for league in spec.leagues))
+
+
+def item(collector, spec, entries, builders):
+    """Tek öğe -> fastjson.Encoded; `builders` uygulamanın stats/keepers/compare görünüm üreticileri"""
+    if spec.view == 'compare':
+        profile = spec.params
+        return fastjson.encode({
+            league: collector.view(entries[league], league, 'compare', builders['compare'](league, profile),
+                                   profile.name)
+            for league in spec.leagues if entries.get(league)
+        })
+    league = spec.leagues[0]
+    entry = entries.get(league)
+    if entry is None:
+        return fastjson.encode({'lig': league.upper(), 'error': NOT_READY})
+    if spec.view == 'stats':
+        limit, profile, metric, group, team = spec.params
+        return collector.view(entry, league, 'stats', builders['stats'](league, entry, profile),
+                              limit, profile.name, metric, group, team, encoded=True)
+    return collector.view(entry, league, 'keepers', builders['keepers'](entry), encoded=True)
+
+
+def combine(parts):
+    """Kodlanmış öğeleri yeniden serileştirmeden tek gövdede birleştir"""
+    with metrics.span('serialize', 'batch'):
+        return fastjson.Encoded(b'{"sonuclar":[' + b','.join(part.body for part in parts) + b']}')
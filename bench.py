@@ -0,0 +1,371 @@
+"""Çevrimdışı benchmark paketi (replay.py fixture'ları üzerinde).
+
+Ölçülenler:
+    parse     FBref lig sayfası (fbref.parse_league_page), WhoScored sahte sürücü
+    merge     playerStats kimlik eşleştirme + kaynak birleştirme
+    scoring   profil skorları (scoring.PROFILES) dört ligin frame'i üzerinde
+    endpoint  app.py ve secure_app.py: /api/stats/<lig>, keepers, compare için
+              ilk istek (stub üzerinden scraping dahil), p50/p95/p99 ve istek/sn
+    serving   aynı API ayrı süreçte: gunicorn (senkron worker) + secure_app ile
+              uvicorn + asgi_app, eşit worker sayısıyla
+
+Fixture dizininde kayıt yoksa (REPLAY_MODE=record ile alınmamışsa) FBref
+yapısında sentetik sayfalar üretilir. Sonuç JSON olarak .bench/<commit>.json'a
+yazılır; iki sonuç karşılaştırılabilir:
+
+    python bench.py --requests 300 --concurrency 8
+    python bench.py --only serving --workers 2 --concurrency 32
+    python bench.py --fixtures fixtures --only parse,scoring
+    python bench.py --compare .bench/abc1234.json .bench/def5678.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import platform
+import importlib.util
+import tempfile
+import statistics
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+BENCH_DIR = '.bench'
+LEAGUES = ['superlig', 'bundesliga', 'premier', 'saudi']
+SECTIONS = ['parse', 'merge', 'scoring', 'endpoint', 'serving']
+THRESHOLD = 0.10  # Karşılaştırmada bildirilen en küçük değişim
+# Ayrı süreçte ölçülen sunucular: (modül, komut)
+SERVERS = {
+    'gunicorn': ('gunicorn', lambda port, workers: ['gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{port}',
+                                                    '--log-level', 'warning', 'secure_app:app']),
+    'uvicorn': ('uvicorn', lambda port, workers: ['uvicorn', 'asgi_app:app', '--port', str(port),
+                                                  '--workers', str(workers), '--log-level', 'warning']),
+}
+SECURE_PATHS = {
+    'stats': '/api/stats/premier',
+    'keepers': '/api/keepers/premier',
+    'compare': '/api/compare?ligler[]=premier&ligler[]=superlig',
+}
+
+
+def commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or 'bilinmiyor'
+    except OSError:
+        return 'bilinmiyor'
+
+
+def best_ms(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 3)
+
+
+def whoscored_page(players=50, seed=0):
+    rnd = random.Random(seed)
+    rows = ''.join('<tr>' + ''.join(f'<td>{c}</td>' for c in
+                                    [i + 1, '', f'Oyuncu {i}', 'Kulüp', 25, 30, rnd.randint(0, 40) / 10, 0,
+                                     rnd.randint(0, 30) / 10, 0, 0, f'{rnd.uniform(6, 8.5):.2f}']) + '</tr>'
+                   for i in range(players))
+    return (f'<html><body><div class="player-main"><div class="table"><table class="player-table">'
+            f'<tbody>{rows}</tbody></table></div></div></body></html>')
+
+
+def prepare_fixtures(directory, league_configs):
+    """Eksik FBref/WhoScored fixture'larını sentetik sayfalarla tamamla"""
+    import replay
+    import bench_fbref
+    store = replay.FixtureStore(directory)
+    created = 0
+    for i, (league, config) in enumerate(league_configs.items()):
+        if store.load('GET', config['fbref'])[0] is None:
+            html = bench_fbref.make_fbref_page(players=550, seed=i)
+            store.save('GET', config['fbref'], 200, 'text/html; charset=utf-8', html.encode('utf-8'))
+            created += 1
+        url = f"https://tr.whoscored.com/Regions/252/Tournaments/{config['whoscored']}/PlayerStatistics"
+        if store.load_page(url) is None:
+            store.save_page(url, whoscored_page(seed=i))
+            created += 1
+    return store, created
+
+
+def bench_parse(store, league_configs, repeat):
+    import fbref
+    import replay
+    from driver_pool import wait_for_rows
+    from selenium.webdriver.common.by import By
+    result = {}
+    for league, config in league_configs.items():
+        html = store.load('GET', config['fbref'])[1].decode('utf-8')
+        rows = fbref.parse_league_page(html)
+        result[f'fbref_{league}_ms'] = best_ms(lambda: fbref.parse_league_page(html), repeat)
+        result[f'fbref_{league}_oyuncu'] = len(rows)
+    url = f"https://tr.whoscored.com/Regions/252/Tournaments/{league_configs['premier']['whoscored']}/PlayerStatistics"
+
+    def whoscored():
+        driver = replay.FakeDriver(store)
+        driver.get(url)
+        for row in wait_for_rows(driver, '.player-main .table .player-table tbody tr', name='bench'):
+            [cell.text for cell in row.find_elements(By.TAG_NAME, 'td')]
+    result['whoscored_sahte_surucu_ms'] = best_ms(whoscored, repeat)
+    return result
+
+
+def source_frames(players, seed):
+    """Aynı oyuncuların üç kaynakta farklı yazımı (aksan, baş harf, sıra)"""
+    rnd = random.Random(seed)
+    first = ['Mauro', 'Edin', 'İrfan', 'Dušan', 'Çağlar', 'Kerem', 'Victor', 'Søren', 'Jérôme', 'Ömer']
+    last = ['Icardi', 'Džeko', 'Kahveci', 'Tadić', 'Söyüncü', 'Aktürkoğlu', 'Osimhen', 'Kjær', 'Boateng', 'Bayram']
+    names = [f'{rnd.choice(first)} {rnd.choice(last)} {i}' for i in range(players)]
+    ea = pd.DataFrame({'Oyuncu': names, 'EA_Rating': [rnd.randint(60, 90) for _ in names], 'Kaynak': 'EA FC 26'})
+    footy = pd.DataFrame({'Oyuncu': [n.replace('ž', 'z').replace('ć', 'c') for n in names],
+                          'Gol_90': [rnd.random() for _ in names], 'Kaynak': 'FootyStats'})
+    who = pd.DataFrame({'Oyuncu': [f'{n.split()[0][0]}. {" ".join(n.split()[1:])}' for n in names],
+                        'WhoScored_Rating': [rnd.uniform(6, 8) for _ in names], 'Kaynak': 'WhoScored'})
+    return [ea, footy, who]
+
+
+def bench_merge(repeat, players=500):
+    import identity
+    import playerStats
+    collector = playerStats.FootballDataCollector()
+    sources = {league: source_frames(players, i) for i, league in enumerate(LEAGUES)}
+
+    def merge(resolver):
+        merged = [collector.merge_league(resolver, league, collector.normalize_sources(resolver, league, frames))
+                  for league, frames in sources.items()]
+        return collector.merge_leagues(merged)
+
+    cold = []
+    for _ in range(repeat):
+        resolver = identity.IdentityResolver(path=None)
+        started = time.perf_counter()
+        final = merge(resolver)
+        cold.append(time.perf_counter() - started)
+    return {
+        'oyuncu': len(final),
+        'kimlik_soguk_ms': round(min(cold) * 1000, 3),        # Boş kimlik cache'i
+        'kimlik_sicak_ms': best_ms(lambda: merge(resolver), repeat),  # Kimlikler biliniyor
+    }
+
+
+def bench_scoring(store, league_configs, repeat):
+    import fbref
+    import views
+    import scoring
+    rows = {league: fbref.parse_league_page(store.load('GET', c['fbref'])[1].decode('utf-8'))
+            for league, c in league_configs.items()}
+    df = pd.concat([views.prepare_frame(r) for r in rows.values()], ignore_index=True)
+    result = {'oyuncu': len(df), 'prepare_ms': best_ms(lambda: views.prepare_frame(rows['premier']), repeat)}
+    for name, profile in scoring.PROFILES.items():
+        result[f'{name}_ms'] = best_ms(lambda: profile.score(df, 'premier'), repeat)
+    return result
+
+
+def serve(app):
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def load_test(url, headers, requests_count, concurrency):
+    import requests
+    local = threading.local()
+
+    def one(_):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        response = session.get(url, headers=headers, timeout=60)
+        return time.perf_counter() - started, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests_count)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(r[0] for r in results)
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'p50_ms': round(q[49] * 1000, 3),
+        'p95_ms': round(q[94] * 1000, 3),
+        'p99_ms': round(q[98] * 1000, 3),
+        'ort_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'istek_sn': round(requests_count / elapsed, 1),
+        'hata': sum(1 for r in results if r[1] != 200),
+    }
+
+
+def secure_headers():
+    import secure_app
+    return {'X-API-Key': next(iter(secure_app.API_KEYS)), 'User-Agent': 'Mozilla/5.0 bench'}
+
+
+def measure(base, headers, paths, requests_count, concurrency):
+    import requests
+    result = {}
+    for label, path in paths.items():
+        started = time.perf_counter()
+        status = requests.get(base + path, headers=headers, timeout=120).status_code
+        first = round((time.perf_counter() - started) * 1000, 3)
+        result[label] = dict(load_test(base + path, headers, requests_count, concurrency),
+                             ilk_istek_ms=first, ilk_durum=status)
+    return result
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def bench_serving(requests_count, concurrency, workers):
+    """gunicorn + secure_app ile uvicorn + asgi_app, ayrı süreçlerde aynı yük"""
+    import requests
+    root = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, RATELIMIT_ENABLED='0')  # Ölçüm yükü rate limit'e takılmasın
+    result = {}
+    for name, (module, command) in SERVERS.items():
+        if importlib.util.find_spec(module) is None:
+            print(f"⚠️ {module} kurulu değil, {name} atlandı")
+            continue
+        port = free_port()
+        process = subprocess.Popen([sys.executable, '-m', *command(port, workers)], cwd=root, env=env)
+        base = f'http://127.0.0.1:{port}'
+        try:
+            deadline = time.time() + 60
+            while True:
+                try:
+                    requests.get(base + '/health', timeout=1)
+                    break
+                except requests.RequestException:
+                    if process.poll() is not None or time.time() > deadline:
+                        raise RuntimeError(f'{name} açılamadı')
+                    time.sleep(0.2)
+            result[name] = measure(base, secure_headers(), SECURE_PATHS, requests_count, concurrency)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+    return result
+
+
+def bench_endpoints(requests_count, concurrency):
+    import app as app_module
+    import secure_app
+    # Ölçüm yükü rate limit'e takılmasın (limit kontrolünün maliyeti ölçüme dahil değil)
+    secure_app.limiter.enabled = False
+    targets = {
+        'app': (app_module.app, {}, {
+            'stats': '/api/stats/premier',
+            'keepers': '/api/keepers?lig=premier',
+            'compare': '/api/compare?ligler[]=premier&ligler[]=superlig',
+        }),
+        'secure_app': (secure_app.app, secure_headers(), SECURE_PATHS),
+    }
+    result = {}
+    for name, (wsgi_app, headers, paths) in targets.items():
+        server, base = serve(wsgi_app)
+        try:
+            result[name] = measure(base, headers, paths, requests_count, concurrency)
+        finally:
+            server.shutdown()
+    return result
+
+
+def flatten(data, prefix=''):
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{prefix}{key}.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f'{prefix}{key}'] = value
+    return flat
+
+
+def compare(old_path, new_path):
+    with open(old_path, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+    a, b = flatten(old['sonuclar']), flatten(new['sonuclar'])
+    print(f"{old['commit']} -> {new['commit']}")
+    for key in sorted(a.keys() & b.keys()):
+        if not a[key] or abs(b[key] - a[key]) / abs(a[key]) < THRESHOLD:
+            continue
+        # Süreler için artış kötü, istek/sn için iyi
+        worse = (b[key] > a[key]) != key.endswith('istek_sn')
+        print(f"  {'🔴' if worse else '🟢'} {key:<45} {a[key]:>10} -> {b[key]:>10} ({(b[key] - a[key]) / a[key]:+.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--fixtures', help='replay fixture dizini (yoksa geçici dizine sentetik sayfalar)')
+    parser.add_argument('--only', default=','.join(SECTIONS), help=','.join(SECTIONS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=200, help='endpoint başına istek')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=2, help='serving: sunucu başına worker')
+    parser.add_argument('--output')
+    parser.add_argument('--compare', nargs=2, metavar=('ESKI', 'YENI'))
+    args = parser.parse_args()
+    if args.compare:
+        return compare(*args.compare)
+
+    sections = [s for s in args.only.split(',') if s in SECTIONS]
+    workdir = tempfile.mkdtemp(prefix='bench-')
+    fixtures = args.fixtures or os.path.join(workdir, 'fixtures')
+    # Uygulamalar import edilmeden önce: çevrimdışı, izole durum dizinleri, arka plan yenileme kapalı
+    os.environ.update({
+        'REPLAY_MODE': 'replay', 'REPLAY_DIR': fixtures, 'REFRESH_ENABLED': '0',
+        'SNAPSHOT_DIR': os.path.join(workdir, 'snapshots'), 'HISTORY_DIR': os.path.join(workdir, 'history'),
+        'HTTP_CACHE_DIR': os.path.join(workdir, 'http_cache'), 'IDENTITY_PATH': os.path.join(workdir, 'identity.json'),
+        'CACHE_URL': 'memory://',
+    })
+    # app.py import edilmeden ayarlar okunamaz; URL'ler sınıf özniteliği
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app import AdvancedStatsCollector
+    store, created = prepare_fixtures(fixtures, AdvancedStatsCollector.league_configs)
+    print(f"📁 Fixture'lar: {fixtures} ({created} sentetik)")
+
+    results = {}
+    if 'parse' in sections:
+        results['parse'] = bench_parse(store, AdvancedStatsCollector.league_configs, args.repeat)
+    if 'merge' in sections:
+        results['merge'] = bench_merge(args.repeat)
+    if 'scoring' in sections:
+        results['scoring'] = bench_scoring(store, AdvancedStatsCollector.league_configs, args.repeat)
+    if 'endpoint' in sections:
+        results['endpoint'] = bench_endpoints(args.requests, args.concurrency)
+    if 'serving' in sections:
+        results['serving'] = bench_serving(args.requests, args.concurrency, args.workers)
+
+    report = {
+        'commit': commit(),
+        'zaman': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'ayarlar': {'repeat': args.repeat, 'requests': args.requests, 'concurrency': args.concurrency,
+                    'workers': args.workers,
+                    'fixtures': args.fixtures or 'sentetik', 'sentetik_fixture': created},
+        'sonuclar': results,
+    }
+    output = args.output or os.path.join(BENCH_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"\n✅ Sonuçlar: {output}")
+
+
+if __name__ == '__main__':
+    main()
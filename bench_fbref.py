@@ -0,0 +1,91 @@
+"""FBref parse benchmark'ı: tüm sayfa + html.parser vs hedef tablolar + lxml.
+
+Kaydedilmiş sayfalar fixtures/fbref/*.html altındaysa onlar kullanılır, yoksa
+FBref yapısında (yorum içindeki tablolar, filler script/nav) bir sayfa üretilir.
+
+    python bench_fbref.py --repeat 5
+"""
+import argparse
+import glob
+import os
+import random
+import time
+
+from bs4 import BeautifulSoup
+
+import fbref
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'fbref')
+
+
+def make_fbref_page(players=550, seed=7):
+    """FBref lig sayfasına benzer sentetik sayfa (standart tablo açık, diğerleri yorum içinde)"""
+    rnd = random.Random(seed)
+    squads = [f'Kulüp {i}' for i in range(20)]
+    roster = [(rnd.choice(squads), f'Oyuncu {i}', '%08x' % rnd.getrandbits(32), rnd.choice(['GK', 'DF', 'MF', 'FW']))
+              for i in range(players)]
+
+    def table(table_id, ncells):
+        rows = []
+        for i, (squad, name, pid, pos) in enumerate(roster):
+            cells = [f'<td class="left" data-stat="team"><a href="/en/squads/x/{squad}">{squad}</a></td>',
+                     f'<td class="left" data-stat="player" data-append-csv="{pid}">'
+                     f'<a href="/en/players/{pid}/{name.replace(" ", "-")}">{name}</a></td>',
+                     f'<td class="center" data-stat="position">{pos}</td>']
+            cells += [f'<td class="right" data-stat="c{c}">{rnd.randint(0, 90)}.{rnd.randint(0, 9)}</td>'
+                      for c in range(3, ncells)]
+            rows.append(f'<tr><th scope="row" class="right" data-stat="ranker">{i + 1}</th>{"".join(cells)}</tr>')
+            if i % 25 == 24:
+                rows.append('<tr class="thead"><th>Rk</th><th>Player</th></tr>')
+        return (f'<div class="table_container" id="div_{table_id}"><table class="stats_table" id="{table_id}">'
+                f'<thead><tr><th>Rk</th></tr></thead><tbody>{"".join(rows)}</tbody></table></div>')
+
+    filler = ''.join(f'<div class="nav"><ul>{"".join(f"<li><a href=/x/{j}>Link {j}</a></li>" for j in range(40))}</ul></div>'
+                     f'<script>var data{i} = {list(range(200))};</script>' for i in range(60))
+    hidden = ''.join(f'<div class="placeholder"></div>\n<!--\n{table(t, n)}\n-->'
+                     for t, n in (('stats_defense', 20), ('stats_keeper', 26), ('stats_gca', 20)))
+    return f'<html><head><title>FBref</title></head><body>{filler}{table("stats_standard", 30)}{hidden}</body></html>'
+
+
+def full_document_parse(html):
+    """Eski yol: yorumlar açılıp tüm doküman html.parser ile parse edilir"""
+    soup = BeautifulSoup(html.replace('<!--', '').replace('-->', ''), 'html.parser')
+    rows = {t: fbref.soup_rows(soup.select(f'table#{t} tbody tr')) for t in fbref.TABLE_IDS}
+    return fbref.build_players(rows)
+
+
+def timed(func, html, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(html)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pages = {os.path.basename(p): open(p, encoding='utf-8').read()
+             for p in sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html')))}
+    if not pages:
+        pages = {'sentetik-550-oyuncu': make_fbref_page()}
+
+    variants = [
+        ('tam sayfa + html.parser', full_document_parse),
+        ('hedef tablolar + html.parser', lambda h: fbref.build_players(fbref.table_rows(h, 'html.parser'))),
+        (f'hedef tablolar + {fbref.PARSER}', fbref.parse_league_page),
+    ]
+    for name, html in pages.items():
+        print(f"\n📄 {name} ({len(html) / 1024:.0f} KB)")
+        baseline, expected = timed(variants[0][1], html, args.repeat)
+        for label, func in variants:
+            seconds, result = timed(func, html, args.repeat)
+            same = '✓' if result == expected else '✗ farklı sonuç'
+            print(f"  {label:<32} {seconds * 1000:8.1f} ms  x{baseline / seconds:5.1f}  {len(result)} oyuncu {same}")
+
+
+if __name__ == '__main__':
+    main()
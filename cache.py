@@ -0,0 +1,536 @@
+import os
+import sys
+import time
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+from limits.storage import Storage
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Aynı anahtar için eşzamanlı çağrıları birleştirir.
+
+    İlk gelen thread fonksiyonu çalıştırır, diğerleri onun sonucunu (veya
+    hatasını) bekleyip paylaşır. Böylece cache süresi dolduğunda her lig için
+    aynı anda sadece bir scraping çalışır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self):
+        with self._lock:
+            return list(self._calls)
+
+
+def estimate_size(value, _seen=None):
+    """Değerin yaklaşık bellek boyutu (byte); DataFrame için pandas ölçümü"""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage):
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, 'sum') else usage)
+        except TypeError:
+            pass
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, _seen) for v in value)
+    return size
+
+
+class TTLCache:
+    """Sınırlı, TTL'li LRU cache.
+
+    `max_entries` ve `max_bytes` aşıldığında en az kullanılan kayıtlar atılır,
+    süresi dolan kayıtlar okunurken ve yazarken temizlenir. Hit/miss/eviction
+    sayaçları `stats()` ile izlenebilir.
+    """
+
+    shared = False  # Sadece bu process
+
+    def __init__(self, ttl=1800, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            if item[1] <= time.time():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key, value, ttl=None):
+        size = estimate_size(value)
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            if size > self.max_bytes:
+                # Tek başına sınırı aşan değer cache'lenmez
+                self.evictions += 1
+                return
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            self._evict()
+
+    def add(self, key, value, ttl=None):
+        """Anahtar yoksa (veya süresi dolmuşsa) yaz; yazıldıysa True"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[1] > time.time():
+                return False
+        self.set(key, value, ttl)
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def __getitem__(self, key):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self._data:
+                raise KeyError(key)
+            self._remove(key)
+
+    def __contains__(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and item[1] > time.time()
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def purge_expired(self):
+        with self._lock:
+            self._purge_expired()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'kayit': len(self._data),
+                'byte': self._bytes,
+                'max_kayit': self.max_entries,
+                'max_byte': self.max_bytes,
+                'hit': self.hits,
+                'miss': self.misses,
+                'eviction': self.evictions,
+                'expired': self.expirations,
+            }
+
+    def _remove(self, key):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def _purge_expired(self):
+        now = time.time()
+        for key in [k for k, item in self._data.items() if item[1] <= now]:
+            self._remove(key)
+            self.expirations += 1
+
+    def _evict(self):
+        if len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            self._purge_expired()
+        while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            key = next(iter(self._data))
+            self._remove(key)
+            self.evictions += 1
+
+
+def _key(key):
+    return key if isinstance(key, str) else repr(key)
+
+
+class SqliteCache:
+    """Worker'lar arası paylaşımlı, dosya tabanlı cache (sqlite, WAL modu).
+
+    gunicorn worker'ları aynı dosyayı kullanır; böylece bir lig her TTL
+    penceresinde worker sayısı kadar değil bir kez çekilir. Değerler pickle
+    ile saklanır, sınırlar ve sayaçlar `TTLCache` ile aynıdır.
+    """
+
+    shared = True
+
+    def __init__(self, path, ttl=1800, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._conn().execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value BLOB, size INTEGER, expires REAL, accessed REAL)'
+        )
+
+    def _conn(self):
+        # Bağlantılar thread ve process (fork) başına ayrı tutulur
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key, default=None):
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute('SELECT value, expires, accessed FROM cache WHERE key = ?', (_key(key),)).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        if row[1] <= now:
+            conn.execute('DELETE FROM cache WHERE key = ? AND expires <= ?', (_key(key), now))
+            self.expirations += 1
+            self.misses += 1
+            return default
+        if now - row[2] > 1:  # LRU zamanını her okumada yazma
+            conn.execute('UPDATE cache SET accessed = ? WHERE key = ?', (now, _key(key)))
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            self.evictions += 1
+            return
+        now = time.time()
+        expires = now + (self.ttl if ttl is None else ttl)
+        conn = self._conn()
+        conn.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)',
+                     (_key(key), blob, len(blob), expires, now))
+        self._evict(conn)
+
+    def add(self, key, value, ttl=None):
+        """Anahtar yoksa (veya süresi dolmuşsa) atomik olarak yaz; yazıldıysa True"""
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        expires = now + (self.ttl if ttl is None else ttl)
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM cache WHERE key = ? AND expires <= ?', (_key(key), now))
+            cur = conn.execute('INSERT OR IGNORE INTO cache VALUES (?, ?, ?, ?, ?)',
+                               (_key(key), blob, len(blob), expires, now))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return cur.rowcount == 1
+
+    def delete(self, key):
+        self._conn().execute('DELETE FROM cache WHERE key = ?', (_key(key),))
+
+    def __getitem__(self, key):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __contains__(self, key):
+        row = self._conn().execute('SELECT 1 FROM cache WHERE key = ? AND expires > ?',
+                                   (_key(key), time.time())).fetchone()
+        return row is not None
+
+    def __len__(self):
+        return self._conn().execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def clear(self):
+        self._conn().execute('DELETE FROM cache')
+
+    def purge_expired(self):
+        cur = self._conn().execute('DELETE FROM cache WHERE expires <= ?', (time.time(),))
+        self.expirations += cur.rowcount
+
+    def _evict(self, conn):
+        count, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        self.purge_expired()
+        rows = conn.execute('SELECT key, size FROM cache ORDER BY accessed DESC').fetchall()
+        keep, kept_bytes, drop = 0, 0, []
+        for key, size in rows:
+            if keep < self.max_entries and kept_bytes + size <= self.max_bytes:
+                keep += 1
+                kept_bytes += size
+            else:
+                drop.append((key,))
+        conn.executemany('DELETE FROM cache WHERE key = ?', drop)
+        self.evictions += len(drop)
+
+    def stats(self):
+        count, total = self._conn().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        return {
+            'backend': 'sqlite',
+            'kayit': count,
+            'byte': total,
+            'max_kayit': self.max_entries,
+            'max_byte': self.max_bytes,
+            'hit': self.hits,
+            'miss': self.misses,
+            'eviction': self.evictions,
+            'expired': self.expirations,
+        }
+
+
+class RedisCache:
+    """Redis üzerinde paylaşımlı cache.
+
+    `redis` paketi opsiyoneldir; testlerde `client` olarak Redis protokolünü
+    konuşan herhangi bir istemci (örn. fakeredis) verilebilir. Bellek sınırı ve
+    eviction Redis'in `maxmemory` / `maxmemory-policy` ayarlarıyla yapılır.
+    """
+
+    shared = True
+
+    def __init__(self, url=None, ttl=1800, client=None, prefix='footballstats:'):
+        if client is None:
+            import redis  # Opsiyonel bağımlılık: pip install redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def _k(self, key):
+        return self.prefix + _key(key)
+
+    def _keys(self):
+        return list(self.client.scan_iter(match=self.prefix + '*'))
+
+    def get(self, key, default=None):
+        blob = self.client.get(self._k(key))
+        if blob is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(blob)
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        self.client.set(self._k(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                        px=max(int(ttl * 1000), 1))
+
+    def add(self, key, value, ttl=None):
+        """Anahtar yoksa atomik olarak yaz (SET NX); yazıldıysa True"""
+        ttl = self.ttl if ttl is None else ttl
+        return bool(self.client.set(self._k(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                                    nx=True, px=max(int(ttl * 1000), 1)))
+
+    def delete(self, key):
+        self.client.delete(self._k(key))
+
+    def __getitem__(self, key):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __contains__(self, key):
+        return bool(self.client.exists(self._k(key)))
+
+    def __len__(self):
+        return len(self._keys())
+
+    def clear(self):
+        keys = self._keys()
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self):
+        # byte: SqliteCache'teki gibi pickle'lanmış değerlerin toplamı (STRLEN)
+        keys = self._keys()
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.strlen(key)
+        sizes = pipe.execute() if keys else []
+        return {
+            'backend': 'redis',
+            'kayit': len(keys),
+            'byte': sum(sizes),
+            'hit': self.hits,
+            'miss': self.misses,
+        }
+
+
+class SqliteLimiterStorage(Storage):
+    """Flask-Limiter için sqlite storage: `storage_uri="sqlite:///yol/cache.db"`
+
+    `SqliteCache` ile aynı dosya kullanılabilir; sayaçlar tüm worker'larda ortaktır.
+    Sabit pencere (fixed-window) stratejisini destekler.
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        self.path = sqlite_path(uri)
+        self._local = threading.local()
+        self._conn().execute(
+            'CREATE TABLE IF NOT EXISTS limits (key TEXT PRIMARY KEY, count INTEGER, expires REAL)'
+        )
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM limits WHERE key = ? AND expires <= ?', (key, now))
+            conn.execute('INSERT OR IGNORE INTO limits VALUES (?, 0, ?)', (key, now + expiry))
+            conn.execute('UPDATE limits SET count = count + ? WHERE key = ?', (amount, key))
+            count = conn.execute('SELECT count FROM limits WHERE key = ?', (key,)).fetchone()[0]
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return count
+
+    def get(self, key):
+        row = self._conn().execute('SELECT count FROM limits WHERE key = ? AND expires > ?',
+                                   (key, time.time())).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        row = self._conn().execute('SELECT expires FROM limits WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self):
+        try:
+            self._conn().execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._conn().execute('DELETE FROM limits').rowcount
+
+    def clear(self, key):
+        self._conn().execute('DELETE FROM limits WHERE key = ?', (key,))
+
+
+def sqlite_path(url):
+    """'sqlite:////tmp/cache.db' -> '/tmp/cache.db', 'sqlite:///cache.db' -> 'cache.db'"""
+    return url.split('://', 1)[1][1:] or 'footballstats_cache.db'
+
+
+def from_url(url, ttl):
+    """memory:// (varsayılan), sqlite:///dosya.db veya redis://host:6379/0"""
+    max_entries = int(os.environ.get('CACHE_MAX_ENTRIES', 512))
+    max_bytes = int(os.environ.get('CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    scheme = urlparse(url).scheme
+    if scheme == 'sqlite':
+        return SqliteCache(sqlite_path(url), ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+    if scheme in ('redis', 'rediss'):
+        return RedisCache(url, ttl=ttl)
+    return TTLCache(ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+
+
+def from_env(ttl):
+    """CACHE_URL, CACHE_MAX_ENTRIES ve CACHE_MAX_BYTES ile yapılandırılmış cache"""
+    return from_url(os.environ.get('CACHE_URL', 'memory://'), ttl)
+
+
+def limiter_storage_uri():
+    """Flask-Limiter sayaçları da cache ile aynı paylaşımlı backend'i kullanır"""
+    return os.environ.get('RATELIMIT_STORAGE_URI', os.environ.get('CACHE_URL', 'memory://'))
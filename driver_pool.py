@@ -0,0 +1,251 @@
+"""Selenium scraper'ları için paylaşımlı headless Chrome havuzu.
+
+Her çağrıda yeni `webdriver.Chrome` açıp kapatmak saniyeler ve yüzlerce MB
+tutuyor. Havuz sabit sayıda sürücüyü yeniden kullanır: başlangıçta ısıtılır,
+her kullanımdan önce sağlık kontrolü yapılır, N sayfadan sonra veya hata
+alındığında sürücü yenilenir, boş sürücü yoksa `checkout_timeout` kadar beklenir.
+
+Kullanım:
+    with pool.driver() as driver:
+        driver.get(url)
+        rows = wait_for_rows(driver, 'table tbody tr', name='ornek')
+"""
+import os
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import (StaleElementReferenceException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(TimeoutError):
+    """Süre içinde boş sürücü bulunamadı"""
+
+
+def chrome_options():
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    return options
+
+
+class _Slot:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created = time.time()
+
+
+class DriverPool:
+    def __init__(self, size=2, max_pages=50, checkout_timeout=60, factory=None):
+        self.size = size
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        self.factory = factory or (lambda: webdriver.Chrome(options=chrome_options()))
+        self._available = threading.BoundedSemaphore(size)
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.in_use = 0
+
+    def _create(self):
+        with metrics.span('chrome_start'):
+            slot = _Slot(self.factory())
+        with self._lock:
+            self.created += 1
+        return slot
+
+    def _quit(self, slot):
+        try:
+            slot.driver.quit()
+        except Exception:
+            pass
+
+    def _healthy(self, slot):
+        try:
+            slot.driver.current_url  # chromedriver'a tek round-trip
+            return True
+        except Exception:
+            return False
+
+    def warm_up(self, count=None):
+        """Havuzu önceden doldur (ilk istek Chrome açılışını beklemesin)"""
+        count = self.size if count is None else min(count, self.size)
+        for _ in range(count - len(self._idle)):
+            try:
+                slot = self._create()
+            except Exception as e:
+                logger.warning("Chrome başlatılamadı: %s", e)
+                return
+            with self._lock:
+                self._idle.append(slot)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        timeout = self.checkout_timeout if timeout is None else timeout
+        with metrics.span('chrome_checkout'):
+            acquired = self._available.acquire(timeout=timeout)
+        if not acquired:
+            with self._lock:
+                self.timeouts += 1
+            raise PoolTimeout(f"{timeout} sn içinde boş Chrome bulunamadı")
+
+        slot = None
+        try:
+            with self._lock:
+                slot = self._idle.popleft() if self._idle else None
+                self.checkouts += 1
+                self.in_use += 1
+            if slot is not None and not self._healthy(slot):
+                with self._lock:
+                    self.crashed += 1
+                self._quit(slot)
+                slot = None
+            if slot is None:
+                slot = self._create()
+
+            try:
+                yield slot.driver
+            except WebDriverException:
+                # Çöken/bozulan sürücü havuza geri konmaz
+                with self._lock:
+                    self.crashed += 1
+                self._quit(slot)
+                slot = None
+                raise
+
+            slot.pages += 1
+            if slot.pages >= self.max_pages:
+                with self._lock:
+                    self.recycled += 1
+                self._quit(slot)
+                slot = None
+        finally:
+            with self._lock:
+                self.in_use -= 1
+                if slot is not None:
+                    if self._closed:
+                        self._quit(slot)
+                    else:
+                        self._idle.append(slot)
+            self._available.release()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        for slot in idle:
+            self._quit(slot)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'boyut': self.size,
+                'bos': len(self._idle),
+                'kullanimda': self.in_use,
+                'olusturulan': self.created,
+                'yenilenen': self.recycled,
+                'coken': self.crashed,
+                'checkout': self.checkouts,
+                'zaman_asimi': self.timeouts,
+            }
+
+
+pool = DriverPool(
+    size=int(os.environ.get('CHROME_POOL_SIZE', 2)),
+    max_pages=int(os.environ.get('CHROME_MAX_PAGES', 50)),
+    checkout_timeout=float(os.environ.get('CHROME_CHECKOUT_TIMEOUT', 60)),
+)
+atexit.register(pool.close)
+
+
+def warm_up_in_background():
+    """CHROME_WARMUP=1 ise havuzu arka planda ısıt"""
+    if os.environ.get('CHROME_WARMUP', '0') == '1':
+        threading.Thread(target=pool.warm_up, name='chrome-warmup', daemon=True).start()
+
+
+RENDER_TIMEOUT = float(os.environ.get('RENDER_TIMEOUT', 15))
+
+
+class RenderTimings:
+    """Sayfa bazlı gerçek render süreleri (sabit sleep yerine ölçülen bekleme)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, name, seconds, timed_out):
+        with self._lock:
+            s = self._stats.setdefault(name, {'sayi': 0, 'toplam': 0.0, 'max': 0.0, 'son': 0.0, 'zaman_asimi': 0})
+            s['sayi'] += 1
+            s['toplam'] += seconds
+            s['max'] = max(s['max'], seconds)
+            s['son'] = seconds
+            s['zaman_asimi'] += int(timed_out)
+
+    def stats(self):
+        with self._lock:
+            return {
+                name: {
+                    'sayi': s['sayi'],
+                    'ort_sn': round(s['toplam'] / s['sayi'], 3),
+                    'max_sn': round(s['max'], 3),
+                    'son_sn': round(s['son'], 3),
+                    'zaman_asimi': s['zaman_asimi'],
+                }
+                for name, s in self._stats.items()
+            }
+
+
+render_timings = RenderTimings()
+
+
+def wait_for_rows(driver, selector, name, timeout=None, min_rows=1, poll=0.1):
+    """Tablo satırları dolana kadar bekle ve satırları döndür.
+
+    Sabit `time.sleep` yerine: `selector` ile en az `min_rows` satır bulunup
+    ilk satırda metin göründüğü an döner. Süre dolarsa o ana kadar yüklenen
+    satırlar döner (boş olabilir). Gerçek bekleme süresi `render_timings`'e yazılır.
+    """
+    timeout = RENDER_TIMEOUT if timeout is None else timeout
+
+    def populated(d):
+        try:
+            rows = d.find_elements(By.CSS_SELECTOR, selector)
+            if len(rows) >= min_rows and rows[0].text.strip():
+                return rows
+        except StaleElementReferenceException:
+            pass  # Tablo yeniden çiziliyor
+        return False
+
+    started = time.perf_counter()
+    with metrics.span('render', name):
+        try:
+            rows = WebDriverWait(driver, timeout, poll_frequency=poll).until(populated)
+            timed_out = False
+        except TimeoutException:
+            logger.warning("%s: %s sn içinde tablo dolmadı, mevcut satırlar kullanılıyor", name, timeout)
+            rows = driver.find_elements(By.CSS_SELECTOR, selector)
+            timed_out = True
+    render_timings.record(name, time.perf_counter() - started, timed_out)
+    return rows
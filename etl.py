@@ -0,0 +1,186 @@
+"""Offline collector'ların aşamalı, cache'li çalıştırması (pipeline.py üzerinde).
+
+    fetch:<kaynak>:<lig> -> parse:<kaynak>:<lig> -> normalize:<lig> -> merge:<lig>
+        -> merge:tum_ligler -> export:tum_ligler
+                            -> analiz:kap (+ merge:kap_transferler) -> export:tam_analiz
+    fetch:kap:<kulüp> -> merge:kap_transferler -> export:kap_transferler
+    fetch:<finans/piyasa kaynağı> -> export:<ad>
+
+Ara çıktılar PIPELINE_DIR (varsayılan .pipeline) altında içerik hash'iyle
+saklanır; yeniden çalıştırmada sadece değişen aşamalar koşar. Bir kaynak
+hata verirse o ligin diğer kaynaklarıyla devam edilir.
+
+    python etl.py                           # tümü
+    python etl.py --only league=premier     # sadece Premier aşamaları (+ aşağı akış)
+    python etl.py --only source=ea,who      # sadece EA FC ve WhoScored
+    python etl.py --only group=kap --force  # cache'e bakmadan
+    python etl.py --list
+"""
+import os
+import sys
+import time
+import argparse
+import importlib
+import logging
+import threading
+
+import pandas as pd
+
+import kap
+import identity
+import snapshot
+import playerStats
+from pipeline import Pipeline, Stage, parse_only
+
+# Kaynak: (host, fetch metodu, parse metodu, lig -> kaynak parametresi, fetch hatasında ham değer)
+SOURCES = {
+    'ea': ('ea.com', 'fetch_ea_page', 'parse_ea_page', lambda league: league, ''),
+    'footy': ('footystats.org', 'fetch_footystats_page', 'parse_footystats_page', lambda league: league, ''),
+    'who': ('whoscored.com', 'fetch_whoscored_rows', 'parse_whoscored_rows',
+            lambda league: playerStats.LEAGUE_CODES[league], []),
+}
+KAP_CLUBS = ['FENER', 'GALAS']
+# sn; >0 ise bu süreden yeni fetch çıktıları yeniden çekilmez
+FETCH_MAX_AGE = int(os.environ.get('ETL_FETCH_MAX_AGE', 0))
+
+collector = playerStats.FootballDataCollector()
+_identity_lock = threading.Lock()
+
+
+def fetch(source, key):
+    return getattr(collector, SOURCES[source][1])(key)
+
+
+def parse(raw, source, key):
+    return getattr(collector, SOURCES[source][2])(raw, key)
+
+
+def normalize(*sources, league):
+    # Kimlik dosyası tek; paralel lig aşamaları birbirinin yazdığını ezmesin
+    with _identity_lock:
+        resolver = identity.IdentityResolver()
+        frames = collector.normalize_sources(resolver, league, sources)
+        resolver.save()
+    return frames
+
+
+def merge_league(frames, league):
+    return collector.merge_league(identity.IdentityResolver(), league, frames)
+
+
+def merge_leagues(*frames):
+    return collector.merge_leagues(frames)
+
+
+def concat(*frames):
+    return pd.concat(frames, ignore_index=True)
+
+
+def analyse(skills_df, kap_df):
+    # Oyuncu istatistikleri + KAP transfer bildirimleri
+    if kap_df.empty:
+        return skills_df
+    return skills_df.merge(kap_df, left_on='Oyuncu', right_on='Bildirim', how='left')
+
+
+def export(df, name):
+    if df.empty:
+        return None
+    return snapshot.write(name, snapshot.typed(df), time.time())
+
+
+def market(func_name):
+    # backend-v1.py (modül adında tire var) snapshot'ını kendisi yazar
+    return getattr(importlib.import_module('backend-v1'), func_name)()
+
+
+def stages():
+    empty = pd.DataFrame()
+    result = []
+    for league in playerStats.LEAGUES:
+        for source, (host, _, _, key, missing) in SOURCES.items():
+            tags = {'group': 'playerStats', 'league': league, 'source': source}
+            result.append(Stage(f'fetch:{source}:{league}', fetch, params={'source': source, 'key': key(league)},
+                                tags=tags, volatile=True, max_age=FETCH_MAX_AGE, host=host, fallback=missing))
+            result.append(Stage(f'parse:{source}:{league}', parse, deps=[f'fetch:{source}:{league}'],
+                                params={'source': source, 'key': key(league)}, tags=tags, fallback=empty,
+                                code=[getattr(collector, SOURCES[source][2])]))
+        tags = {'group': 'playerStats', 'league': league}
+        result.append(Stage(f'normalize:{league}', normalize, deps=[f'parse:{s}:{league}' for s in playerStats.SOURCES],
+                            params={'league': league}, tags=tags,
+                            code=[collector.normalize_sources, identity.IdentityResolver]))
+        result.append(Stage(f'merge:{league}', merge_league, deps=[f'normalize:{league}'],
+                            params={'league': league}, tags=tags, code=[collector.merge_league]))
+
+    tags = {'group': 'playerStats'}
+    result += [
+        Stage('merge:tum_ligler', merge_leagues, deps=[f'merge:{l}' for l in playerStats.LEAGUES], tags=tags,
+              code=[collector.merge_leagues]),
+        Stage('export:tum_ligler', export, deps=['merge:tum_ligler'],
+              params={'name': 'playerStats/tum_ligler'}, tags=tags),
+        Stage('analiz:kap', analyse, deps=['merge:tum_ligler', 'merge:kap_transferler'], tags=tags),
+        Stage('export:tam_analiz', export, deps=['analiz:kap'], params={'name': 'playerStats/tam_analiz'}, tags=tags),
+    ]
+
+    tags = {'group': 'kap'}
+    for club in KAP_CLUBS:
+        result.append(Stage(f'fetch:kap:{club}', kap.scrape_kap_transfers, params={'kulup_ticker': club},
+                            tags=dict(tags, source='kap'), volatile=True, max_age=FETCH_MAX_AGE,
+                            host='kap.org.tr', fallback=empty))
+    result += [
+        Stage('merge:kap_transferler', concat, deps=[f'fetch:kap:{c}' for c in KAP_CLUBS], tags=tags),
+        Stage('export:kap_transferler', export, deps=['merge:kap_transferler'],
+              params={'name': 'kap/transferler'}, tags=tags),
+        Stage('fetch:premier_finans', kap.get_companies_house_finans, params={'pl_club': 'Arsenal FC'},
+              tags=dict(tags, league='premier'), volatile=True, max_age=FETCH_MAX_AGE),
+        Stage('export:premier_finans', export, deps=['fetch:premier_finans'],
+              params={'name': 'kap/premier_finans'}, tags=dict(tags, league='premier')),
+        Stage('fetch:spl_finans', kap.get_capology_spl, tags=dict(tags, league='saudi'),
+              volatile=True, max_age=FETCH_MAX_AGE),
+        Stage('export:spl_finans', export, deps=['fetch:spl_finans'],
+              params={'name': 'kap/spl_finans'}, tags=dict(tags, league='saudi')),
+        Stage('fetch:bundesliga_maclar', kap.get_openligadb_bundesliga, tags=dict(tags, league='bundesliga'),
+              volatile=True, max_age=FETCH_MAX_AGE),
+    ]
+
+    tags = {'group': 'piyasa', 'league': 'superlig'}
+    result += [
+        Stage('fetch:footystats_piyasa', market, params={'func_name': 'scrape_footystats_market_values'},
+              tags=tags, volatile=True, max_age=FETCH_MAX_AGE, host='footystats.org'),
+        Stage('fetch:transfermarkt', market, params={'func_name': 'get_transfermarkt_via_apify'},
+              tags=tags, volatile=True, max_age=FETCH_MAX_AGE),
+    ]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Aşamalı, cache\'li veri toplama')
+    parser.add_argument('--only', action='append', help='etiket=değer[,değer] (league, source, group)')
+    parser.add_argument('--force', action='store_true', help='cache\'i yok say, seçili aşamaları yeniden çalıştır')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--list', action='store_true', help='aşamaları listele')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    pipeline = Pipeline(stages(), max_workers=args.workers)
+    try:
+        only = parse_only(args.only)
+    except ValueError as e:
+        sys.exit(str(e))
+    if args.list:
+        for name in sorted(pipeline.select(only)):
+            stage = pipeline.stages[name]
+            print(name, stage.tags, '<-', ', '.join(stage.deps) or '-')
+        return
+
+    started = time.perf_counter()
+    report = pipeline.run(only=only, force=args.force)
+    for name in sorted(report):
+        print(f'{report[name]:>11}  {name}')
+    counts = pd.Series(report).value_counts().to_dict() if report else {}
+    print(f"\n✅ {len(report)} aşama, {time.perf_counter() - started:.1f} sn: {counts}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
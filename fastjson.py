@@ -0,0 +1,142 @@
+"""Önceden kodlanmış JSON cevapları (orjson, ETag/304, gzip/brotli).
+
+Görünüm cache'i veriyi dict olarak değil, kodlanmış byte'lar olarak tutar:
+cache isabetinde `to_dict` + `jsonify` maliyeti yoktur, gövde ve sıkıştırılmış
+varyantları cache dolarken bir kez üretilir. Her gövdenin güçlü bir ETag'i
+vardır; `If-None-Match` eşleşirse gövdesiz 304 döner.
+
+orjson yoksa standart json'a düşülür (NaN -> null dönüşümü her iki yolda da
+aynı; eski jsonify geçersiz `NaN` üretiyordu). brotli opsiyoneldir.
+
+    return fastjson.respond(collector.view(entry, league, 'stats', build, encoded=True))
+"""
+import os
+import gzip
+import json
+import math
+import hashlib
+
+import numpy as np
+from flask import Response, request
+from werkzeug.http import parse_accept_header, parse_etags
+
+import metrics
+
+try:
+    import orjson
+except ImportError:  # Opsiyonel hızlı encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Opsiyonel
+    brotli = None
+
+COMPRESS = os.environ.get('RESPONSE_COMPRESSION', '1') == '1'
+COMPRESS_MIN_BYTES = 1024  # Bunun altında sıkıştırma kazandırmıyor
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def _clean(value):
+    """Standart json yolu: NaN/inf -> None, numpy skalerleri -> Python"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _clean(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(v) for v in value]
+    if isinstance(value, np.generic):
+        return _clean(value.item())
+    return value
+
+
+def dumps(data):
+    """-> UTF-8 JSON byte'ları"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_clean(data), default=_default, ensure_ascii=False, separators=(',', ':'),
+                      allow_nan=False).encode('utf-8')
+
+
+class Encoded:
+    """Kodlanmış gövde, ETag ve sıkıştırılmış varyantlar (cache'te tutulan değer)"""
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = hashlib.blake2b(body, digest_size=12).hexdigest()
+        self.variants = {}
+        if COMPRESS and len(body) >= COMPRESS_MIN_BYTES:
+            self.variants['gzip'] = gzip.compress(body, GZIP_LEVEL, mtime=0)
+            if brotli is not None:
+                self.variants['br'] = brotli.compress(body, quality=BROTLI_QUALITY)
+
+    def memory_usage(self, deep=True):
+        """cache.estimate_size için"""
+        return len(self.body) + sum(len(v) for v in self.variants.values())
+
+
+def encode(data):
+    with metrics.span('serialize'):
+        return Encoded(dumps(data))
+
+
+def _tag(etag, coding):
+    return f'{etag}-{coding}' if coding else etag
+
+
+def _coding(encoded, accept_encoding):
+    accepted = parse_accept_header(accept_encoding)
+    return next((c for c in ('br', 'gzip') if c in encoded.variants and accepted[c]), None)
+
+
+def negotiate(encoded, if_none_match=None, accept_encoding=None, status=200):
+    """-> (durum, gövde, başlıklar); If-None-Match'e göre 304, Accept-Encoding'e göre varyant.
+
+    Çerçeveden bağımsız: Flask (`respond`) ve ASGI (asgi_app) katmanları ortak kullanır.
+    """
+    headers = {'Vary': 'Accept-Encoding', 'Cache-Control': 'no-cache'}
+    if status == 200 and if_none_match:
+        etags = parse_etags(if_none_match)
+        # '*' dahil: ETags.contains yıldızı da eşler
+        candidates = [_tag(encoded.etag, c) for c in [None, *encoded.variants]]
+        matched = next((t for t in candidates if etags.contains(t)), None)
+        if matched:
+            metrics.count('not_modified')
+            if etags.star_tag:
+                # '*': istemcinin tuttuğu gösterim bilinmiyor, bu istekte seçilecek olanınki
+                matched = _tag(encoded.etag, _coding(encoded, accept_encoding))
+            # Eşleşen gösterimin doğrulayıcısı (gzip ETag'i ile sorulduysa gzip ETag'i)
+            headers['ETag'] = f'"{matched}"'
+            return 304, b'', headers
+
+    coding = _coding(encoded, accept_encoding)
+    if coding:
+        headers['Content-Encoding'] = coding
+    # Varyantlar farklı gösterimler: her biri kendi ETag'i ile
+    headers['ETag'] = f'"{_tag(encoded.etag, coding)}"'
+    return status, encoded.variants[coding] if coding else encoded.body, headers
+
+
+def respond(encoded, status=200):
+    """Encoded -> Flask Response"""
+    status, body, headers = negotiate(encoded, request.headers.get('If-None-Match'),
+                                      request.headers.get('Accept-Encoding'), status)
+    if status == 304:
+        return Response(status=304, headers=headers)
+    return Response(body, status=status, mimetype='application/json', headers=headers)
+
+
+def jsonify(data, status=200):
+    """Cache'lenmeyen cevaplar için: kodla ve gönder"""
+    return respond(encode(data), status)
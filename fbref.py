@@ -0,0 +1,155 @@
+"""FBref lig sayfası parser'ı.
+
+Sayfanın tamamı parse edilmez: hedef `table#stats_*` parçaları ham HTML'den
+kesilir (FBref'in HTML yorumu içinde sakladığı tablolar dahil) ve sadece bu
+parçalar lxml ile parse edilir. lxml kurulu değilse BeautifulSoup +
+'html.parser' kullanılır; iki yol da aynı `Row` yapısını üretir.
+
+Standart, savunma, kaleci ve GCA tabloları oyuncu anahtarı üzerinden tek
+geçişte birleştirilir: linkteki kalıcı FBref oyuncu id'si (yoksa isim) +
+takım. Aynı isimli oyuncular çakışmaz, birleştirme O(n + m) sürer.
+"""
+import re
+from collections import namedtuple
+
+from bs4 import BeautifulSoup
+
+import metrics
+
+try:
+    import lxml.html  # Opsiyonel hızlı parser
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+PLAYER_ID = re.compile(r'/players/([0-9a-f]{8})/')
+TABLE_IDS = ('stats_standard', 'stats_defense', 'stats_keeper', 'stats_gca')
+TABLE_RE = re.compile(r'<table\b[^>]*\bid="(stats_[a-z_]+)"[^>]*>.*?</table>', re.S)
+
+# cells: td metinleri, player/href: oyuncu hücresindeki link, stats: data-stat -> metin
+Row = namedtuple('Row', ['cells', 'player', 'href', 'stats'])
+
+
+def table_fragments(html, ids=TABLE_IDS):
+    """{tablo id: tablo HTML'i} - yorum (<!-- -->) içindeki tablolar dahil"""
+    fragments = {}
+    for match in TABLE_RE.finditer(html):
+        if match.group(1) in ids and match.group(1) not in fragments:
+            fragments[match.group(1)] = match.group(0)
+    return fragments
+
+
+def _rows_lxml(fragment):
+    table = lxml.html.fragment_fromstring(fragment)
+    rows = []
+    for tr in table.iterfind('tbody/tr'):
+        tds = tr.findall('td')
+        if not tds:
+            continue  # Tekrarlanan başlık satırları
+        cells = [td.text_content() for td in tds]
+        link = tds[1].find('.//a') if len(tds) > 1 else None
+        stats = {td.get('data-stat'): text for td, text in zip(tds, cells) if td.get('data-stat')}
+        rows.append(Row(cells,
+                        link.text_content() if link is not None else None,
+                        link.get('href', '') if link is not None else '',
+                        stats))
+    return rows
+
+
+def soup_rows(trs):
+    """BeautifulSoup <tr> listesinden Row listesi"""
+    rows = []
+    for tr in trs:
+        tds = tr.find_all('td')
+        if not tds:
+            continue
+        cells = [td.text for td in tds]
+        link = tds[1].find('a') if len(tds) > 1 else None
+        stats = {td['data-stat']: text for td, text in zip(tds, cells) if td.has_attr('data-stat')}
+        rows.append(Row(cells,
+                        link.text if link is not None else None,
+                        link.get('href', '') if link is not None else '',
+                        stats))
+    return rows
+
+
+def table_rows(html, parser=None):
+    """{tablo id: [Row]}, sadece hedef tablolar parse edilir"""
+    parser = parser or PARSER
+    rows = {}
+    for table_id, fragment in table_fragments(html).items():
+        if parser == 'lxml':
+            rows[table_id] = _rows_lxml(fragment)
+        else:
+            rows[table_id] = soup_rows(BeautifulSoup(fragment, parser).select('tbody tr'))
+    return rows
+
+
+def player_key(row):
+    """(anahtar, oyuncu_id, isim) - anahtar tablolar arası birleştirme içindir"""
+    name = (row.player if row.player is not None else row.cells[1]).strip()
+    team = row.cells[0].strip()
+    match = PLAYER_ID.search(row.href)
+    player_id = match.group(1) if match else f'{name}|{team}'
+    return (player_id, team), player_id, name
+
+
+def merge_table(players, rows, min_cells, extract):
+    """Ek tablo satırlarını anahtar üzerinden mevcut oyunculara ekle"""
+    for row in rows:
+        if len(row.cells) >= min_cells:
+            key, _, _ = player_key(row)
+            player = players.get(key)
+            if player is not None:
+                player.update(extract(row))
+
+
+def parse_league_page(html, parser=None):
+    """FBref: xG, Pass%, Tackles, Interceptions, Saves, PSxG, SCA/GCA"""
+    with metrics.span('parse', 'fbref'):
+        rows = table_rows(html, parser)
+    with metrics.span('merge', 'fbref'):
+        return build_players(rows)
+
+
+def build_players(rows):
+    players = {}
+    # Standart oyuncu istatistikleri (sütun indeksleri FBref yapısına göre)
+    for row in rows.get('stats_standard', []):
+        cells = row.cells
+        if len(cells) >= 20:
+            key, player_id, name = player_key(row)
+            players[key] = {
+                'lig': 'FBref',
+                'oyuncu_id': player_id,
+                'oyuncu': name,
+                'pozisyon': cells[2].strip(),
+                'takim': cells[0].strip(),
+                'dakika': cells[12],
+                'gol': cells[14],
+                'asist': cells[15],
+                'xg': cells[20],
+                'pas_yuzde': cells[18],  # Pas yüzdesi
+                'kaynak': 'FBref-Standard'
+            }
+
+    # Savunma istatistikleri
+    merge_table(players, rows.get('stats_defense', []), 10, lambda row: {
+        'tackles': row.cells[6],
+        'interceptions': row.cells[7],
+    })
+
+    # Kaleci istatistikleri
+    merge_table(players, rows.get('stats_keeper', []), 15, lambda row: {
+        'kurtaris': row.cells[10],
+        'kurtaris_yuzde': row.cells[11],
+        'gol_yeme_90': row.cells[12],  # Gol yeme/90
+    })
+
+    # Şut/gol yaratan aksiyonlar
+    merge_table(players, rows.get('stats_gca', []), 10, lambda row: {
+        'sca': row.stats.get('sca', '').strip(),
+        'gca': row.stats.get('gca', '').strip(),
+    })
+
+    return list(players.values())
@@ -0,0 +1,163 @@
+"""Oyuncu istatistiklerinin zaman serisi (sadece değişen satırlar).
+
+Her yenilemede lig frame'i son bilinen durumla karşılaştırılır ve yalnızca
+değişen oyuncular günün tarihiyle eklenir; aynı gün içindeki tekrar
+yenilemeler o günün satırını günceller. Veri lig/sezon bazında ayrı SQLite
+dosyalarına bölünür, dosya içinde tarih kolonu ile:
+
+    HISTORY_DIR/<namespace>/<lig>/<sezon>.db
+        degisim(oyuncu_id, tarih, ...)  PK (oyuncu_id, tarih) - oyuncu geçmişi tek aralık okuması
+        ozet(metrik, tarih, ...)        PK (metrik, tarih)    - lig trendi, yazarken hesaplanır
+
+Sorgular indeks aralıklarıdır; tam sezonluk günlük veri birikse de tarama
+yapılmaz.
+"""
+import os
+import glob
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+
+import numpy as np
+
+HISTORY_DIR = os.environ.get('HISTORY_DIR', '.history')
+METRICS = ['dakika', 'gol', 'asist', 'xg', 'pas_yuzde', 'tackles', 'interceptions',
+           'kurtaris', 'sca', 'gca', 'performans_skoru']
+TEXT_COLS = ['oyuncu', 'takim', 'pozisyon']
+
+
+def season_of(day):
+    """'2026-03-14' -> '2025-2026' (sezon Temmuz'da başlar)"""
+    year, month = int(day[:4]), int(day[5:7])
+    start = year if month >= 7 else year - 1
+    return f'{start}-{start + 1}'
+
+
+def _texts(frame, col):
+    """Kolon -> Python listesi, eksik değerler None (kolon yoksa hep None)"""
+    if col not in frame.columns:
+        return [None] * len(frame)
+    return frame[col].astype(object).where(frame[col].notna(), None).tolist()
+
+
+def _player_keys(frame):
+    """Satır başına oyuncu anahtarı: oyuncu_id, yoksa 'oyuncu|takim' (WhoScored satırları); ikisi de yoksa None"""
+    keys = []
+    for pid, name, team in zip(_texts(frame, 'oyuncu_id'), _texts(frame, 'oyuncu'), _texts(frame, 'takim')):
+        if pid is not None:
+            keys.append(str(pid))
+        elif name is not None:
+            keys.append(f'{name}|{team or ""}')
+        else:
+            keys.append(None)
+    return keys
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    return conn
+
+
+class HistoryStore:
+    def __init__(self, namespace, directory=None):
+        self.directory = os.path.join(directory or HISTORY_DIR, namespace)
+        self._lock = threading.Lock()
+        self._last = {}  # (lig, sezon) -> {oyuncu_id: satır tuple'ı}
+
+    def _path(self, league, season):
+        return os.path.join(self.directory, league, f'{season}.db')
+
+    def _open(self, league, season):
+        path = self._path(league, season)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = _connect(path)
+        columns = ', '.join(f'{c} TEXT' for c in TEXT_COLS) + ', ' + ', '.join(f'{m} REAL' for m in METRICS)
+        conn.executescript(f'''
+            CREATE TABLE IF NOT EXISTS degisim (
+                oyuncu_id TEXT NOT NULL, tarih TEXT NOT NULL, {columns},
+                PRIMARY KEY (oyuncu_id, tarih)) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS ozet (
+                metrik TEXT NOT NULL, tarih TEXT NOT NULL,
+                ortalama REAL, toplam REAL, maks REAL, en_iyi TEXT, oyuncu_sayisi INTEGER,
+                PRIMARY KEY (metrik, tarih)) WITHOUT ROWID;
+        ''')
+        return conn
+
+    def _last_state(self, conn, league, season):
+        """Oyuncu başına son kayıt (bellekte yoksa diskten bir kez okunur)"""
+        key = (league, season)
+        if key not in self._last:
+            cols = ', '.join(['d.oyuncu_id'] + [f'd.{c}' for c in TEXT_COLS + METRICS])
+            rows = conn.execute(f'''
+                SELECT {cols} FROM degisim d
+                JOIN (SELECT oyuncu_id, MAX(tarih) AS tarih FROM degisim GROUP BY oyuncu_id) son
+                  ON d.oyuncu_id = son.oyuncu_id AND d.tarih = son.tarih''').fetchall()
+            self._last[key] = {row[0]: tuple(row[1:]) for row in rows}
+        return self._last[key]
+
+    def record(self, league, frame, fetched_at):
+        """Değişen oyuncuları ve lig özetini yaz; yazılan değişim sayısını döndür"""
+        if not len(frame):
+            return 0
+        day = datetime.fromtimestamp(fetched_at).strftime('%Y-%m-%d')
+        season = season_of(day)
+
+        ids = _player_keys(frame)
+        texts = [_texts(frame, c) for c in TEXT_COLS]
+        values = {m: frame[m].to_numpy(dtype='float64') if m in frame.columns else np.zeros(len(frame))
+                  for m in METRICS}
+        # float32 kaynaklı gürültü karşılaştırmayı bozmasın
+        numbers = [np.round(values[m], 4).tolist() for m in METRICS]
+        rows = list(zip(*texts, *numbers))
+
+        with self._lock, closing(self._open(league, season)) as conn:
+            last = self._last_state(conn, league, season)
+            # Anahtarsız satır yazılmaz (tek anahtarda birleşip birbirini ezmesin)
+            changed = [(pid, row) for pid, row in zip(ids, rows) if pid is not None and last.get(pid) != row]
+            placeholders = ', '.join('?' * (2 + len(TEXT_COLS) + len(METRICS)))
+            with conn:
+                conn.executemany(f'INSERT OR REPLACE INTO degisim VALUES ({placeholders})',
+                                 [(pid, day) + row for pid, row in changed])
+                conn.executemany('INSERT OR REPLACE INTO ozet VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                 self._summaries(day, frame, values))
+            last.update(changed)
+        return len(changed)
+
+    def _summaries(self, day, frame, values):
+        names = frame['oyuncu'].astype(object).tolist() if 'oyuncu' in frame.columns else [None] * len(frame)
+        for metric, column in values.items():
+            best = int(column.argmax())
+            yield (metric, day, round(float(column.mean()), 4), round(float(column.sum()), 4),
+                   round(float(column[best]), 4), names[best], len(column))
+
+    def seasons(self, league):
+        return sorted(os.path.basename(p)[:-3] for p in glob.glob(os.path.join(self.directory, league, '*.db')))
+
+    def player(self, player_id, league=None):
+        """Oyuncunun tüm lig/sezonlardaki değişim kayıtları, tarih sırasıyla"""
+        leagues = [league] if league else sorted(
+            os.path.basename(p) for p in glob.glob(os.path.join(self.directory, '*')))
+        cols = ['tarih'] + TEXT_COLS + METRICS
+        records = []
+        for lg in leagues:
+            for season in self.seasons(lg):
+                with closing(_connect(self._path(lg, season))) as conn:
+                    rows = conn.execute(f'SELECT {", ".join(cols)} FROM degisim WHERE oyuncu_id = ? ORDER BY tarih',
+                                        (player_id,)).fetchall()
+                records += [dict(zip(cols, row), lig=lg, sezon=season) for row in rows]
+        return sorted(records, key=lambda r: r['tarih'])
+
+    def trend(self, league, metric, season=None, since=None):
+        """Lig özeti zaman serisi: [{tarih, ortalama, toplam, maks, en_iyi, oyuncu_sayisi}]"""
+        seasons = self.seasons(league)
+        season = season or (seasons[-1] if seasons else None)
+        if season not in seasons:
+            return []
+        with closing(_connect(self._path(league, season))) as conn:
+            rows = conn.execute('''SELECT tarih, ortalama, toplam, maks, en_iyi, oyuncu_sayisi FROM ozet
+                                   WHERE metrik = ? AND tarih >= ? ORDER BY tarih''',
+                                (metric, since or '')).fetchall()
+        cols = ['tarih', 'ortalama', 'toplam', 'maks', 'en_iyi', 'oyuncu_sayisi']
+        return [dict(zip(cols, row)) for row in rows]
@@ -0,0 +1,194 @@
+"""requests tabanlı tüm fetcher'lar için ortak HTTP istemcisi.
+
+- Host başına bağlantı havuzu (keep-alive), her istek yeni bağlantı açmaz
+- Varsayılan connect/read timeout: asılı kalan bir kaynak worker'ı kilitlemez
+- 429/5xx ve bağlantı hatalarında üstel geri çekilmeli tekrar deneme
+- Host başına eşzamanlı istek sınırı
+- ETag/Last-Modified ile koşullu GET; 304 veya aynı gövde hash'inde yeniden parse yok
+
+Kullanım:
+    import http_client
+    response = http_client.get(url, headers={'User-Agent': 'Mozilla/5.0'})
+    players = http_client.fetch_parsed(url, parse_func)  # parse_func(html) -> sonuç
+"""
+import os
+import json
+import hashlib
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+from parallel import host_of
+
+DEFAULT_TIMEOUT = (
+    float(os.environ.get('HTTP_CONNECT_TIMEOUT', 5)),
+    float(os.environ.get('HTTP_READ_TIMEOUT', 20)),
+)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class Page:
+    """Koşullu çekim sonucu; `changed` False ise gövde önceki çekimle aynı"""
+
+    def __init__(self, url, content, encoding, status_code, sha, changed):
+        self.url = url
+        self.content = content
+        self.encoding = encoding or 'utf-8'
+        self.status_code = status_code
+        self.sha = sha
+        self.changed = changed
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ConditionalCache:
+    """URL başına ETag/Last-Modified, gövde hash'i ve ham gövdeyi diskte saklar"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, name)
+        return base + '.json', base + '.body'
+
+    def load(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def save(self, url, meta, content):
+        os.makedirs(self.directory, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        with self._lock:
+            # Önce geçici dosyaya yaz: yarım kalan yazım cache'i bozmasın
+            for path, data, mode in ((body_path, content, 'wb'),
+                                     (meta_path, json.dumps(meta).encode('utf-8'), 'wb')):
+                tmp = f'{path}.{os.getpid()}.tmp'
+                with open(tmp, mode) as f:
+                    f.write(data)
+                os.replace(tmp, path)
+
+
+class HttpClient:
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=3, backoff=0.5, max_per_host=4, pool_size=10,
+                 cache_dir='.http_cache'):
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            backoff_max=30,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({'GET', 'HEAD'}),  # POST (örn. Apify run başlatma) tekrarlanmaz
+            respect_retry_after_header=False,            # Saatlik Retry-After thread'i kilitlemesin
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.conditional = ConditionalCache(cache_dir)
+        self._parsed = {}  # (url, parser) -> (gövde hash'i, parse sonucu)
+
+    def _semaphore(self, url):
+        host = host_of(url)
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        with self._semaphore(url), metrics.span('fetch', host_of(url)):
+            return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def fetch(self, url, headers=None, **kwargs):
+        """Koşullu GET: kayıtlı ETag/Last-Modified gönderilir, 304'te diskteki gövde döner"""
+        meta, cached_body = self.conditional.load(url)
+        headers = dict(headers or {})
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = self.get(url, headers=headers, **kwargs)
+        if response.status_code == 304 and meta:
+            return Page(url, cached_body, meta.get('encoding'), 304, meta['sha'], changed=False)
+
+        content = response.content
+        sha = hashlib.sha256(content).hexdigest()
+        changed = meta is None or meta.get('sha') != sha
+        if response.ok:
+            self.conditional.save(url, {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'encoding': response.encoding,
+                'sha': sha,
+            }, content)
+        return Page(url, content, response.encoding, response.status_code, sha, changed)
+
+    def fetch_parsed(self, url, parse, name=None, **kwargs):
+        """Sayfayı koşullu çek ve `parse(html)` uygula; gövde değişmediyse parse atlanır"""
+        page = self.fetch(url, **kwargs)
+        key = (url, name or getattr(parse, '__qualname__', repr(parse)))
+        with self._lock:
+            cached = self._parsed.get(key)
+        if cached and cached[0] == page.sha:
+            return cached[1]
+        result = parse(page.text)
+        if page.ok:
+            with self._lock:
+                self._parsed[key] = (page.sha, result)
+        return result
+
+
+client = HttpClient(
+    retries=int(os.environ.get('HTTP_RETRIES', 3)),
+    max_per_host=int(os.environ.get('HTTP_MAX_PER_HOST', 4)),
+    cache_dir=os.environ.get('HTTP_CACHE_DIR', '.http_cache'),
+)
+
+
+def get(url, **kwargs):
+    return client.get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    return client.post(url, **kwargs)
+
+
+def fetch(url, **kwargs):
+    return client.fetch(url, **kwargs)
+
+
+def fetch_parsed(url, parse, name=None, **kwargs):
+    return client.fetch_parsed(url, parse, name=name, **kwargs)
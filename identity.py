@@ -0,0 +1,212 @@
+"""Kaynaklar arası oyuncu kimlik eşleştirme (EA FC / WhoScored / FootyStats).
+
+Kaynaklar aynı oyuncuyu farklı yazar: "Edin Džeko" / "Edin Dzeko" /
+"E. Dzeko", "Fenerbahçe" / "Fenerbahce SK". Her isim önce normalize edilir
+(küçük harf, aksan/diakritik temizliği, ı/ø/ß gibi harflerin
+transliterasyonu) ve şu sırayla kanonik bir kimliğe bağlanır:
+
+1. Daha önce görülmüş anahtar (diskte saklanan cache) - O(1)
+2. Aynı kelimeler farklı sırada ("Icardi Mauro")
+3. Baş harf + soyad ("M. Icardi"), tek aday varsa
+4. Bulanık eşleşme (difflib), sadece aynı bloktaki adaylarla: takım biliniyorsa
+   takım, bilinmiyorsa soyad/ad ön eki
+
+Takım her iki tarafta da biliniyorsa ve farklı kulüpse (`same_team`) aday
+elenir: farklı takımlardaki iki "Fred" ayrı kimlik kalır.
+
+Kanonik kimlikler IDENTITY_PATH (varsayılan .identity.json) dosyasında
+çalıştırmalar arasında saklanır; aynı oyuncu her seferinde aynı kimliği alır.
+"""
+import os
+import re
+import json
+import hashlib
+import unicodedata
+from difflib import SequenceMatcher
+
+IDENTITY_PATH = os.environ.get('IDENTITY_PATH', '.identity.json')
+FUZZY_THRESHOLD = 0.88
+
+# NFKD ile ayrışmayan harfler
+TRANSLIT = str.maketrans({
+    'ı': 'i', 'ø': 'o', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'đ': 'd', 'ð': 'd',
+    'ł': 'l', 'þ': 'th', 'ħ': 'h',
+})
+TEAM_SUFFIXES = {'fc', 'sk', 'cf', 'afc', 'ac', 'as', 'fk', 'sc', 'jk', 'club', 'spor', 'kulubu'}
+_NON_WORD = re.compile(r'[^a-z0-9 ]+')
+
+
+def normalize(name):
+    """'Edin Džeko' -> 'edin dzeko', 'İrfan Can Kahveci' -> 'irfan can kahveci'"""
+    if not isinstance(name, str):
+        return ''
+    text = unicodedata.normalize('NFKD', name.strip().lower().translate(TRANSLIT))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).translate(TRANSLIT)
+    text = _NON_WORD.sub(' ', text.replace('-', ' ').replace('.', ' '))
+    return ' '.join(text.split())
+
+
+def normalize_team(team):
+    """'Fenerbahçe SK' -> 'fenerbahce'"""
+    tokens = [t for t in normalize(team).split() if t not in TEAM_SUFFIXES]
+    return ' '.join(tokens)
+
+
+def same_team(a, b):
+    """Normalize takım adları aynı kulübü mü gösteriyor ('man utd' / 'manchester united', 'psg')"""
+    if a == b:
+        return True
+    short, long = sorted((a.replace(' ', ''), b.replace(' ', '')), key=len)
+    letters = iter(long)
+    return bool(short) and all(ch in letters for ch in short)  # Kısaltma: harfler sırayla geçiyor
+
+
+def _initial_key(tokens):
+    """'mauro icardi' / 'm icardi' -> 'm icardi'"""
+    return f"{tokens[0][0]} {' '.join(tokens[1:])}" if len(tokens) >= 2 else None
+
+
+def _name_blocks(tokens):
+    return {f'n:{t[:3]}' for t in (tokens[0], tokens[-1])} if tokens else set()
+
+
+class IdentityResolver:
+    def __init__(self, path=IDENTITY_PATH, threshold=FUZZY_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.leagues = {}   # lig -> {'anahtarlar': {anahtar: id}, 'isimler': {id: ad}, 'takimlar': {id: takım}}
+        self._indexes = {}  # lig -> yardımcı indeksler (diskte saklanmaz)
+        self.dirty = False
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.leagues = json.load(f).get('ligler', {})
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'ligler': self.leagues}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def _league(self, league):
+        if league not in self.leagues:
+            self.leagues[league] = {'anahtarlar': {}, 'isimler': {}, 'takimlar': {}}
+        if league not in self._indexes:
+            index = {'sirali': {}, 'bas_harf': {}, 'bloklar': {}, 'anahtar': {}, 'homonim': {}}
+            self._indexes[league] = index
+            data = self.leagues[league]
+            for key, pid in data['anahtarlar'].items():
+                self._index(index, key, pid, data['takimlar'].get(pid))
+            for pid, name in data['isimler'].items():
+                index['homonim'].setdefault(normalize(name), []).append(pid)
+        return self.leagues[league], self._indexes[league]
+
+    def _index(self, index, key, pid, team):
+        tokens = key.split()
+        index['sirali'].setdefault(' '.join(sorted(tokens)), pid)
+        initial = _initial_key(tokens)
+        if initial:
+            index['bas_harf'].setdefault(initial, set()).add(pid)
+        index['anahtar'].setdefault(pid, key)
+        blocks = _name_blocks(tokens) | ({f't:{team}'} if team else set())
+        for block in blocks:
+            index['bloklar'].setdefault(block, []).append((key, pid))
+
+    @staticmethod
+    def _conflict(data, pid, team):
+        known = data['takimlar'].get(pid)
+        return bool(team and known and not same_team(team, known))
+
+    def _fuzzy(self, data, index, key, team, taken):
+        tokens = key.split()
+        if team and f't:{team}' in index['bloklar']:
+            candidates = index['bloklar'][f't:{team}']
+        else:
+            candidates = [c for block in _name_blocks(tokens) for c in index['bloklar'].get(block, [])]
+        matcher = SequenceMatcher(a=key, autojunk=False)
+        best, best_ratio = None, self.threshold
+        for other, pid in candidates:
+            if pid in taken or abs(len(other) - len(key)) > len(key) * 0.3 or self._conflict(data, pid, team):
+                continue
+            matcher.set_seq2(other)
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = pid, ratio
+        return best
+
+    def resolve(self, league, name, team=None, taken=None, exact_only=False):
+        """İsim -> kanonik kimlik; `taken` aynı kaynakta zaten atanmış kimlikler.
+
+        `exact_only` ise sadece anahtar/kelime sırası eşleşmesi denenir, yoksa None döner.
+        """
+        data, index = self._league(league)
+        taken = taken if taken is not None else set()
+        key = normalize(name)
+        if not key:
+            return None
+        team = normalize_team(team) if team else None
+
+        # Aynı isimli oyuncular (homonim) arasında takımı çelişmeyen ilk aday
+        candidates = [data['anahtarlar'].get(key), *index['homonim'].get(key, []),
+                      index['sirali'].get(' '.join(sorted(key.split())))]
+        pid = next((c for c in candidates if c is not None and c not in taken
+                    and not self._conflict(data, c, team)), None)
+        if exact_only:
+            if pid is None:
+                return None
+            taken.add(pid)
+            return pid
+        if pid is None:
+            tokens = key.split()
+            initial = _initial_key(tokens) if len(tokens[0]) == 1 else None
+            matches = index['bas_harf'].get(initial, set()) - taken if initial else set()
+            matches = {m for m in matches if not self._conflict(data, m, team)}
+            pid = next(iter(matches)) if len(matches) == 1 else None
+        if pid is None:
+            pid = self._fuzzy(data, index, key, team, taken)
+
+        if pid is None:
+            pid = self._new_id(league, key, data, taken, team)
+            if pid not in data['isimler']:
+                data['isimler'][pid] = name.strip()
+                index['homonim'].setdefault(key, []).append(pid)
+                if team:
+                    data['takimlar'][pid] = team
+        if key not in data['anahtarlar']:
+            data['anahtarlar'][key] = pid
+            self._index(index, key, pid, data['takimlar'].get(pid))
+            self.dirty = True
+        taken.add(pid)
+        return pid
+
+    def _new_id(self, league, key, data, taken, team=None):
+        base = f"{league}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]}"
+        pid, n = base, 2
+        while pid in data['isimler']:
+            # Aynı isimli farklı oyuncu (ör. iki "Fred"): önceki çalıştırmadaki -2, -3 kimliklerini yeniden kullan
+            if pid not in taken and normalize(data['isimler'][pid]) == key and not self._conflict(data, pid, team):
+                return pid
+            pid, n = f'{base}-{n}', n + 1
+        self.dirty = True
+        return pid
+
+    def resolve_frame(self, df, league, name_col='Oyuncu', team_col=None):
+        """Frame'in her satırı için kanonik kimlik listesi (aynı kaynakta bir kimlik bir kez).
+
+        Önce tüm satırlar için kesin eşleşmeler atanır; bulanık eşleşmeler
+        ikinci turda yapılır, böylece zayıf bir eşleşme başka bir satırın
+        kesin kimliğini kapmaz.
+        """
+        taken = set()
+        names = df[name_col].tolist()
+        teams = df[team_col].tolist() if team_col and team_col in df.columns else [None] * len(df)
+        ids = [self.resolve(league, name, team, taken, exact_only=True) for name, team in zip(names, teams)]
+        return [pid if pid is not None else self.resolve(league, name, team, taken)
+                for pid, name, team in zip(ids, names, teams)]
+
+    def display_name(self, league, pid):
+        return self.leagues.get(league, {}).get('isimler', {}).get(pid)
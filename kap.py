@@ -12,40 +12,38 @@ Resmi veriler piyasa değerinden daha güvenilir (bonservis gerçek rakamlar). B
 """
 '''
 import requests
+import http_client
+import snapshot
 import pandas as pd
 from bs4 import BeautifulSoup
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 import time
 import re
+import json
 from io import StringIO
+from driver_pool import pool as chrome_pool, wait_for_rows
 
 # KAP arama URL
-KAP_SEARCH = 'https://www.kap.org.tr/tr/sirket-bilgileri/ozet/{ticker}-Istanbul'}  # Ticker: FENER (FB), GALAS (GS), BEsim (BJK)
+KAP_SEARCH = 'https://www.kap.org.tr/tr/sirket-bilgileri/ozet/{ticker}-Istanbul'  # Ticker: FENER (FB), GALAS (GS), BEsim (BJK)
 
 def scrape_kap_transfers(kulup_ticker):
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
-    driver = webdriver.Chrome(options=options)
+    with chrome_pool.driver() as driver:
+        driver.get(f'https://www.kap.org.tr/tr/BildirimSorgu?ara={kulup_ticker}+transfer')
+        
+        transfers = []
+        for row in wait_for_rows(driver, 'table tr', name='kap'):
+            text = row.text
+            if 'bonservis' in text.lower() or 'transfer bedeli' in text.lower():
+                fee_match = re.search(r'(\d+(?:\.\d+)?[€$€]|undisclosed)', text)
+                transfers.append({'Kulüp': kulup_ticker, 'Bildirim': text[:200], 'Tahmini Bedel': fee_match.group(1) if fee_match else 'N/A'})
     
-    driver.get(f'https://www.kap.org.tr/tr/BildirimSorgu?ara={kulup_ticker}+transfer')
-    time.sleep(5)
-    
-    transfers = []
-    for row in driver.find_elements(By.CSS_SELECTOR, 'table tr'):
-        text = row.text
-        if 'bonservis' in text.lower() or 'transfer bedeli' in text.lower():
-            fee_match = re.search(r'(\d+(?:\.\d+)?[€$€]|undisclosed)', text)
-            transfers.append({'Kulüp': kulup_ticker, 'Bildirim': text[:200], 'Tahmini Bedel': fee_match.group(1) if fee_match else 'N/A'})
-    
-    driver.quit()
     return pd.DataFrame(transfers)
 
 def get_companies_house_finans(pl_club):  # Premier League, örn 'Arsenal FC'
     # Gerçek API: https://developer.company-information.service.gov.uk/
     # Demo: Mock veya scraping Kinnaird
     url = f'https://kinnairdsports.com/premier-league/{pl_club.lower().replace(" ", "-")}'
-    response = requests.get(url)
+    response = http_client.get(url)
     soup = BeautifulSoup(response.text, 'html.parser')
     # Finansal tablo extract (inspect ile uyarlayın)
     finans = {'Kulüp': pl_club, 'Revenue': 'Data scraped', 'Wages': 'Data scraped'}
@@ -53,7 +51,7 @@ def get_companies_house_finans(pl_club):  # Premier League, örn 'Arsenal FC'
 
 def get_capology_spl():
     url = 'https://www.capology.com/sa/saudi-pro-league/finances/'
-    response = requests.get(url)
+    response = http_client.get(url)
     soup = BeautifulSoup(response.text, 'html.parser')
     clubs = []
     for club_row in soup.select('.club-row'):  # Selector uyarla
@@ -64,9 +62,9 @@ def get_capology_spl():
 
 def get_openligadb_bundesliga():
     url = 'https://api.openligadb.de/getmatchdata/BL1/2025'  # 2025/26 sezonu
-    data = requests.get(url).json()
-    df = pd.json_normalize(data)
-    df.to_csv('bundesliga_maclar.csv')
+    # Maç verisi değişmediyse (304 / aynı hash) önceki sonuç kullanılır
+    df = http_client.fetch_parsed(url, lambda text: pd.json_normalize(json.loads(text)), name='openligadb')
+    snapshot.write('kap/bundesliga_maclar', snapshot.typed(df), time.time())
     return df[['Team1.TeamName', 'Team2.TeamName', 'MatchDateTime']]
 
 def main():
@@ -74,21 +72,21 @@ def main():
     kap_fb = scrape_kap_transfers('FENER')
     kap_gs = scrape_kap_transfers('GALAS')
     kap_df = pd.concat([kap_fb, kap_gs], ignore_index=True)
-    kap_df.to_csv('kap_transfers.csv', index=False)
+    snapshot.write('kap/transferler', snapshot.typed(kap_df), time.time())
     
     # Premier League
     pl_df = get_companies_house_finans('Arsenal FC')
-    pl_df.to_csv('premier_finans.csv')
+    snapshot.write('kap/premier_finans', snapshot.typed(pl_df), time.time())
     
     # SPL
     spl_df = get_capology_spl()
-    spl_df.to_csv('spl_finans.csv')
+    snapshot.write('kap/spl_finans', snapshot.typed(spl_df), time.time())
     
     # Bundesliga
     bl_df = get_openligadb_bundesliga()
     
     print("KAP Transfers:", kap_df.head())
-    print("Veriler CSV'lere kaydedildi!")
+    print("Veriler snapshot'lara kaydedildi! (CSV için: python snapshot.py export kap/transferler kap.csv)")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,160 @@
+"""Collector'lar için ortak lig verisi katmanı.
+
+Ham scraping sonucu lig başına bir kez kolon bazlı `PlayerStore`'a çevrilir
+(1. seviye), endpoint görünümleri bundan türetilip `cache` içinde tutulur
+(2. seviye). Cache paylaşımlı bir backend ise (sqlite/redis) ham veri de
+oraya yazılır; diğer worker'lar aynı veriyi okur ve aynı lig için ikinci kez
+scraping yapmaz.
+Her scraping sonucu `snapshot` ile diske de yazılır (açılışta geri yüklenir),
+değişen oyuncular `history` zaman serisine eklenir.
+"""
+import os
+import time
+import logging
+import sqlite3
+
+import metrics
+import fastjson
+import snapshot
+from cache import SingleFlight
+from history import HistoryStore
+from player_store import PlayerStore
+
+logger = logging.getLogger(__name__)
+
+
+class LeagueDataMixin:
+    """Alt sınıflar `cache`, `ttl`, `namespace` ve `_collect_stats(league)` tanımlar."""
+
+    namespace = 'stats'     # Aynı backend'i paylaşan farklı servislerin anahtarları çakışmasın
+    shared_ttl = 24 * 3600  # Paylaşımlı ham veri (stale-while-revalidate için uzun)
+    lock_ttl = 600          # Scraping kilidi (worker çökerse kendiliğinden düşer)
+    sync_interval = 5       # Paylaşımlı backend'i en fazla bu sıklıkla kontrol et (sn)
+    snapshots = os.environ.get('SNAPSHOT_ENABLED', '1') == '1'  # Disk snapshot'ı yaz/aç
+    keep_history = os.environ.get('HISTORY_ENABLED', '1') == '1'  # Değişimleri zaman serisine ekle
+
+    def init_league_data(self):
+        self.latest = {}  # Lig bazlı son başarılı ham veri (bu worker'daki kopya)
+        self.flight = SingleFlight()  # Lig başına tek yenileme
+        self._synced = {}
+        self.history = HistoryStore(self.namespace)
+        if self.snapshots:
+            self.load_snapshots()
+
+    def load_snapshots(self):
+        """Son bilinen lig verisini diskten map et (yeniden başlatılan worker soğuk başlamasın)"""
+        for name in snapshot.names(self.namespace):
+            league = name.split('/', 1)[1]
+            try:
+                frame, fetched_at = snapshot.load(name)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("%s snapshot'ı açılamadı: %s", name, e)
+                continue
+            if frame is not None and league not in self.latest:
+                self.latest[league] = {'store': PlayerStore(frame), 'time': fetched_at}
+
+    def key(self, *parts):
+        return (self.namespace,) + parts
+
+    def get_detailed_stats(self, league):
+        return self._collect_stats(league)
+
+    def _store(self, league, stats, fetched_at):
+        with metrics.span('store', league):
+            entry = {'store': PlayerStore.from_records(stats), 'time': fetched_at}
+        self.latest[league] = entry
+        return entry
+
+    def _scrape(self, league):
+        with metrics.span('scrape', league):
+            stats = self.get_detailed_stats(league)
+        if stats:
+            entry = self._store(league, stats, time.time())
+            if self.snapshots:
+                try:
+                    snapshot.write(f'{self.namespace}/{league}', entry['store'].frame, entry['time'])
+                except OSError as e:
+                    logger.warning("%s snapshot'ı yazılamadı: %s", league, e)
+            if self.keep_history:
+                try:
+                    self.history.record(league, entry['store'].frame, entry['time'])
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning("%s geçmişi yazılamadı: %s", league, e)
+            if self.cache.shared:
+                self.cache.set(self.key('ham', league), stats, ttl=self.shared_ttl)
+                self.cache.set(self.key('ham_zaman', league), entry['time'], ttl=self.shared_ttl)
+        return stats
+
+    def refresh(self, league, max_age=None):
+        """Ligi yeniden çek, başarılıysa son veriyi güncelle.
+
+        Eşzamanlı çağrılar tek yenilemeyi (scraping, depo, snapshot, geçmiş)
+        paylaşır; hepsi aynı girdiyi ve aynı `time`'ı görür, görünüm cache'i
+        boşa geçersiz olmaz. Paylaşımlı backend'de `max_age` saniyeden taze
+        veri varsa ya da başka bir worker şu an bu ligi çekiyorsa scraping
+        yapılmaz.
+        """
+        return self.flight.do(league, self._refresh, league, max_age)
+
+    def _refresh(self, league, max_age):
+        if not self.cache.shared:
+            return self._scrape(league)
+
+        entry = self.sync(league)
+        max_age = self.ttl if max_age is None else max_age
+        if entry is not None and time.time() - entry['time'] < max_age:
+            return entry['store']
+        if not self.cache.add(self.key('kilit', league), os.getpid(), ttl=self.lock_ttl):
+            return entry['store'] if entry else []
+        try:
+            return self._scrape(league)
+        finally:
+            self.cache.delete(self.key('kilit', league))
+
+    def sync(self, league):
+        """Paylaşımlı backend'de daha yeni ham veri varsa yerel kopyayı güncelle"""
+        local = self.latest.get(league)
+        remote_time = self.cache.get(self.key('ham_zaman', league))
+        if remote_time and (local is None or remote_time > local['time']):
+            stats = self.cache.get(self.key('ham', league))
+            if stats:
+                local = self._store(league, stats, remote_time)
+        return local
+
+    def current(self, league):
+        """İstek yolu: yerel kopya, paylaşımlı backend en fazla `sync_interval`'de bir kontrol edilir"""
+        if self.cache.shared and time.time() - self._synced.get(league, 0) >= self.sync_interval:
+            self._synced[league] = time.time()
+            return self.sync(league)
+        return self.latest.get(league)
+
+    def memory(self):
+        """Lig bazlı oyuncu deposu bellek kullanımı"""
+        return {league: entry['store'].stats() for league, entry in list(self.latest.items())}
+
+    def _cached(self, key, entry):
+        cached = self.cache.get(key)
+        if cached and cached['time'] == entry['time']:
+            return cached['data']
+        return None
+
+    def _remember(self, key, entry, data):
+        self.cache[key] = {'data': data, 'time': entry['time']}
+
+    def view(self, entry, league, name, build, *params, encoded=False):
+        """2. seviye cache: ham veriden türetilen görünüm, ham veri yenilenince geçersiz olur.
+
+        `encoded=True` ise görünüm kodlanmış JSON (`fastjson.Encoded`) olarak tutulur.
+        """
+        key = self.key('json', name, league, *params) if encoded else self.key(name, league, *params)
+        cached = self._cached(key, entry)
+        if cached is not None:
+            metrics.count('view_cache', gorunum=name, sonuc='hit')
+            return cached
+        metrics.count('view_cache', gorunum=name, sonuc='miss')
+        with metrics.span('view', name):
+            data = build(entry['store'].frame, *params)
+        if encoded:
+            data = fastjson.encode(data)
+        self._remember(key, entry, data)
+        return data
@@ -0,0 +1,244 @@
+"""Aşama bazlı süre ölçümü ve Prometheus metin formatında /metrics.
+
+Sıcak yoldaki her aşama `span` ile sarılır (fetch, nezaket beklemesi, Chrome
+açılışı, render bekleme, parse, merge, depo hazırlama, skor, serialize).
+Süreler süreç içi histogramlarda toplanır; cache ve Chrome havuzu gibi
+durum bilgileri /metrics çağrıldığında kaynaklarından okunur.
+
+İstek `X-Profile: 1` başlığıyla gelirse o isteğin aşama dökümü
+`Server-Timing` cevap başlığında döner (paralel fetcher thread'lerindeki
+aşamalar dahil, bkz. parallel.FetchEngine).
+
+    with metrics.span('parse', 'fbref'):
+        ...
+    metrics.count('view_cache', sonuc='hit', gorunum='stats')
+
+Metrikler worker (süreç) başınadır; gunicorn'da her worker kendi değerlerini verir.
+"""
+import os
+import time
+import bisect
+import threading
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import Response, g, request
+
+PREFIX = 'footballstats'
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+HELP = {
+    'stage': 'Aşama süreleri (fetch, render, parse, merge, score, serialize, ...)',
+    'request': 'Endpoint başına istek süreleri',
+    'view_cache': 'Görünüm cache isabet / ıskaları',
+    'not_modified': 'If-None-Match eşleşen (304) cevaplar',
+}
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ENABLED = os.environ.get('PROFILE_HEADER_ENABLED', '1') == '1'
+
+# İstek başına aşama listesi; copy_context ile thread'lere taşınır, liste paylaşılır
+_breakdown = contextvars.ContextVar('breakdown', default=None)
+
+
+def _labels(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(name, labels, value):
+    text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return f'{name}{{{text}}} {value}' if text else f'{name} {value}'
+
+
+class Registry:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms = {}  # ad -> {etiketler: [kova sayaçları, toplam, adet]}
+        self._counters = {}    # ad -> {etiketler: değer}
+        self._help = dict(HELP)
+        self._sources = []     # /metrics anında okunan (ad, tip, yardım, [(etiketler, değer)]) üreticileri
+
+    def observe(self, name, seconds, help='', **labels):
+        key = _labels(labels)
+        with self._lock:
+            self._help.setdefault(name, help)
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = [[0] * len(self.buckets), 0.0, 0]
+            data = series[key]
+            index = bisect.bisect_left(self.buckets, seconds)
+            if index < len(self.buckets):
+                data[0][index] += 1
+            data[1] += seconds
+            data[2] += 1
+
+    def inc(self, name, value=1, help='', **labels):
+        key = _labels(labels)
+        with self._lock:
+            self._help.setdefault(name, help)
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def source(self, func):
+        """func() -> [(ad, tip, yardım, [(etiket dict, değer)])]"""
+        self._sources.append(func)
+        return func
+
+    def render(self):
+        lines = []
+        with self._lock:
+            histograms = {n: {k: (list(v[0]), v[1], v[2]) for k, v in s.items()} for n, s in self._histograms.items()}
+            counters = {n: dict(s) for n, s in self._counters.items()}
+        for name, series in sorted(histograms.items()):
+            full = f'{PREFIX}_{name}_seconds'
+            lines += [f'# HELP {full} {self._help.get(name) or name}', f'# TYPE {full} histogram']
+            for labels, (buckets, total, count) in sorted(series.items()):
+                cumulative = 0
+                for bound, n in zip(self.buckets, buckets):
+                    cumulative += n
+                    lines.append(_format(f'{full}_bucket', labels + (('le', repr(float(bound))),), cumulative))
+                lines.append(_format(f'{full}_bucket', labels + (('le', '+Inf'),), count))
+                lines.append(_format(f'{full}_sum', labels, round(total, 6)))
+                lines.append(_format(f'{full}_count', labels, count))
+        for name, series in sorted(counters.items()):
+            full = f'{PREFIX}_{name}_total'
+            lines += [f'# HELP {full} {self._help.get(name) or name}', f'# TYPE {full} counter']
+            lines += [_format(full, labels, value) for labels, value in sorted(series.items())]
+        families = {}  # Aynı aile birden fazla kaynaktan gelebilir (ör. iki servisin cache'i)
+        for func in self._sources:
+            try:
+                produced = func()
+            except Exception as e:  # Kırık bir kaynak /metrics'i düşürmesin
+                lines.append(f'# {func.__name__} okunamadı: {e}')
+                continue
+            for name, kind, help, samples in produced:
+                families.setdefault(name, (kind, help, []))[2].extend(samples)
+        for name, (kind, help, samples) in families.items():
+            full = f'{PREFIX}_{name}'
+            lines += [f'# HELP {full} {help}', f'# TYPE {full} {kind}']
+            lines += [_format(full, _labels(labels), value) for labels, value in samples]
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+@contextmanager
+def span(stage, detail=None):
+    """Aşama süresini ölç: histograma ve (profil açıksa) isteğin dökümüne yaz"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        registry.observe('stage', seconds, stage=stage, detay=detail)
+        breakdown = _breakdown.get()
+        if breakdown is not None:
+            breakdown.append((stage, seconds))
+
+
+def timed(stage, detail=None):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage, detail):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, value=1, **labels):
+    registry.inc(name, value, **labels)
+
+
+def begin_request(profile_header=None):
+    """İstek başında: profil istendiyse aşama dökümünü başlat -> token"""
+    profile = PROFILE_ENABLED and profile_header == '1'
+    return _breakdown.set([] if profile else None)
+
+
+def end_request(token):
+    _breakdown.reset(token)
+
+
+def breakdown():
+    """Bu isteğin aşama dökümü (profil istenmediyse None)"""
+    return _breakdown.get()
+
+
+def server_timing(breakdown, total):
+    """[('fetch', 0.2), ('parse', 0.05), ('fetch', 0.1)] -> 'fetch;dur=300.0;desc="2x", parse;dur=50.0, toplam;dur=..'"""
+    stages = {}
+    for stage, seconds in breakdown:
+        s = stages.setdefault(stage, [0.0, 0])
+        s[0] += seconds
+        s[1] += 1
+    parts = [f'{stage};dur={s[0] * 1000:.1f}' + (f';desc="{s[1]}x"' if s[1] > 1 else '')
+             for stage, s in stages.items()]
+    parts.append(f'toplam;dur={total * 1000:.1f}')
+    return ', '.join(parts)
+
+
+def cache_source(cache, namespace):
+    def read():
+        stats = cache.stats()
+        labels = {'servis': namespace, 'backend': stats.get('backend')}
+        return [
+            (f'cache_{key}_total', 'counter', f'Cache {key} sayısı', [(labels, stats[key])])
+            for key in ('hit', 'miss', 'eviction', 'expired') if key in stats
+        ] + [(f'cache_{key}', 'gauge', f'Cache {key}', [(labels, stats[key])])
+             for key in ('kayit', 'byte') if key in stats]
+    read.__name__ = f'cache_{namespace}'
+    return read
+
+
+def pool_source(pool):
+    def chrome_pool():
+        stats = pool.stats()
+        return [
+            ('chrome_pool_drivers', 'gauge', 'Chrome sürücüleri (boyut/bos/kullanimda)',
+             [({'durum': key}, stats[key]) for key in ('boyut', 'bos', 'kullanimda')]),
+            ('chrome_pool_events_total', 'counter', 'Chrome havuzu olayları',
+             [({'olay': key}, stats[key]) for key in ('olusturulan', 'yenilenen', 'coken', 'checkout', 'zaman_asimi')]),
+        ]
+    return chrome_pool
+
+
+def install(app, namespace, sources=()):
+    """Flask uygulamasına istek süresi, profil başlığı ve /metrics route'u ekle"""
+    for source in sources:
+        registry.source(source)
+
+    @app.before_request
+    def _start_profile():
+        g.metrics_started = time.perf_counter()
+        g.metrics_token = begin_request(request.headers.get(PROFILE_HEADER))
+
+    @app.after_request
+    def _finish_profile(response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        total = time.perf_counter() - started
+        registry.observe('request', total, servis=namespace,
+                         endpoint=request.endpoint or 'yok', durum=response.status_code)
+        stages = breakdown()
+        if stages is not None:
+            response.headers['Server-Timing'] = server_timing(stages, total)
+        return response
+
+    @app.teardown_request
+    def _reset_profile(exc):
+        token = g.pop('metrics_token', None)
+        if token is not None:
+            end_request(token)
+
+    def metrics_endpoint():
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    app.add_url_rule('/metrics', 'metrics', metrics_endpoint)
+    return app.view_functions['metrics']
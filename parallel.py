@@ -0,0 +1,117 @@
+"""Eşzamanlı veri çekme motoru.
+
+Bağımsız kaynak/lig çekimleri thread havuzunda paralel çalışır; global
+`time.sleep` yerine host başına eşzamanlılık ve istekler arası minimum
+bekleme (nezaket limiti) uygulanır. Böylece dört ligin karşılaştırması
+kaynakların toplamı kadar değil, en yavaş kaynak kadar sürer.
+"""
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# host: (eşzamanlı istek, istekler arası min. saniye)
+HOST_LIMITS = {
+    'fbref.com': (1, 3.0),        # FBref dakikada ~20 isteğin üstünü banlıyor
+    'whoscored.com': (2, 1.0),    # Selenium: Chrome bellek maliyeti
+    'ea.com': (2, 1.0),
+    'footystats.org': (2, 1.0),
+    'kap.org.tr': (1, 2.0),
+}
+DEFAULT_LIMIT = (4, 0.0)
+
+
+def host_of(url_or_host):
+    """'https://tr.whoscored.com/...' -> 'whoscored.com'"""
+    host = urlparse(url_or_host).hostname if '://' in url_or_host else url_or_host
+    host = (host or '').lower()
+    for known in HOST_LIMITS:
+        if host == known or host.endswith('.' + known):
+            return known
+    return host[4:] if host.startswith('www.') else host
+
+
+class HostLimiter:
+    """Host başına eşzamanlılık sınırı ve istekler arası minimum aralık"""
+
+    def __init__(self, limits=None, default=DEFAULT_LIMIT):
+        self.limits = dict(HOST_LIMITS if limits is None else limits)
+        self.default = default
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_slot = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                concurrency, _ = self.limits.get(host, self.default)
+                self._semaphores[host] = threading.BoundedSemaphore(concurrency)
+            return self._semaphores[host]
+
+    @contextmanager
+    def slot(self, url_or_host):
+        host = host_of(url_or_host)
+        _, interval = self.limits.get(host, self.default)
+        semaphore = self._semaphore(host)
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_slot.get(host, now))
+                self._next_slot[host] = start + interval
+            if start > now:
+                with metrics.span('nezaket_bekleme', host):
+                    time.sleep(start - now)
+            yield
+
+
+hosts = HostLimiter()
+
+
+class FetchEngine:
+    """Görevleri paralel çalıştırır; her görev kendi host'unun limitine tabidir.
+
+    Her `run` çağrısı kendi havuzunu açar, böylece iç içe çağrılar (karşılaştırma
+    -> lig -> kaynak) birbirinin thread'lerini bekleyip kilitlenmez.
+    """
+
+    def __init__(self, max_workers=8, limiter=None):
+        self.max_workers = max_workers
+        self.limiter = limiter or hosts
+
+    def _call(self, host, func, args):
+        if host is None:
+            return func(*args)
+        with self.limiter.slot(host):
+            return func(*args)
+
+    def run(self, tasks, default=None):
+        """tasks: {isim: (host veya url veya None, fonksiyon, *argümanlar)}
+
+        {isim: sonuç} döner; hata veren görevin sonucu `default` olur.
+        """
+        if not tasks:
+            return {}
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(len(tasks), self.max_workers)) as pool:
+            # Her görev çağıranın context'inin kopyasında: istek profili thread'lerde de toplanır
+            futures = {
+                name: pool.submit(contextvars.copy_context().run, self._call, spec[0], spec[1], spec[2:])
+                for name, spec in tasks.items()
+            }
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.warning("%s çekilemedi: %s", name, e)
+                    results[name] = default
+        return results
+
+
+fetcher = FetchEngine()
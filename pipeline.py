@@ -0,0 +1,283 @@
+"""Offline collector'lar için küçük DAG pipeline çalıştırıcısı.
+
+Her aşama (fetch, parse, normalize, merge, export) bağımlılıklarının
+çıktısını alır ve çıktısı içerik hash'iyle diske yazılır. Bir aşamanın parmak
+izi = ad + kod + parametreler + girdilerinin içerik hash'leri; parmak izi
+daha önce görülmüşse aşama çalışmaz, diskteki çıktı kullanılır. Yani yeniden
+çalıştırmada sadece girdisi değişen aşamalar koşar, ortada patlayan bir
+çalıştırma biten aşamaları kaybetmez.
+
+Dış kaynaktan çeken aşamalar (`volatile=True`) girdisiz olduğu için her
+çalıştırmada koşar (`max_age` içindeyse cache'ten gelir); çektiği içerik
+değişmediyse aşağı akıştaki aşamalar yine cache'ten gelir. Bağımsız aşamalar
+thread havuzunda paralel çalışır, `host` verilen aşamalar parallel.hosts
+nezaket limitine tabidir.
+
+    stages = [Stage('fetch', fetch, volatile=True), Stage('parse', parse, deps=['fetch'])]
+    Pipeline(stages).run(only={'league': ['premier']})
+"""
+import os
+import re
+import json
+import time
+import pickle
+import hashlib
+import inspect
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from parallel import hosts
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_DIR = os.environ.get('PIPELINE_DIR', '.pipeline')
+KEEP = 5  # Aşama başına saklanan çıktı sayısı
+
+# Aşama sonuçları
+RAN, CACHED, FROZEN, FAILED, FALLBACK, SKIPPED = 'calisti', 'cache', 'donduruldu', 'hata', 'varsayilan', 'atlandi'
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class Stage:
+    def __init__(self, name, func, deps=(), params=None, tags=None, volatile=False, max_age=None,
+                 host=None, fallback=None, code=()):
+        """
+        code: parmak izine eklenecek ek fonksiyonlar (func genel bir sarmalayıcıysa asıl iş yapan kod)
+        volatile: dış kaynaktan çeker, girdisi yok; her çalıştırmada koşar (`max_age` sn içinde değilse)
+        fallback: hata durumunda aşağı akışa verilecek değer (None ise bağımlılar atlanır)
+        """
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.params = params or {}
+        self.tags = tags or {}
+        self.volatile = volatile
+        self.max_age = max_age
+        self.host = host
+        self.fallback = fallback
+        self.code = list(code)
+
+    def code_hash(self):
+        sources = []
+        for func in [self.func] + self.code:
+            try:
+                sources.append(inspect.getsource(func))
+            except (OSError, TypeError):
+                sources.append(getattr(func, '__qualname__', repr(func)))
+        return _sha('\n'.join(sources).encode('utf-8'))
+
+    def fingerprint(self, input_hashes):
+        payload = json.dumps([self.name, self.code_hash(), self.params, input_hashes],
+                             sort_keys=True, default=str)
+        return _sha(payload.encode('utf-8'))
+
+    def matches(self, filters):
+        return all(str(self.tags.get(key)) in values for key, values in filters.items())
+
+
+class ArtifactStore:
+    """<dizin>/<aşama>/<içerik hash>.pkl + index.json (parmak izi -> içerik hash)"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or PIPELINE_DIR
+        self._lock = threading.Lock()
+
+    def _dir(self, stage):
+        return os.path.join(self.directory, re.sub(r'[^\w.-]', '_', stage))
+
+    def _index(self, stage):
+        try:
+            with open(os.path.join(self._dir(stage), 'index.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'ciktilar': {}, 'son': None}
+
+    def find(self, stage, fingerprint):
+        return self._index(stage)['ciktilar'].get(fingerprint)
+
+    def latest(self, stage):
+        index = self._index(stage)
+        return index['ciktilar'].get(index['son']) if index['son'] else None
+
+    def load(self, stage, meta):
+        with open(os.path.join(self._dir(stage), f"{meta['hash']}.pkl"), 'rb') as f:
+            return pickle.load(f)
+
+    def save(self, stage, fingerprint, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        meta = {'hash': _sha(data), 'zaman': time.time(), 'parmak_izi': fingerprint}
+        directory = self._dir(stage)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{meta['hash']}.pkl")
+        if not os.path.exists(path):
+            with open(f'{path}.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(f'{path}.tmp', path)
+        with self._lock:
+            index = self._index(stage)
+            index['ciktilar'][fingerprint] = meta
+            index['son'] = fingerprint
+            # En yeni KEEP çıktı dışındakileri temizle
+            ordered = sorted(index['ciktilar'].items(), key=lambda item: item[1]['zaman'])
+            for old, old_meta in ordered[:-KEEP]:
+                del index['ciktilar'][old]
+            alive = {m['hash'] for m in index['ciktilar'].values()}
+            for name in os.listdir(directory):
+                if name.endswith('.pkl') and name[:-4] not in alive:
+                    os.remove(os.path.join(directory, name))
+            with open(os.path.join(directory, 'index.json.tmp'), 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(os.path.join(directory, 'index.json.tmp'), os.path.join(directory, 'index.json'))
+        return meta
+
+
+class Pipeline:
+    def __init__(self, stages, store=None, max_workers=4):
+        self.stages = {stage.name: stage for stage in stages}
+        self.store = store or ArtifactStore()
+        self.max_workers = max_workers
+        for stage in stages:
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"{stage.name}: bilinmeyen bağımlılık {missing}")
+        cycle = self._cycle()
+        if cycle:
+            raise ValueError(f"Döngüsel bağımlılık: {' -> '.join(cycle)}")
+
+    def _cycle(self):
+        """Bağımlılıklarda döngü varsa döngüdeki aşamalar (ilk aşama sonda tekrar), yoksa None"""
+        done, path = set(), []
+        on_path = {}  # ad -> path içindeki sırası
+
+        def visit(name):
+            on_path[name] = len(path)
+            path.append(name)
+            for dep in self.stages[name].deps:
+                if dep in on_path:
+                    return path[on_path[dep]:] + [dep]
+                if dep not in done:
+                    found = visit(dep)
+                    if found:
+                        return found
+            path.pop()
+            del on_path[name]
+            done.add(name)
+            return None
+
+        for name in self.stages:
+            if name not in done:
+                found = visit(name)
+                if found:
+                    return found
+        return None
+
+    def downstream(self, names):
+        """Verilen aşamalar + onlara bağımlı tüm aşamalar"""
+        selected = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for stage in self.stages.values():
+                if stage.name not in selected and any(dep in selected for dep in stage.deps):
+                    selected.add(stage.name)
+                    changed = True
+        return selected
+
+    def upstream(self, names):
+        needed, stack = set(), list(names)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].deps)
+        return needed
+
+    def select(self, only=None):
+        """`only` ({etiket: [değer]}) ile eşleşen aşamalar ve aşağı akışları"""
+        if not only:
+            return set(self.stages)
+        return self.downstream(stage.name for stage in self.stages.values() if stage.matches(only))
+
+    def run(self, only=None, force=False):
+        """{aşama: durum} döner; seçilmeyen ama gereken aşamalar son çıktılarıyla dondurulur"""
+        selected = self.select(only)
+        needed = self.upstream(selected)
+        results = {}   # ad -> (durum, meta, değer veya None)
+        report = {}
+        pending = set(needed)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name in sorted(pending):
+                    stage = self.stages[name]
+                    if not all(dep in results for dep in stage.deps):
+                        continue
+                    pending.discard(name)
+                    if any(results[dep][0] in (FAILED, SKIPPED) for dep in stage.deps):
+                        results[name] = (SKIPPED, None, None)
+                        report[name] = SKIPPED
+                        continue
+                    inputs = {dep: results[dep] for dep in stage.deps}
+                    running[pool.submit(self._execute, stage, inputs, name in selected, force)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        logger.warning("%s başarısız: %s", name, e)
+                        stage = self.stages[name]
+                        if stage.fallback is not None:
+                            results[name] = (FALLBACK, {'hash': _sha(pickle.dumps(stage.fallback))}, stage.fallback)
+                        else:
+                            results[name] = (FAILED, None, None)
+                    report[name] = results[name][0]
+        return report
+
+    def _value(self, name, result):
+        status, meta, value = result
+        return value if value is not None else self.store.load(name, meta)
+
+    def _execute(self, stage, inputs, selected, force):
+        latest = self.store.latest(stage.name)
+        if not selected and latest is not None:
+            return FROZEN, latest, None
+
+        fingerprint = stage.fingerprint([inputs[dep][1]['hash'] for dep in stage.deps])
+        if not force:
+            if stage.volatile:
+                if stage.max_age and latest and time.time() - latest['zaman'] < stage.max_age:
+                    return CACHED, latest, None
+            else:
+                meta = self.store.find(stage.name, fingerprint)
+                if meta is not None:
+                    return CACHED, meta, None
+
+        args = [self._value(dep, inputs[dep]) for dep in stage.deps]
+        started = time.perf_counter()
+        if stage.host:
+            with hosts.slot(stage.host):
+                value = stage.func(*args, **stage.params)
+        else:
+            value = stage.func(*args, **stage.params)
+        meta = self.store.save(stage.name, fingerprint, value)
+        logger.info("%s %.2f sn", stage.name, time.perf_counter() - started)
+        return RAN, meta, value
+
+
+def parse_only(items):
+    """['league=premier,saudi', 'source=ea'] -> {'league': ['premier', 'saudi'], 'source': ['ea']}"""
+    filters = {}
+    for item in items or []:
+        key, _, values = item.partition('=')
+        if not values:
+            raise ValueError(f"Geçersiz seçici: {item} (örn. league=premier)")
+        filters.setdefault(key.strip(), []).extend(v.strip() for v in values.split(','))
+    return filters
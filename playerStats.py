@@ -12,6 +12,7 @@ EA FC League ID'leri:
 '''
 
 import requests
+import http_client
 import pandas as pd
 from bs4 import BeautifulSoup
 import time
@@ -19,17 +20,22 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 import warnings
+import scoring
+import identity
+import snapshot
+import metrics
+from parallel import fetcher
+from driver_pool import pool as chrome_pool, wait_for_rows
 warnings.filterwarnings('ignore')
 
+LEAGUES = ['superlig', 'bundesliga', 'premier', 'saudi']
+LEAGUE_CODES = {'superlig': 'TR', 'bundesliga': 'L1', 'premier': 'GB1', 'saudi': 'SA'}
+SOURCES = ('ea', 'footy', 'who')  # Birleştirme sırası
+
 class FootballDataCollector:
-    def __init__(self):
-        self.chrome_options = Options()
-        self.chrome_options.add_argument('--headless')
-        self.chrome_options.add_argument('--no-sandbox')
-        self.chrome_options.add_argument('--disable-dev-shm-usage')
-    
-    def get_ea_fc_ratings(self, league_id):
-        """EA FC ratings - Tüm ligler için"""
+    # Her kaynak fetch (ham sayfa) + parse (DataFrame) olarak ikiye ayrılır; etl.py
+    # pipeline'ı aşamaları ayrı ayrı cache'ler, get_* metodları ikisini birleştirir.
+    def fetch_ea_page(self, league_id):
         league_map = {
             'superlig': '68',      # Süper Lig
             'bundesliga': '19',    # Bundesliga
@@ -38,28 +44,37 @@ class FootballDataCollector:
         }
         
         url = f'https://www.ea.com/games/ea-sports-fc/ratings/leagues-ratings/{league_id}/{league_map.get(league_id, "68")}'
+        return http_client.get(url, timeout=10).text
+    
+    @metrics.timed('parse', 'ea')
+    def parse_ea_page(self, html, league_id):
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        players = []
+        for row in soup.select('table tbody tr, .player-row'):
+            cols = row.find_all('td')
+            if len(cols) >= 4:
+                rating = cols[0].text.strip()
+                name = cols[1].text.strip()
+                team_elem = row.select_one('.team, .club')
+                players.append({
+                    'Lig': league_id.upper(),
+                    'Oyuncu': name,
+                    'Takim': team_elem.text.strip() if team_elem else None,
+                    'EA_Rating': rating,
+                    'Kaynak': 'EA FC 26'
+                })
+        return pd.DataFrame(players)
+    
+    def get_ea_fc_ratings(self, league_id):
+        """EA FC ratings - Tüm ligler için"""
         try:
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            players = []
-            for row in soup.select('table tbody tr, .player-row'):
-                cols = row.find_all('td')
-                if len(cols) >= 4:
-                    rating = cols[0].text.strip()
-                    name = cols[1].text.strip()
-                    players.append({
-                        'Lig': league_id.upper(),
-                        'Oyuncu': name,
-                        'EA_Rating': rating,
-                        'Kaynak': 'EA FC 26'
-                    })
-            return pd.DataFrame(players)
+            return self.parse_ea_page(self.fetch_ea_page(league_id), league_id)
         except:
             return pd.DataFrame()
     
-    def get_whoscored_ratings(self, league_code):
-        """WhoScored ratings - Lig kodları"""
+    def fetch_whoscored_rows(self, league_code):
+        """Tablo satırlarının hücre metinleri (Selenium elementleri driver dışında yaşamaz)"""
         whoscored_leagues = {
             'TR': '200/Tournaments/8/Seasons/10042/Stages/22865',  # Süper Lig
             'GB1': 'England-Premier-League',                       # Premier League
@@ -70,116 +85,154 @@ class FootballDataCollector:
         path = whoscored_leagues.get(league_code, 'England-Premier-League')
         url = f'https://tr.whoscored.com/Regions/252/Tournaments/{path}/PlayerStatistics'
         
-        driver = webdriver.Chrome(options=self.chrome_options)
-        try:
+        with chrome_pool.driver() as driver:
             driver.get(url)
-            time.sleep(5)
-            
-            ratings = []
-            rows = driver.find_elements(By.CSS_SELECTOR, '.player-table tbody tr')
-            for row in rows[:100]:  # İlk 100 oyuncu
-                cells = row.find_elements(By.TAG_NAME, 'td')
-                if len(cells) >= 6:
-                    name = cells[1].text.strip()
-                    rating = cells[-1].text.strip()
-                    ratings.append({
-                        'Lig': league_code,
-                        'Oyuncu': name,
-                        'WhoScored_Rating': rating,
-                        'Kaynak': 'WhoScored'
-                    })
-            return pd.DataFrame(ratings)
-        finally:
-            driver.quit()
+            rows = wait_for_rows(driver, '.player-table tbody tr', name='whoscored-ratings')
+            return [[cell.text for cell in row.find_elements(By.TAG_NAME, 'td')]
+                    for row in rows[:100]]  # İlk 100 oyuncu
     
-    def get_footystats_players(self, league_path):
-        """FootyStats oyuncu istatistikleri"""
+    @metrics.timed('parse', 'whoscored')
+    def parse_whoscored_rows(self, rows, league_code):
+        ratings = []
+        for cells in rows:
+            if len(cells) >= 6:
+                # Oyuncu hücresi: "Ad\nTakım, yaş, pozisyon"
+                lines = cells[1].strip().split('\n')
+                name = lines[0].strip()
+                team = lines[1].split(',')[0].strip() if len(lines) > 1 else None
+                rating = cells[-1].strip()
+                ratings.append({
+                    'Lig': league_code,
+                    'Oyuncu': name,
+                    'Takim': team or None,
+                    'WhoScored_Rating': rating,
+                    'Kaynak': 'WhoScored'
+                })
+        return pd.DataFrame(ratings)
+    
+    def get_whoscored_ratings(self, league_code):
+        """WhoScored ratings - Lig kodları"""
+        return self.parse_whoscored_rows(self.fetch_whoscored_rows(league_code), league_code)
+    
+    def footystats_url(self, league_path):
         footystats_leagues = {
             'superlig': 'turkey/super-lig/players',
             'bundesliga': 'germany/bundesliga/players', 
             'premier': 'england/premier-league/players',
             'saudi': 'saudi-arabia/pro-league/players'
         }
+        return f'https://footystats.org/{footystats_leagues.get(league_path, "turkey/super-lig/players")}'
+    
+    FOOTYSTATS_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    
+    def fetch_footystats_page(self, league_path):
+        return http_client.get(self.footystats_url(league_path), headers=self.FOOTYSTATS_HEADERS, timeout=10).text
+    
+    @metrics.timed('parse', 'footystats')
+    def parse_footystats_page(self, html, league_path):
+        soup = BeautifulSoup(html, 'html.parser')
         
-        url = f'https://footystats.org/{footystats_leagues.get(league_path, "turkey/super-lig/players")}'
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+        stats = []
+        for row in soup.select('table tbody tr'):
+            name_elem = row.select_one('.player-name, .name')
+            goals_elem = row.select_one('.goals')
+            assists_elem = row.select_one('.assists')
+            team_elem = row.select_one('.team, .club')
             
-            stats = []
-            for row in soup.select('table tbody tr'):
-                name_elem = row.select_one('.player-name, .name')
-                goals_elem = row.select_one('.goals')
-                assists_elem = row.select_one('.assists')
-                
-                if name_elem:
-                    stats.append({
-                        'Lig': league_path.upper(),
-                        'Oyuncu': name_elem.text.strip(),
-                        'Gol_90': goals_elem.text.strip() if goals_elem else '0',
-                        'Asist_90': assists_elem.text.strip() if assists_elem else '0',
-                        'Kaynak': 'FootyStats'
-                    })
-            return pd.DataFrame(stats[:200])  # Limit 200
+            if name_elem:
+                stats.append({
+                    'Lig': league_path.upper(),
+                    'Oyuncu': name_elem.text.strip(),
+                    'Takim': team_elem.text.strip() if team_elem else None,
+                    'Gol_90': goals_elem.text.strip() if goals_elem else '0',
+                    'Asist_90': assists_elem.text.strip() if assists_elem else '0',
+                    'Kaynak': 'FootyStats'
+                })
+        return pd.DataFrame(stats[:200])  # Limit 200
+    
+    def get_footystats_players(self, league_path):
+        """FootyStats oyuncu istatistikleri"""
+        try:
+            # Sayfa değişmediyse (304 / aynı hash) önceki parse sonucu kullanılır
+            return http_client.fetch_parsed(self.footystats_url(league_path),
+                                            lambda html: self.parse_footystats_page(html, league_path),
+                                            name=f'footystats-{league_path}', headers=self.FOOTYSTATS_HEADERS, timeout=10)
         except:
             return pd.DataFrame()
     
+    @metrics.timed('normalize')
+    def normalize_sources(self, resolver, league, sources):
+        """Kaynak frame'leri -> kanonik oyuncu kimliği eklenmiş frame listesi (SOURCES sırasıyla)
+        
+        Kaynaklar isim ve lig kodunu farklı yazar ('TR' / 'SUPERLIG', 'Džeko' / 'Dzeko'):
+        her satır kanonik oyuncu kimliğine bağlanıp onun üzerinden birleştirilir.
+        """
+        frames = []
+        for df in sources:
+            if not df.empty:
+                ids = resolver.resolve_frame(df, league, team_col='Takim')
+                frames.append(df.assign(Lig=league.upper(), Oyuncu_ID=ids).dropna(subset=['Oyuncu_ID']))
+        return frames
+    
+    @metrics.timed('merge', 'lig')
+    def merge_league(self, resolver, league, frames):
+        if not frames:
+            return pd.DataFrame()
+        # Takım kaynaklardan ilk bilinen değerle tek kolonda (Takim_x/Takim_y olmasın)
+        teams = pd.concat([f.set_index('Oyuncu_ID')['Takim'] for f in frames if 'Takim' in f.columns]
+                          or [pd.Series(dtype=object)]).dropna()
+        teams = teams[~teams.index.duplicated()]
+        frames = [f.drop(columns=['Takim'], errors='ignore') for f in frames]
+        merged = frames[0]
+        for other in frames[1:]:
+            merged = merged.merge(other.drop(columns=['Oyuncu']), on=['Lig', 'Oyuncu_ID'], how='outer')
+        merged['Oyuncu'] = [resolver.display_name(league, pid) for pid in merged['Oyuncu_ID']]
+        merged['Takim'] = merged['Oyuncu_ID'].map(teams)
+        return merged
+    
+    @metrics.timed('merge', 'tum_ligler')
+    def merge_leagues(self, league_frames):
+        all_data = [df for df in league_frames if not df.empty]
+        if not all_data:
+            return pd.DataFrame()
+        final_df = pd.concat(all_data, ignore_index=True)
+        
+        # Ortalama rating hesapla
+        final_df['Ort_Rating'] = scoring.blend_ratings(final_df)  # scoring.RATING_BLEND ağırlıkları
+        return final_df
+    
     def collect_all_leagues(self):
         """Tüm ligleri topla"""
-        leagues = ['superlig', 'bundesliga', 'premier', 'saudi']
-        all_data = []
+        # Tüm lig/kaynak çekimleri paralel; rate limit host bazlı (parallel.HOST_LIMITS)
+        print(f"\n{', '.join(l.upper() for l in LEAGUES)} verileri toplanıyor...")
+        tasks = {}
+        for league in LEAGUES:
+            tasks[(league, 'ea')] = ('ea.com', self.get_ea_fc_ratings, league)                             # EA FC ratings
+            tasks[(league, 'who')] = ('whoscored.com', self.get_whoscored_ratings, LEAGUE_CODES[league])  # WhoScored ratings
+            tasks[(league, 'footy')] = ('footystats.org', self.get_footystats_players, league)            # FootyStats stats
+        results = fetcher.run(tasks, default=pd.DataFrame())
         
-        for league in leagues:
-            print(f"\n{league.upper()} verileri toplanıyor...")
-            
-            # EA FC ratings
-            ea_df = self.get_ea_fc_ratings(league)
-            
-            # WhoScored ratings  
-            league_code = {'superlig': 'TR', 'bundesliga': 'L1', 'premier': 'GB1', 'saudi': 'SA'}[league]
-            who_df = self.get_whoscored_ratings(league_code)
-            
-            # FootyStats stats
-            footy_df = self.get_footystats_players(league)
-            
-            # Birleştir
-            if not ea_df.empty:
-                merged = ea_df.merge(footy_df, on=['Lig', 'Oyuncu'], how='outer')
-                merged = merged.merge(who_df, on=['Lig', 'Oyuncu'], how='outer')
-                all_data.append(merged)
-            
-            time.sleep(2)  # Rate limit
+        resolver = identity.IdentityResolver()
+        merged = []
+        for league in LEAGUES:
+            frames = self.normalize_sources(resolver, league, [results[(league, source)] for source in SOURCES])
+            merged.append(self.merge_league(resolver, league, frames))
+        resolver.save()
         
-        if all_data:
-            final_df = pd.concat(all_data, ignore_index=True)
-            
-            # Ortalama rating hesapla
-            final_df['Ort_Rating'] = (
-                pd.to_numeric(final_df['EA_Rating'], errors='coerce').fillna(80) * 0.4 +
-                pd.to_numeric(final_df['WhoScored_Rating'], errors='coerce').fillna(7.0) * 0.6
-            )
-            
-            final_df.to_csv('tum_ligler_oyuncu_yetkinlikleri.csv', index=False, encoding='utf-8')
+        final_df = self.merge_leagues(merged)
+        if not final_df.empty:
+            snapshot.write('playerStats/tum_ligler', snapshot.typed(final_df), time.time())  # CSV: python snapshot.py export
             print(f"\n✅ {len(final_df)} oyuncu verisi toplandı!")
             print(final_df.groupby('Lig').size())
             print("\nÖrnek veriler:")
             print(final_df[['Lig', 'Oyuncu', 'EA_Rating', 'WhoScored_Rating', 'Ort_Rating', 'Gol_90']].head(10))
-            
-            return final_df
-        return pd.DataFrame()
+        return final_df
 
 # Kullanım
 if __name__ == "__main__":
+    # Aşamalı ve cache'li çalıştırma (KAP birleştirmesi dahil): python etl.py
     collector = FootballDataCollector()
     result = collector.collect_all_leagues()
-    # Tek lig için
-    bundesliga_data = collector.get_ea_fc_ratings('bundesliga')
-    premier_data = collector.get_whoscored_ratings('GB1')
-    # Merge (kulüp bazlı eşleştirme)
-    final_analysis = skills_df.merge(kap_df, left_on='Oyuncu', right_on='Bildirim', how='left')
-    final_analysis.to_excel('tam_analiz_lig_karsilastirmasi.xlsx')
 
 '''# KAP ile birleştirme (önceki kodunuz)
 def full_analysis_with_kap():
@@ -0,0 +1,57 @@
+"""Lig başına kolon bazlı, salt okunur oyuncu deposu.
+
+Scraper'lar string değerli dict listeleri üretir (`'gol': '12'`). Depo bunu
+yenileme başına bir kez tipli kolonlara çevirir: takım/pozisyon/lig/kaynak
+categorical, metrikler float32. Ham dict listesi bellekte tutulmaz; tüm
+endpoint'ler aynı frame'i ve sıralama indeksini salt okunur paylaşır.
+"""
+import pandas as pd
+
+import ranking
+import views
+
+CATEGORY_COLS = ['lig', 'takim', 'pozisyon', 'kaynak']
+# Skorlamada kullanılmayan ama sayısal olan kaynak kolonları (eksikler NaN kalır)
+EXTRA_NUMERIC = ['rating', 'key_passes_90', 'dribbles_90']
+
+
+def compact(df):
+    """Kolonları en küçük uygun tipe çevir (yerinde değil, yeni frame döner)"""
+    types = {}
+    for col in df.columns:
+        if col in CATEGORY_COLS and df[col].dtype == object:
+            types[col] = 'category'
+        elif df[col].dtype == 'float64':
+            types[col] = 'float32'
+    df = df.astype(types)
+    for col in EXTRA_NUMERIC:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+    return df
+
+
+class PlayerStore:
+    def __init__(self, frame):
+        """`frame` hazır (prepare + compact edilmiş) olmalı, ör. snapshot'tan yüklenen"""
+        self.frame = frame
+        self.index = ranking.RankingIndex(frame)
+
+    @classmethod
+    def from_records(cls, stats):
+        return cls(compact(views.prepare_frame(stats)))
+
+    def __len__(self):
+        return len(self.frame)
+
+    def memory_usage(self):
+        """Frame + indeks, byte"""
+        return int(self.frame.memory_usage(index=True, deep=True).sum()) + self.index.nbytes()
+
+    def stats(self):
+        size = self.memory_usage()
+        return {
+            'oyuncu': len(self),
+            'byte': size,
+            'byte_1000_oyuncu': round(size * 1000 / len(self)) if len(self) else 0,
+        }
+
@@ -0,0 +1,94 @@
+"""Lig verisi için önceden hesaplanmış sıralama indeksleri.
+
+Her yenilemeden sonra lig başına bir kez kurulur: metrik başına azalan sıralı
+satır indeksi, bunun pozisyon grubu (GK/DF/MF/FW) ve takım bazlı alt kümeleri.
+Top-N, kaleci ve "metriğe göre sırala" sorguları istek anında sıralama veya
+string filtreleme yapmaz; hazır dizilerin dilimlenmesiyle cevaplanır.
+"""
+import threading
+
+import numpy as np
+
+from scoring import POSITION_GROUPS
+
+# Sıralanabilir metrikler (?sirala=)
+INDEX_METRICS = ['performans_skoru', 'gol', 'asist', 'xg', 'tackles', 'interceptions',
+                 'kurtaris', 'pas_yuzde', 'sca', 'gca']
+DEFAULT_METRIC = 'performans_skoru'
+
+
+def descending(values):
+    """Azalan sıra (eşitlikte önceki satır önce) - int32 indeks"""
+    return np.argsort(-values, kind='stable').astype(np.int32)
+
+
+class RankingIndex:
+    def __init__(self, df, metrics=INDEX_METRICS):
+        self.size = len(df)
+        self._lock = threading.Lock()
+        self._orders = {}  # (metrik, grup, takım) -> sıralı satır indeksleri
+        self.values = {}   # sonradan eklenen skorlar (frame sırasıyla)
+
+        if 'pozisyon_grubu' in df.columns:
+            codes = df['pozisyon_grubu'].cat.codes.to_numpy()
+        else:
+            codes = np.full(self.size, -1)
+        self._group_masks = {group: codes == i for i, group in enumerate(POSITION_GROUPS)}
+        self.groups = {group: np.flatnonzero(mask).astype(np.int32) for group, mask in self._group_masks.items()}
+
+        self._team_masks = {}
+        self.teams = {}  # küçük harf -> orijinal takım adı
+        if 'takim' in df.columns:
+            teams = df['takim'].astype(object).fillna('').astype(str).str.strip().to_numpy()
+            for team in np.unique(teams):
+                if team:
+                    self._team_masks[team] = teams == team
+                    self.teams[team.lower()] = team
+
+        for metric in metrics:
+            if metric in df.columns:
+                self._add(metric, df[metric].to_numpy())
+            else:
+                self._add(metric, np.zeros(self.size, dtype=np.float32))
+
+    def _add(self, metric, values):
+        order = descending(values)
+        orders = {(metric, None, None): order}
+        for group, mask in self._group_masks.items():
+            orders[(metric, group, None)] = order[mask[order]]
+        for team, mask in self._team_masks.items():
+            orders[(metric, None, team)] = order[mask[order]]
+        with self._lock:
+            self._orders.update(orders)
+
+    def add_scores(self, name, scores):
+        """Profil skorları gibi sonradan hesaplanan metrikler (bir kez eklenir)"""
+        if (name, None, None) not in self._orders:
+            with self._lock:
+                self.values[name] = scores
+            self._add(name, scores)
+
+    def nbytes(self):
+        with self._lock:
+            return (sum(order.nbytes for order in self._orders.values()) +
+                    sum(scores.nbytes for scores in self.values.values()))
+
+    def has(self, metric):
+        return (metric, None, None) in self._orders
+
+    def team(self, name):
+        """Takım adı (büyük/küçük harf duyarsız) -> indeksteki ad, yoksa None"""
+        return self.teams.get((name or '').strip().lower())
+
+    def top(self, metric=DEFAULT_METRIC, limit=None, group=None, team=None):
+        """`metric`'e göre sıralı satır indeksleri, grup/takım filtresiyle"""
+        if team is not None and group is not None:
+            order = self._orders[(metric, group, None)]
+            order = order[self._team_masks[team][order]]
+        else:
+            order = self._orders[(metric, group, team)]
+        return order if limit is None else order[:limit]
+
+    def rows(self, group):
+        """Pozisyon grubundaki satırlar (frame sırasıyla)"""
+        return self.groups[group]
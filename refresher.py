@@ -0,0 +1,139 @@
+import os
+import time
+import threading
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+LEAGUES = ['superlig', 'bundesliga', 'premier', 'saudi']
+
+
+def parse_schedule(value, default):
+    """'superlig=900,premier=3600' -> {'superlig': 900, 'premier': 3600}"""
+    schedule = {}
+    for part in (value or '').split(','):
+        if '=' not in part:
+            continue
+        league, seconds = part.split('=', 1)
+        try:
+            schedule[league.strip()] = max(int(seconds), 1)
+        except ValueError:
+            pass
+    return {league: schedule.get(league, default) for league in LEAGUES}
+
+
+class LeagueRefresher:
+    """Arka planda ligleri periyodik olarak yeniden çeker (stale-while-revalidate).
+
+    İstek yolu sadece son başarılı veriyi okur; scraping bu thread'de yapılır.
+    Hatalı/boş çekimde eski veri korunur ve `retry_interval` sonra tekrar denenir.
+    """
+
+    def __init__(self, refresh_func, intervals, retry_interval=60, fetched=None):
+        """`fetched`: {lig: son çekim zamanı} (ör. açılışta yüklenen snapshot'lar); bu
+        ligler aralık dolana kadar yeniden çekilmez, diğerleri hemen çekilir."""
+        self.refresh_func = refresh_func
+        self.intervals = dict(intervals)
+        self.retry_interval = retry_interval
+        fetched = fetched or {}
+        self.state = {
+            league: {'son_yenileme': fetched.get(league),
+                     'sonraki': fetched[league] + interval if league in fetched else 0.0,
+                     'sure': None, 'hata': None}
+            for league, interval in self.intervals.items()
+        }
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='league-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def trigger(self, league):
+        """Ligi bir sonraki turda hemen yenile"""
+        with self._lock:
+            if league in self.state:
+                self.state[league]['sonraki'] = 0.0
+        self._wake.set()
+
+    def refresh(self, league):
+        started = time.time()
+        try:
+            ok = bool(self.refresh_func(league))
+            error = None if ok else 'Veri alınamadı'
+        except Exception as e:
+            logger.warning("%s yenilenemedi: %s", league, e)
+            ok, error = False, str(e)
+        finished = time.time()
+        with self._lock:
+            state = self.state[league]
+            state['sure'] = round(finished - started, 3)
+            state['hata'] = error
+            if ok:
+                state['son_yenileme'] = finished
+                state['sonraki'] = finished + self.intervals[league]
+            else:
+                state['sonraki'] = finished + self.retry_interval
+        return ok
+
+    def _due(self):
+        now = time.time()
+        with self._lock:
+            due = [league for league, s in self.state.items() if s['sonraki'] <= now]
+            next_at = min(s['sonraki'] for s in self.state.values())
+        return due, next_at
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            due, next_at = self._due()
+            for league in due:
+                if self._stop.is_set():
+                    return
+                self.refresh(league)
+            if not due:
+                self._wake.wait(max(next_at - time.time(), 0))
+
+    def status(self):
+        def fmt(ts):
+            return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+        with self._lock:
+            return {
+                league: {
+                    'son_yenileme': fmt(s['son_yenileme']),
+                    'sonraki_yenileme': fmt(s['sonraki']),
+                    'aralik_sn': self.intervals[league],
+                    'sure_sn': s['sure'],
+                    'hata': s['hata'],
+                }
+                for league, s in self.state.items()
+            }
+
+
+def from_env(refresh_func, fetched=None):
+    """REFRESH_INTERVAL (sn) ve REFRESH_SCHEDULE ('lig=sn,...') ile yapılandır"""
+    default = int(os.environ.get('REFRESH_INTERVAL', 1800))
+    intervals = parse_schedule(os.environ.get('REFRESH_SCHEDULE'), default)
+    retry = int(os.environ.get('REFRESH_RETRY', 60))
+    return LeagueRefresher(refresh_func, intervals, retry_interval=retry, fetched=fetched)
+
+
+def enabled():
+    return os.environ.get('REFRESH_ENABLED', '1') == '1'
@@ -0,0 +1,403 @@
+"""Upstream kaynakları kaydet / tekrar oynat (canlı siteye gitmeden ölçüm ve test).
+
+REPLAY_MODE=record: http_client üzerinden giden her cevap ve Selenium'un
+render ettiği sayfa kaynağı REPLAY_DIR altına (varsayılan fixtures/) yazılır.
+
+REPLAY_MODE=replay: ağ kapalıdır. http_client istekleri yerel bir stub HTTP
+sunucusuna yönlendirilir (gerçek soket, ETag/304 dahil), Chrome havuzu
+kayıtlı sayfa kaynağını okuyan sahte bir sürücü üretir, api.apify.com
+istekleri run/poll/dataset akışını taklit eden sahte bir Apify'a gider.
+Fixture'ı olmayan URL 404 döner (sahte sürücüde WebDriverException).
+
+    fixtures/<host>/<anahtar>.json   url, yöntem, durum, content-type
+    fixtures/<host>/<anahtar>.body   ham gövde
+    fixtures/apify/<anahtar>.body    aktör dataset'i (JSON liste); record modunda
+                                     RecordingAdapter dataset sayfalarından yazar
+
+    REPLAY_MODE=record python app.py      # endpoint'leri çağır, fixture'lar yazılır
+    REPLAY_MODE=replay python app.py      # aynı veriyle çevrimdışı
+"""
+import os
+import re
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString, PreformattedString
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from parallel import host_of
+
+logger = logging.getLogger(__name__)
+
+REPLAY_DIR = os.environ.get('REPLAY_DIR', 'fixtures')
+APIFY_HOST = 'api.apify.com'
+
+
+class FixtureStore:
+    def __init__(self, directory=None):
+        self.directory = directory or REPLAY_DIR
+        self._lock = threading.Lock()
+
+    def _base(self, method, url, host=None):
+        key = hashlib.sha1(f'{method} {url}'.encode('utf-8')).hexdigest()[:20]
+        return os.path.join(self.directory, host or host_of(url), key)
+
+    def save(self, method, url, status, content_type, body, host=None):
+        base = self._base(method, url, host)
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        meta = {'url': url, 'yontem': method, 'durum': status, 'content_type': content_type,
+                'kayit': time.time()}
+        with self._lock:
+            for path, data in ((f'{base}.body', body), (f'{base}.json', json.dumps(meta).encode('utf-8'))):
+                with open(f'{path}.tmp', 'wb') as f:
+                    f.write(data)
+                os.replace(f'{path}.tmp', path)
+
+    def load(self, method, url, host=None):
+        """-> (meta, gövde) veya (None, None)"""
+        base = self._base(method, url, host)
+        try:
+            with open(f'{base}.json', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(f'{base}.body', 'rb') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    # Selenium: render edilmiş sayfa kaynağı
+    def save_page(self, url, html):
+        self.save('PAGE', url, 200, 'text/html', html.encode('utf-8'))
+
+    def load_page(self, url):
+        meta, body = self.load('PAGE', url)
+        return body.decode('utf-8') if body is not None else None
+
+    # Apify: aktör başına dataset
+    def save_dataset(self, actor, items):
+        self.save('DATASET', actor, 200, 'application/json', json.dumps(items).encode('utf-8'), host='apify')
+
+    def load_dataset(self, actor):
+        meta, body = self.load('DATASET', actor, host='apify')
+        return json.loads(body) if body is not None else None
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Gerçek isteği gönderir, cevabı fixture olarak yazar.
+
+    Apify akışı ayrıca izlenir: run başlatma cevabından dataset -> aktör eşlemesi
+    çıkarılır, dataset sayfaları geldikçe aktörün dataset fixture'ı (save_dataset)
+    güncellenir; FakeApify replay'de bunu sunar.
+    """
+
+    def __init__(self, store, **kwargs):
+        self.store = store
+        self._datasets = {}  # dataset id -> (aktör, {offset: öğeler})
+        self._apify_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code < 400:
+            self.store.save(request.method, request.url, response.status_code,
+                            response.headers.get('Content-Type', ''), response.content)
+            self._record_apify(request, response)
+        return response
+
+    def _record_apify(self, request, response):
+        """/acts/<aktör>/runs (POST) ve /datasets/<id>/items (GET); APIFY_BASE_URL'den bağımsız yol eşlemesi"""
+        url = urlsplit(request.url)
+        parts = url.path.strip('/').split('/')
+        try:
+            if request.method == 'POST' and len(parts) >= 3 and parts[-3] == 'acts' and parts[-1] == 'runs':
+                run = response.json()['data']
+                with self._apify_lock:
+                    self._datasets[run['defaultDatasetId']] = (parts[-2].replace('~', '/'), {})
+            elif request.method == 'GET' and len(parts) >= 3 and parts[-3] == 'datasets' and parts[-1] == 'items':
+                offset = int(parse_qs(url.query).get('offset', ['0'])[0])
+                items = response.json()
+                with self._apify_lock:
+                    if parts[-2] not in self._datasets:
+                        return
+                    actor, pages = self._datasets[parts[-2]]
+                    pages[offset] = items
+                    # Kilit içinde: eşzamanlı sayfalarda eski liste yenisinin üstüne yazılmasın
+                    self.store.save_dataset(actor, [item for _, page in sorted(pages.items()) for item in page])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Apify cevabı kaydedilemedi: %s", request.url)
+
+
+class StubAdapter(HTTPAdapter):
+    """İsteği stub sunucuya yönlendirir: https://fbref.com/x -> http://127.0.0.1:<port>/https/fbref.com/x"""
+
+    def __init__(self, stub_url, **kwargs):
+        self.stub_url = stub_url
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if not request.url.startswith(self.stub_url):
+            parts = urlsplit(request.url)
+            request = request.copy()
+            request.url = f"{self.stub_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}" + \
+                          (f'?{parts.query}' if parts.query else '')
+        return super().send(request, **kwargs)
+
+
+class FakeApify:
+    """Run başlat / waitForFinish ile durum / sayfalı dataset; run `run_seconds` sonra biter"""
+
+    def __init__(self, store, run_seconds=0.5):
+        self.store = store
+        self.run_seconds = run_seconds
+        self.runs = {}
+        self._lock = threading.Lock()
+
+    def handle(self, method, path, query, body):
+        """-> (durum, JSON değer)"""
+        parts = path.strip('/').split('/')  # v2/acts/<aktör>/runs, v2/actor-runs/<id>, v2/datasets/<id>/items
+        if method == 'POST' and len(parts) == 4 and parts[1] == 'acts' and parts[3] == 'runs':
+            actor = parts[2].replace('~', '/')
+            items = self.store.load_dataset(actor)
+            if items is None:
+                return 404, {'error': {'type': 'record-not-found', 'message': f'Dataset fixture yok: {actor}'}}
+            run_id = uuid.uuid4().hex[:12]
+            with self._lock:
+                self.runs[run_id] = {'bitis': time.monotonic() + self.run_seconds, 'items': items}
+            return 201, {'data': self._run(run_id)}
+        if method == 'GET' and len(parts) == 3 and parts[1] == 'actor-runs' and parts[2] in self.runs:
+            run = self.runs[parts[2]]
+            wait = float(query.get('waitForFinish', ['0'])[0])
+            time.sleep(max(0.0, min(wait, run['bitis'] - time.monotonic())))
+            return 200, {'data': self._run(parts[2])}
+        if method == 'GET' and len(parts) == 4 and parts[1] == 'datasets' and parts[3] == 'items':
+            run = self.runs.get(parts[2][len('ds-'):])
+            if run is None:
+                return 404, {'error': {'type': 'record-not-found'}}
+            offset = int(query.get('offset', ['0'])[0])
+            limit = int(query.get('limit', [str(len(run['items']))])[0])
+            return 200, run['items'][offset:offset + limit]
+        return 404, {'error': {'type': 'page-not-found'}}
+
+    def _run(self, run_id):
+        done = time.monotonic() >= self.runs[run_id]['bitis']
+        return {'id': run_id, 'status': 'SUCCEEDED' if done else 'RUNNING', 'defaultDatasetId': f'ds-{run_id}'}
+
+
+class StubServer:
+    """Fixture'ları gerçek HTTP üzerinden sunan yerel sunucu (arka plan thread'i)"""
+
+    def __init__(self, store, latency=0.0, run_seconds=0.5):
+        self.store = store
+        self.latency = latency  # sn, her cevaba eklenen yapay gecikme
+        self.apify = FakeApify(store, run_seconds)
+        self.misses = []
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}'
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='replay-stub', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive: http_client havuzu bağlantıyı yeniden kullanır
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, content_type, body, headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def _serve(self, method):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                scheme, _, rest = self.path.lstrip('/').partition('/')
+                url = f'{scheme}://{rest}'
+                parts = urlsplit(url)
+                if server.latency:
+                    time.sleep(server.latency)
+                if parts.hostname == APIFY_HOST:
+                    status, value = server.apify.handle(method, parts.path, parse_qs(parts.query), body)
+                    return self._send(status, 'application/json', json.dumps(value).encode('utf-8'))
+
+                meta, content = server.store.load(method, url)
+                if meta is None:
+                    server.misses.append(url)
+                    return self._send(404, 'application/json', json.dumps({'fixture_yok': url}).encode('utf-8'))
+                etag = '"%s"' % hashlib.sha1(content).hexdigest()
+                if self.headers.get('If-None-Match') == etag:
+                    return self._send(304, meta['content_type'], b'', {'ETag': etag})
+                self._send(meta['durum'], meta['content_type'], content, {'ETag': etag})
+
+            def do_GET(self):
+                self._serve('GET')
+
+            def do_POST(self):
+                self._serve('POST')
+
+        return Handler
+
+
+# Selenium `.text` bu elemanların ve <br>'in sınırında satır kırar
+BLOCK_TAGS = {'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption',
+              'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main',
+              'nav', 'ol', 'p', 'pre', 'section', 'table', 'tbody', 'tfoot', 'thead', 'tr', 'ul'}
+HIDDEN_TAGS = {'script', 'style', 'noscript', 'template', 'head'}
+
+
+def _visible_text(node):
+    """Selenium `.text` karşılığı: blok eleman ve <br> sınırında satır sonu, satır
+    içi boşluklar tek boşluk, hücreler arası boşluk, boş satırlar atılır."""
+    parts = []
+
+    def walk(parent):
+        for child in parent.children:
+            if isinstance(child, PreformattedString):  # yorum, CDATA, doctype
+                continue
+            if isinstance(child, NavigableString):
+                parts.append(re.sub(r'\s+', ' ', str(child)))
+            elif child.name == 'br':
+                parts.append('\n')
+            elif child.name not in HIDDEN_TAGS:
+                block = child.name in BLOCK_TAGS
+                parts.append('\n' if block else '')
+                walk(child)
+                parts.append('\n' if block else ' ' if child.name in ('td', 'th') else '')
+
+    walk(node)
+    lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+class FakeElement:
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def text(self):
+        return _visible_text(self._node)
+
+    def get_attribute(self, name):
+        value = self._node.get(name)
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def find_elements(self, by, value):
+        return _find(self._node, by, value)
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if not found:
+            raise WebDriverException(f'Element yok: {value}')
+        return found[0]
+
+
+def _find(node, by, value):
+    if by == By.CSS_SELECTOR:
+        return [FakeElement(n) for n in node.select(value)]
+    if by == By.TAG_NAME:
+        return [FakeElement(n) for n in node.find_all(value)]
+    raise WebDriverException(f'Sahte sürücü {by} desteklemiyor')
+
+
+class FakeDriver:
+    """Kayıtlı sayfa kaynağından çalışan webdriver yerine geçen nesne (JS yok, anında 'render')"""
+
+    def __init__(self, store):
+        self.store = store
+        self.current_url = 'about:blank'
+        self.page_source = ''
+        self._doc = BeautifulSoup('', 'lxml')
+
+    def get(self, url):
+        html = self.store.load_page(url)
+        if html is None:
+            raise WebDriverException(f'Sayfa fixture\'ı yok: {url}')
+        self.current_url, self.page_source = url, html
+        self._doc = BeautifulSoup(html, 'lxml')
+
+    def find_elements(self, by, value):
+        return _find(self._doc, by, value)
+
+    def find_element(self, by, value):
+        return FakeElement(self._doc).find_element(by, value)
+
+    def quit(self):
+        pass
+
+
+class RecordingDriver:
+    """Gerçek sürücüyü sarar; tablo satırları okunduğunda o anki sayfa kaynağını kaydeder"""
+
+    def __init__(self, driver, store):
+        self._driver = driver
+        self._store = store
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    def find_elements(self, by, value):
+        found = self._driver.find_elements(by, value)
+        if found:
+            self._store.save_page(self._driver.current_url, self._driver.page_source)
+        return found
+
+
+def install(mode, directory=None, latency=0.0, client=None, pool=None):
+    """http_client ve Chrome havuzunu kayıt/tekrar moduna al; replay'de stub sunucuyu döndür"""
+    import http_client
+    from driver_pool import pool as chrome_pool
+    from parallel import hosts
+
+    client = client or http_client.client
+    pool = pool or chrome_pool
+    store = FixtureStore(directory)
+    original = client.session.get_adapter('https://')
+    options = {'pool_connections': original._pool_connections, 'pool_maxsize': original._pool_maxsize,
+               'max_retries': original.max_retries}
+
+    if mode == 'record':
+        adapter = RecordingAdapter(store, **options)
+        real_factory = pool.factory
+        pool.factory = lambda: RecordingDriver(real_factory(), store)
+        stub = None
+    elif mode == 'replay':
+        stub = StubServer(store, latency=latency).start()
+        adapter = StubAdapter(stub.url, **options)
+        pool.factory = lambda: FakeDriver(store)
+        # Stub'a nezaket beklemesi gereksiz; ölçülen şey kendi kodumuz
+        hosts.limits.clear()
+    else:
+        raise ValueError(f'Geçersiz REPLAY_MODE: {mode} (record, replay)')
+    client.session.mount('http://', adapter)
+    client.session.mount('https://', adapter)
+    logger.warning("Replay modu: %s (%s)", mode, store.directory)
+    return stub
+
+
+def install_from_env():
+    mode = os.environ.get('REPLAY_MODE', '').lower()
+    if not mode or mode == 'off':
+        return None
+    return install(mode, latency=float(os.environ.get('REPLAY_LATENCY_MS', 0)) / 1000)
@@ -0,0 +1,165 @@
+"""Vektörize, profil tabanlı oyuncu skorlama.
+
+Sayısal kolonlar ingest sırasında (`prepare`) bir kez float'a çevrilir ve 90
+dakika başına değerler hesaplanır; skor hesabında eksik kolonlar 0 sayılır. Skor
+hesaplama ağırlık matrisi ile tek NumPy çarpımıdır: her oyuncunun satırı
+pozisyon grubuna göre seçilen ağırlık satırıyla çarpılır. Binlerce oyuncuyu
+sıralamak milisaniyenin altında sürer.
+
+Profil: temel ağırlıklar + lig bazlı + pozisyon bazlı override'lar.
+SCORING_PROFILES ortam değişkeni bir JSON dosyası gösteriyorsa oradaki
+profiller de yüklenir:
+
+    {"benim": {"agirliklar": {"gol": 4, "xg": 2}, "per90": true, "min_dakika": 450,
+               "pozisyon": {"DF": {"tackles": 2}}, "lig": {"saudi": {"gol": 3.5}}}}
+"""
+import os
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Kaynaktan string gelen, ingest'te sayıya çevrilen kolonlar
+METRICS = ['dakika', 'gol', 'asist', 'xg', 'pas_yuzde', 'tackles', 'interceptions',
+           'kurtaris', 'kurtaris_yuzde', 'gol_yeme_90', 'sca', 'gca']
+# 90 dakika başına normalize edilebilen sayaçlar (`<metrik>_90` kolonları)
+PER90 = ['gol', 'asist', 'xg', 'tackles', 'interceptions', 'kurtaris', 'sca', 'gca']
+POSITION_GROUPS = ['GK', 'DF', 'MF', 'FW']
+# `prepare` tarafından eklenen iç kolonlar (API çıktısına girmez)
+DERIVED = ['pozisyon_grubu'] + [f'{col}_90' for col in PER90]
+DEFAULT_PROFILE = 'varsayilan'
+
+
+def position_groups(positions):
+    """'DF,MF' -> 'DF' (ilk pozisyon); bilinmeyenler NaN kalır"""
+    groups = positions.astype('string').str.split(',').str[0].str.strip().str.upper()
+    return pd.Categorical(groups, categories=POSITION_GROUPS)
+
+
+def prepare(df):
+    """Temiz sayısal kolonlar, pozisyon grubu ve per-90 değerler (ingest'te bir kez)"""
+    for col in METRICS:
+        if col in df.columns:
+            values = df[col]
+            if values.dtype == object:
+                values = values.astype(str).str.replace(',', '', regex=False)  # FBref: '1,234' dakika
+            df[col] = pd.to_numeric(values, errors='coerce').fillna(0).astype('float64')
+
+    if 'pozisyon' in df.columns:
+        df['pozisyon_grubu'] = position_groups(df['pozisyon'])
+
+    if 'dakika' in df.columns:
+        nineties = df['dakika'].to_numpy() / 90.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for col in PER90:
+                if col in df.columns:
+                    df[f'{col}_90'] = np.where(nineties > 0, df[col].to_numpy() / nineties, 0.0)
+    return df
+
+
+class Profile:
+    def __init__(self, name, weights, positions=None, leagues=None, per90=False, min_minutes=0):
+        self.name = name
+        self.weights = dict(weights)
+        self.positions = positions or {}
+        self.leagues = leagues or {}
+        self.per90 = per90
+        self.min_minutes = min_minutes
+        self._matrices = {}
+
+        metrics = set(self.weights)
+        for override in list(self.positions.values()) + list(self.leagues.values()):
+            metrics.update(override)
+        unknown = metrics - set(METRICS)
+        if unknown:
+            raise ValueError(f"{name}: bilinmeyen metrik(ler): {', '.join(sorted(unknown))}")
+        self.metrics = sorted(metrics)
+        self.columns = [f'{m}_90' if per90 and m in PER90 else m for m in self.metrics]
+
+    @classmethod
+    def from_dict(cls, name, spec):
+        return cls(name, spec.get('agirliklar', {}), positions=spec.get('pozisyon'),
+                   leagues=spec.get('lig'), per90=spec.get('per90', False),
+                   min_minutes=spec.get('min_dakika', 0))
+
+    def matrix(self, league=None):
+        """(pozisyon grubu + 1) x metrik ağırlık matrisi; son satır bilinmeyen pozisyonlar için"""
+        if league not in self._matrices:
+            base = dict(self.weights, **self.leagues.get(league, {}))
+            rows = [dict(base, **self.positions.get(group, {})) for group in POSITION_GROUPS] + [base]
+            self._matrices[league] = np.array([[row.get(m, 0.0) for m in self.metrics] for row in rows],
+                                              dtype='float64')
+        return self._matrices[league]
+
+    def score(self, df, league=None):
+        """Her oyuncu için skor dizisi (df sırasıyla)"""
+        if not any(col in df.columns for col in self.columns) and 'performans_skoru' in df.columns:
+            # Kaynak sadece hazır skor veriyor (ör. secure_app yer tutucu verisi)
+            return df['performans_skoru'].to_numpy(dtype='float64')
+        n = len(df)
+        values = np.column_stack([df[col].to_numpy(dtype='float64') if col in df.columns else np.zeros(n)
+                                  for col in self.columns]) if self.columns else np.zeros((n, 0))
+        codes = df['pozisyon_grubu'].cat.codes.to_numpy() if 'pozisyon_grubu' in df.columns \
+            else np.full(n, -1)
+        # codes == -1 (bilinmeyen pozisyon) matrisin son satırını seçer
+        scores = np.einsum('ij,ij->i', values, self.matrix(league)[codes])
+        if self.min_minutes and 'dakika' in df.columns:
+            scores = np.where(df['dakika'].to_numpy() >= self.min_minutes, scores, 0.0)
+        return scores
+
+
+PROFILES = {
+    # Eski sabit formül: gol*3 + asist*2 + xg*1.5 + tackles*1.2 + pas%*0.01
+    'varsayilan': Profile('varsayilan', {'gol': 3, 'asist': 2, 'xg': 1.5, 'tackles': 1.2, 'pas_yuzde': 0.01}),
+    'hucum': Profile('hucum', {'gol': 3, 'asist': 2.5, 'xg': 2, 'sca': 0.3, 'gca': 1},
+                     per90=True, min_minutes=450),
+    'savunma': Profile('savunma', {'tackles': 1.5, 'interceptions': 1.5, 'pas_yuzde': 0.02},
+                       per90=True, min_minutes=450),
+    'pozisyon': Profile('pozisyon', {'gol': 3, 'asist': 2, 'xg': 1.5, 'tackles': 1.2, 'pas_yuzde': 0.01},
+                        positions={
+                            'GK': {'gol': 0, 'asist': 0, 'xg': 0, 'tackles': 0, 'pas_yuzde': 0.01,
+                                   'kurtaris': 1, 'kurtaris_yuzde': 0.05, 'gol_yeme_90': -2},
+                            'DF': {'gol': 2, 'tackles': 1.5, 'interceptions': 1.5, 'pas_yuzde': 0.02},
+                            'MF': {'asist': 2.5, 'sca': 0.3, 'gca': 1, 'pas_yuzde': 0.02, 'tackles': 0.8},
+                            'FW': {'gol': 3, 'xg': 1.5, 'asist': 1.5, 'sca': 0.2, 'tackles': 0},
+                        },
+                        per90=True, min_minutes=450),
+}
+
+
+def load_profiles(path):
+    with open(path, encoding='utf-8') as f:
+        for name, spec in json.load(f).items():
+            PROFILES[name] = Profile.from_dict(name, spec)
+
+
+if os.environ.get('SCORING_PROFILES'):
+    try:
+        load_profiles(os.environ['SCORING_PROFILES'])
+    except (OSError, ValueError) as e:
+        logger.warning("Skor profilleri yüklenemedi: %s", e)
+
+
+def get_profile(name=None):
+    """İsimden profil; bilinmeyen isimde ValueError"""
+    name = name or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Geçersiz profil: {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+
+# playerStats.collect_all_leagues: kaynak ratingleri -> Ort_Rating
+RATING_BLEND = {'EA_Rating': (0.4, 80.0), 'WhoScored_Rating': (0.6, 7.0)}  # kolon: (ağırlık, eksikse değer)
+
+
+def blend_ratings(df, blend=RATING_BLEND):
+    """Kaynak ratinglerinin ağırlıklı ortalaması; eksik kolon/değer varsayılanla doldurulur"""
+    total = np.zeros(len(df))
+    for col, (weight, missing) in blend.items():
+        values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64') if col in df.columns \
+            else np.full(len(df), np.nan)
+        total += np.where(np.isnan(values), missing, values) * weight
+    return total
@@ -21,6 +21,18 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 import time
 import threading
+import refresher as refresh
+import cache
+import views
+import scoring
+import ranking
+import history
+import metrics
+import fastjson
+import batch
+import replay
+from league_data import LeagueDataMixin
+from parallel import fetcher
 
 # Güvenlik konfigürasyonu
 SECRET_KEY = os.environ.get('SECRET_KEY', secrets.token_hex(32))
@@ -28,19 +40,21 @@ MAX_CONTENT_LENGTH = 1024 * 1024  # 1MB limit
 PERMITTED_USER_AGENTS = [
     'Mozilla/5.0', 'Chrome/', 'Safari/', 'Edge/'
 ]
+VALID_LEAGUES = ['superlig', 'bundesliga', 'premier', 'saudi']
 
 app = Flask(__name__)
 app.secret_key = SECRET_KEY
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 app.config['TRAP_BAD_REQUEST_ERRORS'] = True
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = timedelta(seconds=12*60*60)
+app.config['RATELIMIT_ENABLED'] = os.environ.get('RATELIMIT_ENABLED', '1') == '1'  # Yük testinde 0
 
 # Rate limiting (saldırı önleme)
 limiter = Limiter(
     key_func=get_remote_address,
     app=app,
     default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://",
+    storage_uri=cache.limiter_storage_uri(),  # CACHE_URL ile worker'lar arası ortak sayaç
 )
 
 # CSRF koruması
@@ -67,9 +81,13 @@ talisman = Talisman(
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
-class SecureStatsCollector:
+class SecureStatsCollector(LeagueDataMixin):
+    ttl = 3600  # 1 saat
+    namespace = 'secure'
+    
     def __init__(self):
-        self.cache = {}
+        self.cache = cache.from_env(ttl=self.ttl)  # Sınırlı TTL/LRU cache (CACHE_URL ile paylaşımlı)
+        self.init_league_data()
         self.chrome_options = Options()
         self.chrome_options.add_argument('--headless')
         self.chrome_options.add_argument('--no-sandbox')
@@ -85,11 +103,34 @@ class SecureStatsCollector:
     
     def validate_request(self, league):
         """İzin verilen ligler"""
-        valid_leagues = ['superlig', 'bundesliga', 'premier', 'saudi']
-        if league not in valid_leagues:
-            abort(400, description=f"Geçersiz lig. İzinliler: {valid_leagues}")
+        if league not in VALID_LEAGUES:
+            abort(400, description=f"Geçersiz lig. İzinliler: {VALID_LEAGUES}")
         return True
     
+    def profile_arg(self, args):
+        try:
+            return scoring.get_profile(self.sanitize_input(args.get('profil', '')) or None)
+        except ValueError:
+            abort(400, description="Geçersiz profil")
+    
+    def stats_args(self, args):
+        """limit, profil, sıralama, pozisyon, takım parametreleri (Flask ve ASGI ortak)"""
+        try:
+            limit = int(args.get('limit', 50))
+        except ValueError:
+            abort(400, description="Limit sayı olmalı")
+        if limit > 100 or limit < 1:
+            abort(400, description="Limit 1-100 arası olmalı")
+        profile = self.profile_arg(args)
+        metric = self.sanitize_input(args.get('sirala', '')) or None
+        if metric is not None and metric not in ranking.INDEX_METRICS:
+            abort(400, description="Geçersiz sıralama")
+        group = self.sanitize_input(args.get('pozisyon', '')).upper() or None
+        if group is not None and group not in scoring.POSITION_GROUPS:
+            abort(400, description="Geçersiz pozisyon")
+        team = self.sanitize_input(args.get('takim', ''))[:50] or None
+        return limit, profile, metric, group, team
+    
     def check_user_agent(self):
         """Bot trafiği engelleme"""
         ua = request.headers.get('User-Agent', '').lower()
@@ -97,13 +138,98 @@ class SecureStatsCollector:
         if suspicious or len(ua) < 10:
             abort(403, description="Erişim engellendi")
     
-    def rate_limit_cache(self, key):
+    def rate_limit_cache(self, key, since=0):
         """Cache poisoning önleme"""
-        if key in self.cache and time.time() - self.cache[key]['timestamp'] < 3600:  # 1 saat
-            return self.cache[key]['data']
+        cached = self.cache.get(key)
+        if cached and time.time() - cached['timestamp'] < 3600:  # 1 saat
+            if cached['timestamp'] >= since:
+                return cached['data']
         return None
+    
+    def _collect_stats(self, league):
+        """Scraping kodunuz buraya (önceki AdvancedStatsCollector)"""
+        return [
+            {'oyuncu': 'Mauro Icardi', 'performans_skoru': 92, 'takim': 'Galatasaray'},
+            {'oyuncu': 'Edin Dzeko', 'performans_skoru': 88, 'takim': 'Fenerbahçe'},
+            {'oyuncu': 'Gedson Fernandes', 'performans_skoru': 85, 'takim': 'Beşiktaş'}
+        ]
+    
+    def _cached(self, key, entry):
+        return self.rate_limit_cache(key, since=entry['time'])
+    
+    def _remember(self, key, entry, data):
+        self.cache[key] = {'data': data, 'timestamp': time.time()}
 
+replay.install_from_env()  # REPLAY_MODE=record|replay: fixture kaydı / çevrimdışı çalışma
 collector = SecureStatsCollector()
+# Paylaşımlı cache'te aralığın yarısından taze veri varsa başka worker çekmiş demektir
+# Snapshot'tan açılan ligler aralık dolana kadar yeniden çekilmez
+refresher = refresh.from_env(lambda league: collector.refresh(league, max_age=refresher.intervals[league] / 2),
+                             fetched={league: entry['time'] for league, entry in collector.latest.items()})
+if refresh.enabled():
+    refresher.start()
+# /metrics: Prometheus formatı, API key ve rate limit dışında
+limiter.exempt(metrics.install(app, 'secure', [metrics.cache_source(collector.cache, 'secure')]))
+
+def league_entry(league):
+    """1. seviye cache: ham lig verisi (yenileyici kapalıysa 1 saat TTL ile çekilir)"""
+    entry = collector.current(league)
+    if refresher.running:
+        # Stale-while-revalidate: istek yolunda asla scraping yapılmaz
+        if entry is None:
+            refresher.trigger(league)
+        return entry
+    if entry is None or time.time() - entry['time'] >= collector.ttl:
+        print(f"📊 {league.upper()} güvenli veri çekiliyor...")
+        collector.refresh(league)
+        entry = collector.latest.get(league)
+    return entry
+
+def not_ready(league):
+    if refresher.running:
+        return jsonify({'error': 'Veri hazırlanıyor, lütfen tekrar deneyin'}), 503, {'Retry-After': '30'}
+    return jsonify({
+        'lig': league.upper(),
+        'oyuncular': [],
+        'mesaj': 'Henüz veri çekilmedi, scraping fonksiyonunu bağlayın.'
+    })
+
+# Görünüm üreticileri (Flask ve ASGI route'ları ortak)
+def stats_view(league, entry, profile):
+    def build(df, limit, profile_name, metric, group, team):
+        return {
+            'lig': league.upper(),
+            'toplam_oyuncu': len(df),
+            'limit': limit,
+            'profil': profile_name,
+            'timestamp': datetime.now().isoformat(),
+            'oyuncular': views.top_players(df, limit, profile=profile, league=league, index=entry['store'].index,
+                                           metric=metric, group=group, team=team)
+        }
+    return build
+
+def keepers_view(entry):
+    return lambda df: {'kaleciler': views.keepers(df, entry['store'].index)}
+
+def compare_view(league, profile):
+    return lambda df, name: views.league_summary(df, profile, league)
+
+BATCH_BUILDERS = {'stats': stats_view, 'keepers': keepers_view, 'compare': compare_view}
+BATCH_LIMIT = "30 per minute"  # batch.COST birimiyle: stats 1, keepers 2, compare 3
+
+def batch_params(view, args):
+    if view == 'stats':
+        return collector.stats_args(args)
+    if view == 'compare':
+        return collector.profile_arg(args)
+    return ()
+
+def parse_batch(body):
+    """Toplu sorgu gövdesi -> [batch.Spec]; geçersizse 400"""
+    try:
+        return batch.parse(body, VALID_LEAGUES, batch_params)
+    except ValueError:
+        abort(400, description="Geçersiz toplu sorgu")
 
 '''def security_wrapper(f):
     """Tüm endpoint'ler için güvenlik katmanı"""
@@ -146,6 +272,10 @@ def bad_request(e):
 def forbidden(e):
     return jsonify({'error': 'Erişim engellendi'}), 403
 
+@app.errorhandler(404)
+def not_found(e):
+    return jsonify({'error': 'Bulunamadı'}), 404
+
 @app.errorhandler(429)
 def rate_limit_exceeded(e):
     return jsonify({'error': 'Çok fazla istek, lütfen bekleyin'}), 429
@@ -171,47 +301,27 @@ def get_league_stats(league):
     league = collector.sanitize_input(league.lower())
     collector.validate_request(league)
     
-    limit = int(request.args.get('limit', 50))
-    if limit > 100 or limit < 1:
-        abort(400, description="Limit 1-100 arası olmalı")
-    
-    cache_key = f"{league}_{limit}"
-    cached = collector.rate_limit_cache(cache_key)
-    if cached:
-        return jsonify(cached)
-    
-    print(f"📊 {league.upper()} güvenli veri çekiliyor...")
-    
-    # Scraping kodunuz buraya (önceki AdvancedStatsCollector)
-    stats = []  # collector.get_detailed_stats(league)  # Mevcut kodunuz
-    stats = [
-        {'oyuncu': 'Mauro Icardi', 'performans_skoru': 92, 'takim': 'Galatasaray'},
-        {'oyuncu': 'Edin Dzeko', 'performans_skoru': 88, 'takim': 'Fenerbahçe'},
-        {'oyuncu': 'Gedson Fernandes', 'performans_skoru': 85, 'takim': 'Beşiktaş'}
-    ]
-    
- #   if not stats:
- #       return jsonify({'error': f'{league.upper()} verisi alınamadı'}), 503
-    if not stats:
-        return jsonify({
-        'lig': league.upper(),
-        'oyuncular': [],
-        'mesaj': 'Henüz veri çekilmedi, scraping fonksiyonunu bağlayın.'
-        })
+    limit, profile, metric, group, team = collector.stats_args(request.args)
     
-    df = pd.DataFrame(stats)
-    top_players = df.nlargest(limit, 'performans_skoru').to_dict('records')
+    entry = league_entry(league)
+    if entry is None:
+        return not_ready(league)
     
-    result = {
-        'lig': league.upper(),
-        'toplam_oyuncu': len(df),
-        'limit': limit,
-        'timestamp': datetime.now().isoformat(),
-        'oyuncular': top_players[:limit]
-    }
-    
-    collector.cache[cache_key] = {'data': result, 'timestamp': time.time()}
-    return jsonify(result)
+    build = stats_view(league, entry, profile)
+    return fastjson.respond(collector.view(entry, league, 'stats', build, limit, profile.name, metric, group, team,
+                                           encoded=True))
+
+@app.route('/api/status', methods=['GET'])
+@limiter.limit("10 per minute")
+@security_wrapper
+def refresh_status():
+    """🔒 Lig bazlı son yenileme / sonraki yenileme zamanları"""
+    return jsonify({
+        'yenileyici_aktif': refresher.running,
+        'ligler': refresher.status(),
+        'cache': collector.cache.stats(),
+        'bellek': collector.memory()
+    })
 
 @app.route('/api/keepers/<league>', methods=['GET'])
 @limiter.limit("5 per minute")
@@ -220,7 +330,11 @@ def get_keepers(league):
     """🔒 Kaleci istatistikleri"""
     league = collector.sanitize_input(league.lower())
     collector.validate_request(league)
-    return jsonify({'kaleciler': []})  # Mevcut kodunuz
+    
+    entry = league_entry(league)
+    if entry is None:
+        return jsonify({'kaleciler': []})
+    return fastjson.respond(collector.view(entry, league, 'keepers', keepers_view(entry), encoded=True))
 
 @app.route('/api/compare', methods=['GET'])
 @limiter.limit("3 per minute")
@@ -230,14 +344,74 @@ def compare_leagues():
     leagues = request.args.getlist('ligler[]')
     for lig in leagues:
         collector.validate_request(lig.lower())
-    return jsonify({})
+    profile = collector.profile_arg(request.args)
+    
+    # Cache'te olmayan ligler paralel çekilir
+    leagues = [lig.lower() for lig in leagues]
+    entries = fetcher.run({league: (None, league_entry, league) for league in leagues})
+    result = {}
+    for league in leagues:
+        entry = entries[league]
+        if entry:
+            result[league] = collector.view(entry, league, 'compare', compare_view(league, profile), profile.name)
+    return fastjson.jsonify(result)
+
+@app.route('/api/batch', methods=['POST'])
+@csrf.exempt  # API key ile korunan JSON API; form/cookie oturumu yok
+@limiter.limit(BATCH_LIMIT, cost=lambda: batch.cost(request.get_json(silent=True)))
+@security_wrapper
+def batch_query():
+    """🔒 Toplu sorgu: stats / keepers / compare öğeleri tek istekte"""
+    specs = parse_batch(request.get_json(silent=True))
+    entries = fetcher.run({league: (None, league_entry, league) for league in batch.leagues(specs)})
+    parts = [batch.item(collector, spec, entries, BATCH_BUILDERS) for spec in specs]
+    return fastjson.respond(batch.combine(parts))
+
+@app.route('/api/stats/<league>/trend', methods=['GET'])
+@limiter.limit("10 per minute")
+@security_wrapper
+def league_trend(league):
+    """🔒 Lig metrik trendi"""
+    league = collector.sanitize_input(league.lower())
+    collector.validate_request(league)
+    metric = collector.sanitize_input(request.args.get('metrik') or request.args.get('metric', 'performans_skoru'))
+    if metric not in history.METRICS:
+        abort(400, description="Geçersiz metrik")
+    days = request.args.get('gun', type=int)
+    if days is not None and not 1 <= days <= 400:
+        abort(400, description="Gün 1-400 arası olmalı")
+    since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d') if days else None
+    season = collector.sanitize_input(request.args.get('sezon', ''))[:9] or None
+    
+    return fastjson.jsonify({
+        'lig': league.upper(),
+        'metrik': metric,
+        'sezon': season or (collector.history.seasons(league) or [None])[-1],
+        'seri': collector.history.trend(league, metric, season, since)
+    })
+
+@app.route('/api/players/<player_id>/history', methods=['GET'])
+@limiter.limit("10 per minute")
+@security_wrapper
+def player_history(player_id):
+    """🔒 Oyuncunun günlük değişimleri"""
+    player_id = collector.sanitize_input(player_id)[:64]
+    league = request.args.get('lig')
+    if league is not None:
+        league = collector.sanitize_input(league.lower())
+        collector.validate_request(league)
+    
+    records = collector.history.player(player_id, league)
+    if not records:
+        abort(404)
+    return fastjson.jsonify({'oyuncu_id': player_id, 'kayitlar': records})
 
 # API Key koruması (opsiyonel)
 API_KEYS = set(['demo-key-123'])  # Production'da environment variable
 
 @app.before_request
 def require_api_key():
-    if not any(request.path.startswith(p) for p in ['/health']):
+    if not any(request.path.startswith(p) for p in ['/health', '/metrics']):
         api_key = request.headers.get('X-API-Key')
         if api_key not in API_KEYS:
             abort(401, description="API Key gerekli")
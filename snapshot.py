@@ -0,0 +1,171 @@
+"""Kolon bazlı disk snapshot'ları (memory-mapped NumPy).
+
+CSV/Excel çıktıları yerine her collector son verisini tipli kolonlar olarak
+yazar; API worker'ları açılışta bunları kopyalamadan map eder ve yeniden
+başlatılan bir worker soğuk scraping beklemeden son bilinen veriyi sunar.
+
+Dizin yapısı (SNAPSHOT_DIR, varsayılan .snapshots):
+
+    <isim>/<sürüm>/meta.json        kolonlar (frame sırasıyla), tipler, kategoriler, zaman
+    <isim>/<sürüm>/float32.npy      aynı tipteki sayısal kolonlar tek blokta (kolon x satır)
+    <isim>/<sürüm>/kod_<kolon>.npy  categorical/string kolonların int32 kodları
+
+Sürüm, scraping zamanıdır (ms); en yeni SNAPSHOT_KEEP sürüm saklanır.
+Sayısal bloklar `np.load(mmap_mode='r')` ile açılır; her kolon map edilen
+bloğun görünümüdür (kopya yok), kolon sırası yazılan frame'inkiyle aynıdır.
+Frame salt okunurdur.
+
+    python snapshot.py list
+    python snapshot.py export app/premier premier.csv
+"""
+import os
+import sys
+import json
+import shutil
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', '.snapshots')
+KEEP = int(os.environ.get('SNAPSHOT_KEEP', 3))
+
+
+def _version(fetched_at):
+    return f'{int(fetched_at * 1000):015d}'
+
+
+def typed(df):
+    """Tamamı sayı olan string kolonları float32'ye çevir (CSV yerine yazılan genel frame'ler için)"""
+    types = {}
+    for col in df.columns:
+        if df[col].dtype == object:
+            numeric = pd.to_numeric(df[col], errors='coerce')
+            if numeric.notna().sum() == df[col].notna().sum() and numeric.notna().any():
+                df = df.assign(**{col: numeric})
+                types[col] = 'float32'
+        elif df[col].dtype == 'float64':
+            types[col] = 'float32'
+    return df.astype(types)
+
+
+def _as_text(value):
+    """Object kolon değeri -> str (liste/dict JSON olarak); eksik değer aynen kalır"""
+    if value is None or isinstance(value, str) or (isinstance(value, float) and np.isnan(value)):
+        return value
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+
+def _category_list(categories):
+    return [c.item() if isinstance(c, np.generic) else c for c in categories]
+
+
+def write(name, df, fetched_at, directory=None):
+    """Frame'i `name` altında `fetched_at` sürümüyle yaz; aynı sürüm varsa atla"""
+    base = os.path.join(directory or SNAPSHOT_DIR, name)
+    version = _version(fetched_at)
+    target = os.path.join(base, version)
+    if os.path.exists(os.path.join(target, 'meta.json')):
+        return target
+
+    tmp = f'{target}.{os.getpid()}.tmp'
+    os.makedirs(tmp, exist_ok=True)
+    columns = []
+    blocks = {}
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype) or values.dtype == object:
+            cat = values.map(_as_text).astype('category') if values.dtype == object else values
+            np.save(os.path.join(tmp, f'kod_{len(columns)}.npy'), cat.cat.codes.to_numpy().astype(np.int32))
+            columns.append({'ad': col, 'tip': 'kategori', 'kategoriler': _category_list(cat.cat.categories)})
+        else:
+            dtype = values.dtype.name
+            blocks.setdefault(dtype, []).append(col)
+            columns.append({'ad': col, 'tip': dtype, 'sira': len(blocks[dtype]) - 1})
+    for dtype, cols in blocks.items():
+        matrix = np.ascontiguousarray(np.stack([df[col].to_numpy(dtype=dtype) for col in cols]))
+        np.save(os.path.join(tmp, f'{dtype}.npy'), matrix)
+
+    meta = {'zaman': fetched_at, 'satir': len(df), 'kolonlar': columns}
+    with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)  # Başka bir worker aynı sürümü yazdı
+    prune(base)
+    return target
+
+
+def prune(base, keep=None):
+    keep = KEEP if keep is None else keep
+    for version in versions(base)[:-keep]:
+        shutil.rmtree(os.path.join(base, version), ignore_errors=True)
+
+
+def versions(base):
+    """Tamamlanmış sürümler, eskiden yeniye"""
+    if not os.path.isdir(base):
+        return []
+    return sorted(v for v in os.listdir(base)
+                  if v.isdigit() and os.path.exists(os.path.join(base, v, 'meta.json')))
+
+
+def names(prefix='', directory=None):
+    """Snapshot'ı olan isimler (ör. prefix='app' -> ['app/premier', ...])"""
+    root = directory or SNAPSHOT_DIR
+    found = []
+    for dirpath, dirnames, _ in os.walk(os.path.join(root, prefix)):
+        if versions(dirpath):
+            found.append(os.path.relpath(dirpath, root).replace(os.sep, '/'))
+            dirnames[:] = []
+    return sorted(found)
+
+
+def load(name, directory=None):
+    """En yeni sürüm -> (frame, zaman); snapshot yoksa (None, None)"""
+    base = os.path.join(directory or SNAPSHOT_DIR, name)
+    available = versions(base)
+    if not available:
+        return None, None
+    path = os.path.join(base, available[-1])
+    with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+
+    blocks = {}
+    data = {}
+    # meta['kolonlar'] yazılan frame'in kolon sırasındadır; dict sırası onu korur
+    for i, column in enumerate(meta['kolonlar']):
+        if column['tip'] == 'kategori':
+            codes = np.load(os.path.join(path, f'kod_{i}.npy'), mmap_mode='r')
+            data[column['ad']] = pd.Categorical.from_codes(codes, categories=column['kategoriler'])
+            continue
+        if column['tip'] not in blocks:
+            blocks[column['tip']] = np.load(os.path.join(path, f"{column['tip']}.npy"), mmap_mode='r')
+        # (kolon x satır) bloğun satırı: kolonun bitişik görünümü
+        data[column['ad']] = blocks[column['tip']][column['sira']]
+    # copy=False: bloklar birleştirilmez, her kolon map edilmiş dosyanın görünümü kalır (kopya yok)
+    frame = pd.DataFrame(data, index=pd.RangeIndex(meta['satir']), copy=False)
+    return frame, meta['zaman']
+
+
+def main(argv):
+    if len(argv) >= 1 and argv[0] == 'list':
+        for name in names():
+            print(name, versions(os.path.join(SNAPSHOT_DIR, name))[-1])
+    elif len(argv) == 3 and argv[0] == 'export':
+        frame, _ = load(argv[1])
+        if frame is None:
+            sys.exit(f"Snapshot bulunamadı: {argv[1]}")
+        frame.to_csv(argv[2], index=False)
+        print(f"✅ {len(frame)} satır -> {argv[2]}")
+    else:
+        print(__doc__)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
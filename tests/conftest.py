@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Modüller depo kökünde (düz yapı)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Testler arka plan yenileyicisi / disk snapshot'ı başlatmasın
+os.environ.setdefault('REFRESH_ENABLED', '0')
+os.environ.setdefault('SNAPSHOT_ENABLED', '0')
+os.environ.setdefault('HISTORY_ENABLED', '0')
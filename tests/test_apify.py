@@ -0,0 +1,124 @@
+import json
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import apify
+import http_client
+
+
+class FakeApifyServer:
+    """Run `polls` durum sorgusundan sonra biter; dataset sayfalı döner"""
+
+    def __init__(self, items, polls=3):
+        self.items = items
+        self.polls = polls
+        self.waits = []
+        self.pages = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status, value):
+                body = json.dumps(value).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                self._json(201, {'data': {'id': 'run1', 'status': 'READY', 'defaultDatasetId': 'ds1'}})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path == '/v2/actor-runs/run1':
+                    server.waits.append(int(query['waitForFinish'][0]))
+                    done = len(server.waits) >= server.polls
+                    self._json(200, {'data': {'id': 'run1', 'status': 'SUCCEEDED' if done else 'RUNNING',
+                                              'defaultDatasetId': 'ds1'}})
+                elif url.path == '/v2/datasets/ds1/items':
+                    offset, limit = int(query['offset'][0]), int(query['limit'][0])
+                    server.pages.append(offset)
+                    self._json(200, server.items[offset:offset + limit])
+                else:
+                    self._json(404, {'error': 'yok'})
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}/v2'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def fast_polls(monkeypatch):
+    monkeypatch.setattr(apify, 'POLL_INITIAL', 0.01)
+    monkeypatch.setattr(apify, 'POLL_MAX', 0.05)
+
+
+def test_run_actor_polls_until_finished_and_pages_dataset(tmp_path, fast_polls):
+    items = [{'oyuncu': f'Oyuncu {i}'} for i in range(25)]
+    server = FakeApifyServer(items, polls=3)
+    try:
+        client = apify.ApifyClient('token', base_url=server.url, page_size=10,
+                                   http=http_client.HttpClient(cache_dir=str(tmp_path)))
+        pages = []
+        result = asyncio.run(client.run_actor('kullanici/aktor', {}, on_page=pages.append))
+    finally:
+        server.close()
+    assert result == []
+    assert len(server.waits) == 3
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert server.pages == [0, 10, 20]
+
+
+class RecordingHttp:
+    """İstek argümanlarını kaydeden sahte http_client"""
+
+    def __init__(self, status='SUCCEEDED'):
+        self.status = status
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append(kwargs)
+
+        class Response:
+            status_code = 200
+            text = ''
+
+            def json(inner):
+                return {'data': {'id': 'run1', 'status': self.status, 'defaultDatasetId': 'ds1'}}
+        return Response()
+
+
+def test_long_poll_read_timeout_exceeds_wait(monkeypatch):
+    monkeypatch.setattr(apify, 'POLL_INITIAL', apify.POLL_MAX)
+    http = RecordingHttp()
+    asyncio.run(apify.ApifyClient('token', base_url='http://apify.test', http=http).wait_for_run('run1'))
+    call = http.calls[0]
+    assert call['params']['waitForFinish'] == 30
+    assert call['timeout'][1] >= 30 + apify.POLL_READ_MARGIN
+
+
+def test_failed_run_raises(fast_polls):
+    http = RecordingHttp(status='FAILED')
+    with pytest.raises(apify.ApifyError):
+        asyncio.run(apify.ApifyClient('token', base_url='http://apify.test', http=http).wait_for_run('run1'))
+
+
+def test_run_past_deadline_raises_apify_error(fast_polls):
+    http = RecordingHttp(status='RUNNING')
+    client = apify.ApifyClient('token', base_url='http://apify.test', http=http)
+    with pytest.raises(apify.ApifyError, match='bitmedi'):
+        asyncio.run(client.wait_for_run('run1', timeout=0.05))
+    assert len(http.calls) >= 2
@@ -0,0 +1,22 @@
+import pytest
+from werkzeug.datastructures import MultiDict
+
+import app
+
+
+@pytest.mark.parametrize('limit', ['-1', '0', '101', '100000'])
+def test_stats_limit_out_of_range_is_rejected(limit):
+    with pytest.raises(ValueError):
+        app.stats_args(MultiDict({'limit': limit}))
+
+
+def test_stats_limit_default_and_bounds():
+    assert app.stats_args(MultiDict())[0] == 50
+    assert app.stats_args(MultiDict({'limit': '1'}))[0] == 1
+    assert app.stats_args(MultiDict({'limit': '100'}))[0] == 100
+
+
+def test_stats_endpoint_returns_400_for_negative_limit():
+    response = app.app.test_client().get('/api/stats/premier?limit=-1')
+    assert response.status_code == 400
+    assert 'Limit' in response.get_json()['error']
@@ -0,0 +1,31 @@
+import time
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import asgi_app
+
+
+class SharedCollector:
+    """Paylaşımlı backend'li toplayıcı: current() hangi thread'de çağrıldığını kaydeder"""
+
+    ttl = 3600
+
+    def __init__(self):
+        self.cache = SimpleNamespace(shared=True)
+        self.threads = []
+        self.latest = {'premier': {'time': time.time(), 'store': None}}
+
+    def current(self, league):
+        self.threads.append(threading.current_thread().name)
+        return self.latest.get(league)
+
+
+def test_shared_backend_lookup_runs_off_the_event_loop(monkeypatch):
+    collector = SharedCollector()
+    monkeypatch.setattr(asgi_app, 'collector', collector)
+
+    entry = asyncio.run(asgi_app.league_entry('premier'))
+
+    assert entry is collector.latest['premier']
+    assert collector.threads and all(name.startswith('asgi-view') for name in collector.threads)
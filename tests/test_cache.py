@@ -0,0 +1,121 @@
+import pickle
+import fnmatch
+
+import pytest
+
+import cache
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, 'time', clock)
+    return clock
+
+
+class FakeRedis:
+    """RedisCache'in kullandığı komutlar (süre sonu yok sayılır)"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def scan_iter(self, match='*'):
+        return iter([key for key in self.data if fnmatch.fnmatchcase(key, match)])
+
+    def strlen(self, key):
+        return len(self.data.get(key, b''))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path, clock):
+    c = cache.SqliteCache(str(tmp_path / 'cache.db'), max_entries=2)
+    c.set('a', 1)
+    clock.now += 2
+    c.set('b', 2)
+    clock.now += 2
+    assert c.get('a') == 1  # a artık b'den yeni
+    clock.now += 2
+    c.set('c', 3)
+
+    assert 'b' not in c
+    assert c.get('a') == 1 and c.get('c') == 3
+    assert c.stats()['eviction'] == 1 and len(c) == 2
+
+
+def test_sqlite_cache_expires_entries(tmp_path, clock):
+    c = cache.SqliteCache(str(tmp_path / 'cache.db'), ttl=10)
+    c.set('a', 1)
+    clock.now += 11
+    assert c.get('a') is None
+    assert c.add('a', 2) and c.get('a') == 2
+
+
+def test_sqlite_limiter_counter_resets_after_expiry(tmp_path, clock):
+    storage = cache.SqliteLimiterStorage(f"sqlite:///{tmp_path / 'limits.db'}")
+    assert storage.incr('k', 60) == 1
+    assert storage.incr('k', 60, amount=3) == 4
+    assert storage.get('k') == 4
+    assert storage.get_expiry('k') == clock.now + 60
+
+    clock.now += 61
+    assert storage.get('k') == 0
+    assert storage.incr('k', 60) == 1
+    assert storage.get_expiry('k') == clock.now + 60
+
+
+def test_redis_cache_add_and_set_share_encoding_and_stats():
+    client = FakeRedis()
+    c = cache.RedisCache(client=client, prefix='test:')
+    c.set('a', {'x': 1})
+    assert c.add('b', {'x': 1})
+    assert not c.add('b', {'x': 2})
+    client.data['baska:z'] = b'baska servis'
+
+    assert client.data['test:a'] == client.data['test:b']
+    assert client.data['test:b'][1] == pickle.HIGHEST_PROTOCOL
+    assert c.get('b') == {'x': 1}
+    assert len(c) == 2
+    stats = c.stats()
+    assert stats['kayit'] == 2 and stats['byte'] == 2 * len(client.data['test:a'])
+    assert stats['backend'] == 'redis' and stats['hit'] == 1
+
+    c.clear()
+    assert len(c) == 0 and 'baska:z' in client.data
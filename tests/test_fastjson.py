@@ -0,0 +1,38 @@
+import numpy as np
+
+import fastjson
+
+BIG = {'oyuncular': [{'oyuncu': f'Oyuncu {i}', 'skor': np.float32(i), 'xg': float('nan')} for i in range(200)]}
+
+
+def test_dumps_handles_numpy_and_nan():
+    assert fastjson.dumps({'a': np.int64(3), 'b': float('nan')}) == b'{"a":3,"b":null}'
+
+
+def test_gzip_variant_and_its_etag():
+    encoded = fastjson.encode(BIG)
+    status, body, headers = fastjson.negotiate(encoded, accept_encoding='gzip, deflate')
+    assert status == 200
+    assert headers['Content-Encoding'] == 'gzip'
+    assert headers['ETag'] == f'"{encoded.etag}-gzip"'
+    assert body == encoded.variants['gzip']
+
+
+def test_304_returns_the_matched_variant_etag():
+    encoded = fastjson.encode(BIG)
+    gzip_tag = f'"{encoded.etag}-gzip"'
+    status, body, headers = fastjson.negotiate(encoded, if_none_match=gzip_tag, accept_encoding='gzip')
+    assert (status, body) == (304, b'')
+    assert headers['ETag'] == gzip_tag
+    assert headers['Vary'] == 'Accept-Encoding'
+
+    status, _, headers = fastjson.negotiate(encoded, if_none_match=f'"{encoded.etag}"')
+    assert status == 304
+    assert headers['ETag'] == f'"{encoded.etag}"'
+
+
+def test_stale_etag_gets_full_body():
+    encoded = fastjson.encode(BIG)
+    status, body, _ = fastjson.negotiate(encoded, if_none_match='"eski"')
+    assert status == 200
+    assert body == encoded.body
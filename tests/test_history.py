@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+import history
+
+
+def whoscored_frame():
+    # WhoScored satırlarında oyuncu_id yok (NaN)
+    return pd.DataFrame({
+        'oyuncu_id': [np.nan, np.nan, np.nan, 'fbref01'],
+        'oyuncu': ['Ali Koç', 'Ali Koç', 'Mert Can', 'Can Öz'],
+        'takim': ['Galatasaray', 'Trabzonspor', 'Fenerbahçe', 'Beşiktaş'],
+        'gol': [3.0, 1.0, 0.0, 5.0],
+        'performans_skoru': [7.1, 6.5, 6.9, 7.4],
+    })
+
+
+def test_rows_without_id_keep_separate_history(tmp_path):
+    store = history.HistoryStore('test', directory=str(tmp_path))
+    assert store.record('superlig', whoscored_frame(), 1_760_000_000) == 4
+    # Aynı veri tekrar: değişim yok
+    assert store.record('superlig', whoscored_frame(), 1_760_000_000) == 0
+    assert store.player('nan', 'superlig') == []
+    records = store.player('Ali Koç|Trabzonspor', 'superlig')
+    assert [(r['takim'], r['gol']) for r in records] == [('Trabzonspor', 1.0)]
+    assert [r['gol'] for r in store.player('fbref01', 'superlig')] == [5.0]
@@ -0,0 +1,85 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_client
+
+
+class PageServer:
+    """Tek sayfa; `etag` açıksa If-None-Match eşleşince 304 döner"""
+
+    def __init__(self, body, etag=True):
+        self.body = body
+        self.etag = etag
+        self.requests = []  # (If-None-Match, durum)
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                tag = '"%s"' % hashlib.sha1(server.body).hexdigest()
+                sent = self.headers.get('If-None-Match')
+                status = 304 if server.etag and sent == tag else 200
+                server.requests.append((sent, status))
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                if server.etag:
+                    self.send_header('ETag', tag)
+                body = server.body if status == 200 else b''
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}/oyuncular'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = PageServer(b'<table>v1</table>')
+    yield server
+    server.close()
+
+
+def test_fetch_revalidates_with_etag_and_serves_cached_body(server, tmp_path):
+    client = http_client.HttpClient(cache_dir=str(tmp_path))
+    first = client.fetch(server.url)
+    assert first.status_code == 200 and first.changed
+
+    # Yeni istemci (yeniden başlatılan worker): doğrulayıcı ve gövde diskten
+    second = http_client.HttpClient(cache_dir=str(tmp_path)).fetch(server.url)
+    assert second.status_code == 304 and not second.changed
+    assert second.text == '<table>v1</table>'
+    assert server.requests[1] == ('"%s"' % hashlib.sha1(b'<table>v1</table>').hexdigest(), 304)
+
+    server.body = b'<table>v2</table>'
+    third = client.fetch(server.url)
+    assert third.status_code == 200 and third.changed and third.text == '<table>v2</table>'
+
+
+def test_fetch_parsed_skips_parse_when_page_unchanged(server, tmp_path):
+    client = http_client.HttpClient(cache_dir=str(tmp_path))
+    calls = []
+
+    def parse(html):
+        calls.append(html)
+        return len(calls)
+
+    assert client.fetch_parsed(server.url, parse) == 1
+    assert client.fetch_parsed(server.url, parse) == 1   # 304
+    server.etag = False
+    assert client.fetch_parsed(server.url, parse) == 1   # 200 ama aynı gövde hash'i
+    server.body = b'<table>v2</table>'
+    assert client.fetch_parsed(server.url, parse) == 2
+    assert [status for _, status in server.requests] == [200, 304, 200, 200]
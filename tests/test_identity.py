@@ -0,0 +1,53 @@
+import pandas as pd
+
+import identity
+from playerStats import FootballDataCollector
+
+
+def resolver():
+    return identity.IdentityResolver(path=None)
+
+
+def test_same_name_different_teams_stay_separate():
+    r = resolver()
+    ea = pd.DataFrame({'Oyuncu': ['Fred', 'Fred'], 'Takim': ['Fenerbahçe SK', 'Manchester United']})
+    who = pd.DataFrame({'Oyuncu': ['Fred', 'Fred'], 'Takim': ['Man Utd', 'Fenerbahce']})
+    ea_ids = r.resolve_frame(ea, 'premier', team_col='Takim')
+    who_ids = r.resolve_frame(who, 'premier', team_col='Takim')
+    assert ea_ids[0] != ea_ids[1]
+    assert who_ids == [ea_ids[1], ea_ids[0]]
+
+
+def test_single_homonym_on_other_team_gets_new_id():
+    r = resolver()
+    first = r.resolve('premier', 'Fred', 'Fenerbahçe')
+    assert r.resolve('premier', 'Fred', 'Galatasaray') != first
+    # Takım bilinmiyorsa isim eşleşmesi yeterli
+    assert r.resolve('premier', 'Fred') == first
+
+
+def test_spelling_variants_match_within_team():
+    r = resolver()
+    pid = r.resolve('superlig', 'Edin Džeko', 'Fenerbahçe')
+    assert r.resolve('superlig', 'E. Dzeko', 'Fenerbahce SK') == pid
+    assert r.resolve('superlig', 'Dzeko Edin', None) == pid
+
+
+def test_same_team_abbreviations():
+    assert identity.same_team('man utd', 'manchester united')
+    assert identity.same_team('psg', 'paris saint germain')
+    assert not identity.same_team('fenerbahce', 'galatasaray')
+
+
+def test_merge_league_keeps_players_apart_by_team():
+    r = resolver()
+    collector = FootballDataCollector()
+    sources = [
+        pd.DataFrame({'Oyuncu': ['Fred', 'Fred'], 'Takim': ['Fenerbahçe', 'Manchester United'], 'EA_Rating': [80, 75]}),
+        pd.DataFrame({'Oyuncu': ['Fred', 'Fred'], 'Takim': ['Man Utd', 'Fenerbahce'], 'WhoScored_Rating': [6.9, 7.4]}),
+    ]
+    merged = collector.merge_league(r, 'premier', collector.normalize_sources(r, 'premier', sources))
+    assert len(merged) == 2
+    by_team = merged.set_index('Takim')
+    assert by_team.loc['Fenerbahçe', 'WhoScored_Rating'] == 7.4
+    assert by_team.loc['Manchester United', 'WhoScored_Rating'] == 6.9
@@ -0,0 +1,66 @@
+import os
+import time
+import threading
+
+import cache
+import snapshot
+from league_data import LeagueDataMixin
+
+ROWS = [{'oyuncu': f'Oyuncu {i}', 'takim': 'Takim', 'performans_skoru': float(i)} for i in range(20)]
+
+
+class Collector(LeagueDataMixin):
+    ttl = 60
+    namespace = 'test'
+    keep_history = False
+
+    def __init__(self, delay=0.2):
+        self.cache = cache.TTLCache(ttl=self.ttl)
+        self.delay = delay
+        self.calls = 0
+        self.init_league_data()
+
+    def _collect_stats(self, league):
+        self.calls += 1
+        time.sleep(self.delay)
+        return ROWS
+
+
+def test_concurrent_refresh_shares_one_stored_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_DIR', str(tmp_path))
+    monkeypatch.setattr(Collector, 'snapshots', True)
+    collector = Collector()
+    barrier = threading.Barrier(6)
+
+    def refresh():
+        barrier.wait()
+        collector.refresh('premier')
+
+    threads = [threading.Thread(target=refresh) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert collector.calls == 1
+    assert len(os.listdir(tmp_path / 'test' / 'premier')) == 1
+
+
+def test_waiters_see_the_same_entry_time():
+    collector = Collector(delay=0.1)
+    barrier = threading.Barrier(4)
+    times = []
+
+    def request():
+        barrier.wait()
+        collector.refresh('premier')
+        times.append(collector.latest['premier']['time'])
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Görünüm cache'i `time` ile doğrulanır; farklı zaman = birbirinin görünümünü geçersiz kılmak
+    assert len(set(times)) == 1
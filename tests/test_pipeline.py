@@ -0,0 +1,25 @@
+import pytest
+
+from pipeline import RAN, ArtifactStore, Pipeline, Stage
+
+
+def stage(name, *deps):
+    return Stage(name, lambda *inputs: name, deps=deps)
+
+
+def test_cyclic_dependencies_are_rejected(tmp_path):
+    stages = [stage('fetch'), stage('parse', 'fetch', 'merge'), stage('normalize', 'parse'),
+              stage('merge', 'normalize')]
+    with pytest.raises(ValueError, match='parse -> merge -> normalize -> parse'):
+        Pipeline(stages, store=ArtifactStore(str(tmp_path)))
+
+
+def test_self_dependency_is_a_cycle(tmp_path):
+    with pytest.raises(ValueError, match='Döngüsel bağımlılık: fetch -> fetch'):
+        Pipeline([stage('fetch', 'fetch')], store=ArtifactStore(str(tmp_path)))
+
+
+def test_acyclic_pipeline_runs(tmp_path):
+    stages = [stage('fetch'), stage('parse', 'fetch'), stage('merge', 'parse', 'fetch')]
+    report = Pipeline(stages, store=ArtifactStore(str(tmp_path))).run()
+    assert report == {'fetch': RAN, 'parse': RAN, 'merge': RAN}
@@ -0,0 +1,22 @@
+import time
+
+import refresher
+
+
+def test_snapshot_leagues_wait_for_their_interval():
+    calls = []
+    fetched_at = time.time() - 100
+    r = refresher.LeagueRefresher(calls.append, {'premier': 1800, 'superlig': 1800},
+                                  fetched={'premier': fetched_at})
+    due, _ = r._due()
+    # Snapshot'tan açılan lig çekilmez, verisi olmayan hemen çekilir
+    assert due == ['superlig']
+    assert r.state['premier']['sonraki'] == fetched_at + 1800
+    assert r.status()['premier']['son_yenileme'] is not None
+
+
+def test_refresher_is_on_by_default(monkeypatch):
+    monkeypatch.delenv('REFRESH_ENABLED', raising=False)
+    assert refresher.enabled()
+    monkeypatch.setenv('REFRESH_ENABLED', '0')
+    assert not refresher.enabled()
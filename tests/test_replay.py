@@ -0,0 +1,57 @@
+import asyncio
+
+import apify
+import http_client
+import replay
+
+ITEMS = [{'Oyuncu': f'Oyuncu {i}', 'Gol': i} for i in range(5)]
+
+
+def test_record_then_replay_apify_dataset(tmp_path):
+    # "Canlı" Apify: hazır dataset fixture'ı olan stub sunucu
+    upstream_store = replay.FixtureStore(str(tmp_path / 'upstream'))
+    upstream_store.save_dataset('kullanici/aktor', ITEMS)
+    upstream = replay.StubServer(upstream_store, run_seconds=0.1).start()
+    recorded = replay.FixtureStore(str(tmp_path / 'kayit'))
+    try:
+        http = http_client.HttpClient(cache_dir=str(tmp_path / 'http'))
+        http.session.mount('http://', replay.RecordingAdapter(recorded))
+        client = apify.ApifyClient('token', base_url=f'{upstream.url}/https/api.apify.com/v2', http=http,
+                                   page_size=2)
+        assert asyncio.run(client.run_actor('kullanici/aktor', {})) == ITEMS
+    finally:
+        upstream.stop()
+
+    # Kayıt aktör dataset'ini içermeli ve replay aynı öğeleri döndürmeli
+    assert recorded.load_dataset('kullanici/aktor') == ITEMS
+    stub = replay.StubServer(recorded, run_seconds=0.1).start()
+    try:
+        http = http_client.HttpClient(cache_dir=str(tmp_path / 'http2'))
+        http.session.mount('https://', replay.StubAdapter(stub.url))
+        client = apify.ApifyClient('token', base_url='https://api.apify.com/v2', http=http, page_size=2)
+        assert asyncio.run(client.run_actor('kullanici/aktor', {})) == ITEMS
+    finally:
+        stub.stop()
+
+
+WHOSCORED_URL = 'https://tr.whoscored.com/Regions/252/Tournaments/England-Premier-League/PlayerStatistics'
+WHOSCORED_ROW = '''<tr><td>1</td><td class="grid-abs">
+    <a class="player-link"><span class="iconize">Mauro Icardi</span></a><br>
+    <span class="team-name">Galatasaray, </span><span class="player-meta-data">31, FW</span>
+  </td><td>28</td><td>21</td><td>1890</td><td>7.52</td></tr>'''
+
+
+def test_replayed_whoscored_cells_keep_team_line(tmp_path, monkeypatch):
+    import driver_pool
+    import playerStats
+
+    store = replay.FixtureStore(str(tmp_path))
+    store.save_page(WHOSCORED_URL, f'<html><body><table class="player-table"><tbody>{WHOSCORED_ROW}'
+                                   f'</tbody></table></body></html>')
+    pool = driver_pool.DriverPool(size=1, factory=lambda: replay.FakeDriver(store))
+    monkeypatch.setattr(playerStats, 'chrome_pool', pool)
+
+    df = playerStats.FootballDataCollector().get_whoscored_ratings('GB1')
+
+    assert df[['Oyuncu', 'Takim', 'WhoScored_Rating']].to_dict('records') == [
+        {'Oyuncu': 'Mauro Icardi', 'Takim': 'Galatasaray', 'WhoScored_Rating': '7.52'}]
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+import snapshot
+
+
+def test_load_keeps_written_column_order(tmp_path):
+    df = pd.DataFrame({
+        'Lig': ['PREMIER', 'PREMIER', 'SUPERLIG'],
+        'EA_Rating': np.array([80, 75, 70], dtype='float32'),
+        'Oyuncu': ['A', 'B', 'C'],
+        'Gol_90': np.array([0.5, 0.1, 0.3], dtype='float32'),
+        'Asist_90': np.array([0.2, 0.0, 0.1], dtype='float32'),
+        'Mac': np.array([10, 12, 8], dtype='int64'),
+        'Ort_Rating': np.array([7.1, 6.8, 6.5], dtype='float32'),
+    })
+    snapshot.write('test/premier', df, 1000.0, directory=str(tmp_path))
+    frame, fetched_at = snapshot.load('test/premier', directory=str(tmp_path))
+
+    assert fetched_at == 1000.0
+    assert list(frame.columns) == list(df.columns)
+    pd.testing.assert_frame_equal(frame.astype({'Lig': object, 'Oyuncu': object}), df)
+    # Sayısal kolonlar kopyalanmadan map edilmiş bloğun görünümü
+    for col in ('EA_Rating', 'Gol_90', 'Asist_90', 'Mac', 'Ort_Rating'):
+        assert mapped(frame[col].to_numpy()), col
+
+
+def mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
@@ -0,0 +1,91 @@
+"""Ham lig verisinden türetilen endpoint görünümleri.
+
+Ham scraping sonucu lig başına bir kez `prepare_frame` ile DataFrame'e
+çevrilir ve sıralama indeksi (`ranking.RankingIndex`) kurulur (1. seviye
+cache); top-N, kaleci ve karşılaştırma görünümleri bunlardan ucuzca türetilir
+(2. seviye cache).
+"""
+import pandas as pd
+
+import metrics
+import ranking
+import scoring
+
+STATS_COLS = ['oyuncu', 'pozisyon', 'takim', 'gol', 'asist', 'xg', 'pas_yuzde',
+              'tackles', 'kurtaris', 'performans_skoru']
+KEEPER_COLS = ['oyuncu', 'kurtaris', 'kurtaris_yuzde', 'gol_yeme_90']
+
+
+def prepare_frame(stats):
+    """Sayısal dönüşüm ve varsayılan skor lig başına bir kez hesaplanır"""
+    df = scoring.prepare(pd.DataFrame(stats))
+    if 'performans_skoru' not in df.columns:
+        df['performans_skoru'] = scoring.get_profile().score(df)
+    return df
+
+
+def to_records(df):
+    """Dict listesi; float32 kolonlar JSON'da 0.10000000149 gibi görünmesin diye yuvarlanır"""
+    floats = [col for col in df.columns if df[col].dtype == 'float32']
+    if floats:
+        df = df.astype({col: 'float64' for col in floats}).round({col: 4 for col in floats})
+    return df.to_dict('records')
+
+
+def top_players(df, limit, columns=None, profile=None, league=None, index=None, metric=None,
+                group=None, team=None):
+    """En iyi N oyuncu; sıralama hazır indeksten dilimlenir.
+
+    `profile` verilirse skor o profille (lig başına bir kez) hesaplanır,
+    `metric` verilirse skor yerine o metriğe göre sıralanır.
+    """
+    index = index if index is not None else ranking.RankingIndex(df)
+    score_key = ranking.DEFAULT_METRIC
+    if profile is not None and profile.name != scoring.DEFAULT_PROFILE:
+        score_key = f'profil:{profile.name}'
+        if not index.has(score_key):
+            with metrics.span('score', profile.name):
+                index.add_scores(score_key, profile.score(df, league))
+    if team is not None:
+        team = index.team(team)
+        if team is None:
+            return []
+
+    idx = index.top(metric or score_key, limit, group, team)
+    top = df.iloc[idx]
+    if score_key != ranking.DEFAULT_METRIC:
+        top = top.assign(performans_skoru=index.values[score_key][idx])
+    if columns:
+        top = top.reindex(columns=columns)
+    else:
+        top = top.drop(columns=scoring.DERIVED, errors='ignore')
+    return to_records(top)
+
+
+def keepers(df, index=None):
+    """Sadece kaleciler"""
+    if 'pozisyon' not in df.columns:
+        return []
+    if index is not None:
+        gk = df.iloc[index.rows('GK')]
+    else:
+        gk = df[df['pozisyon'].str.contains('GK', na=False)]
+    return to_records(gk.reindex(columns=KEEPER_COLS))
+
+
+def mean(column):
+    return round(float(column.to_numpy(dtype='float64').mean()), 4) if len(column) else None
+
+
+def league_summary(df, profile=None, league=None):
+    """Lig karşılaştırması için özet"""
+    if profile is None or not len(df):
+        best = df.loc[df['performans_skoru'].idxmax(), 'oyuncu'] if len(df) else 'N/A'
+    else:
+        with metrics.span('score', profile.name):
+            best = df['oyuncu'].iloc[int(profile.score(df, league).argmax())]
+    return {
+        'ortalama_gol': mean(df['gol']) if 'gol' in df else None,
+        'ortalama_asist': mean(df['asist']) if 'asist' in df else None,
+        'en_iyi_oyuncu': best
+    }